@@ -12,13 +12,35 @@ Simple API for orchestrator agents:
 """
 
 import asyncio
+import importlib
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from .config import RunConfig, TrackConfig
-from .orchestrator import run_debug_session, run_harden_session
 from .util.ids import new_run_id
 
+if TYPE_CHECKING:
+    from .config import RunConfig, TrackConfig
+    from .orchestrator import run_debug_session, run_harden_session
+
+# Re-exports resolved on first access (PEP 562): importing a light submodule
+# such as anvil.util.shell no longer drags in the orchestrator, pydantic and
+# loguru just because the package __init__ runs first.
+_LAZY_EXPORTS = {
+    "RunConfig": ".config",
+    "TrackConfig": ".config",
+    "run_debug_session": ".orchestrator",
+    "run_harden_session": ".orchestrator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 def debug(
     repo: str | Path,
@@ -38,6 +60,9 @@ def debug(
     Returns:
         dict with keys: status, run_dir, winner, patch_file, patches
     """
+    from .config import RunConfig
+    from .orchestrator import run_debug_session
+
     repo_path = Path(repo).resolve()
     cfg = RunConfig(
         repo_path=repo_path,
@@ -109,6 +134,9 @@ def harden(
     Returns:
         dict with keys: status, run_dir, findings, patches
     """
+    from .config import RunConfig
+    from .orchestrator import run_harden_session
+
     repo_path = Path(repo).resolve()
     issue_text = focus or "Find vulnerabilities, missing tests, and edge cases."
     
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from pydantic import BaseModel
+
+from ..util.json_utils import dumps_indented_bytes, loads
 from .schemas import RunMeta, RunStatus
 
 
+def _dump_json(data: Any) -> bytes:
+    # Pydantic models serialize straight to JSON (no intermediate dict);
+    # the output is byte-identical to json.dumps(model_dump(), indent=2).
+    if isinstance(data, BaseModel):
+        return (data.model_dump_json(indent=2) + "\n").encode("utf-8")
+    return dumps_indented_bytes(data)
+
+
 @dataclass(frozen=True)
 class ArtifactStore:
     """Artifact storage manager.
@@ -17,12 +29,24 @@ class ArtifactStore:
     - Outputs:
       - Writes files to .dbg/runs/<id>/...
     - Invariants:
-      - Enforces path safety (prevents traversal outside run_dir)
+      - Enforces path safety (prevents traversal outside run_dir); the check
+        is lexical (abspath against run_dir), so path() never stats
       - Ensures parent directories exist on write
+      - read_cached() re-reads a file only when its (mtime_ns, size) changes
+      - write_batched() validates every path before writing any of them
+      - iter_files() indexes tracks/<track>/iter_*/ in one scandir walk
     - Failure:
       - Raises ValueError on unsafe path access
     """
     run_dir: Path
+    _text_cache: dict[Path, tuple[int, int, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _root_prefix: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Absolute, normalized run_dir plus separator: "inside" is a prefix test.
+        object.__setattr__(self, "_root_prefix", os.path.join(os.path.abspath(self.run_dir), ""))
 
     def ensure(self) -> None:
         self.run_dir.mkdir(parents=True, exist_ok=True)
@@ -31,22 +55,49 @@ class ArtifactStore:
 
     def path(self, *parts: str) -> Path:
         p = self.run_dir.joinpath(*parts)
-        base = self.run_dir.resolve(strict=False)
-        try:
-            p.resolve(strict=False).relative_to(base)
-        except ValueError as exc:
-            raise ValueError(f"Refusing to access path outside run_dir: {p}") from exc
+        # Collapses `..` and absolute parts without touching the filesystem.
+        if not os.path.join(os.path.abspath(p), "").startswith(self._root_prefix):
+            raise ValueError(f"Refusing to access path outside run_dir: {p}")
         return p
 
     def write_json(self, rel: str, data: Any) -> Path:
         p = self.path(rel)
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        p.write_bytes(_dump_json(data))
         return p
 
+    def write_batched(self, items: list[tuple[str, Any]]) -> list[Path]:
+        """Write several artifacts in one pass.
+
+        str/bytes values are written as-is; models and other data are
+        encoded like write_json(). Each distinct parent directory is created once.
+        """
+        resolved = [(self.path(rel), data) for rel, data in items]
+        for parent in {p.parent for p, _ in resolved}:
+            parent.mkdir(parents=True, exist_ok=True)
+        for p, data in resolved:
+            if isinstance(data, bytes):
+                p.write_bytes(data)
+            elif isinstance(data, str):
+                p.write_text(data, encoding="utf-8")
+            else:
+                p.write_bytes(_dump_json(data))
+        return [p for p, _ in resolved]
+
     def read_json(self, rel: str) -> Any:
         p = self.path(rel)
-        return json.loads(p.read_text(encoding="utf-8"))
+        return loads(p.read_text(encoding="utf-8"))
+
+    def read_cached(self, rel: str) -> str:
+        """Read a text artifact, reusing the last read while the file is unchanged."""
+        p = self.path(rel)
+        st = p.stat()
+        hit = self._text_cache.get(p)
+        if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        text = p.read_text(encoding="utf-8", errors="ignore")
+        self._text_cache[p] = (st.st_mtime_ns, st.st_size, text)
+        return text
 
     def write_text(self, rel: str, text: str) -> Path:
         p = self.path(rel)
@@ -55,10 +106,32 @@ class ArtifactStore:
         return p
 
     def write_run_meta(self, meta: RunMeta) -> Path:
-        return self.write_json("RUN.json", meta.model_dump())
+        return self.write_json("RUN.json", meta)
 
     def write_status(self, status: RunStatus) -> Path:
-        return self.write_json("RUN_STATUS.json", status.model_dump())
+        return self.write_json("RUN_STATUS.json", status)
+
+    def iter_files(self, track: str, names: Iterable[str]) -> dict[str, list[Path]]:
+        """One scandir walk of tracks/<track>/iter_*/ -> {file name: sorted paths}.
+
+        Equivalent to sorted(tdir.glob(f"iter_*/{name}")) for each name; a
+        missing track directory yields empty lists.
+        """
+        found: dict[str, list[Path]] = {name: [] for name in names}
+        try:
+            with os.scandir(self.path("tracks", track)) as it_dirs:
+                for d in it_dirs:
+                    if not d.name.startswith("iter_") or not d.is_dir():
+                        continue
+                    with os.scandir(d.path) as files:
+                        for f in files:
+                            if f.name in found:
+                                found[f.name].append(Path(f.path))
+        except OSError:
+            pass
+        for paths in found.values():
+            paths.sort()
+        return found
 
     def append_progress_line(self, track: str, line: str) -> None:
         p = self.path("tracks", track, "PROGRESS.md")
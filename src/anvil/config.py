@@ -21,6 +21,9 @@ import yaml
 
 from .util.ids import validate_track_name
 
+# LibYAML's C loader when PyYAML was built with it; same semantics as SafeLoader.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 Mode = Literal["debug", "harden"]
 
 
@@ -128,7 +131,7 @@ TRACKS_SCHEMA = {
 def load_tracks_file(path: Path) -> TracksFileConfig:
     import jsonschema  # lazy import
     
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
     
     # Task 4.8: Validate schema
     try:
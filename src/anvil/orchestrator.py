@@ -18,9 +18,11 @@ CONTRACT
 """
 
 import asyncio
+import os
 import traceback
 from dataclasses import dataclass
 from dataclasses import fields as dataclass_fields
+from functools import cache
 from pathlib import Path
 
 from loguru import logger
@@ -30,11 +32,6 @@ from .artifacts.store import ArtifactStore
 from .collab.blackboard import Blackboard
 from .config import RunConfig, TrackConfig, load_tracks_file
 from .providers.base import Provider, ProviderResult
-from .providers.copilot_cli import CopilotCliProvider
-from .providers.gemini_cli import GeminiCliProvider
-from .providers.gh_cli import GhCliProvider
-from .providers.claude_cli import ClaudeCliProvider
-from .providers.manual import ManualProvider
 from .score.compute import ScoreComputer
 from .steps.apply import Apply
 from .steps.context_builder import ContextBuilder
@@ -45,6 +42,7 @@ from .steps.repro_plan import ReproPlan
 from .steps.track_iterate import TrackIterate
 from .steps.verify import Verify
 from .util.events import EventLog
+from .util.paths import atomic_write_bytes
 from .worktrees import WorktreeManager
 
 
@@ -77,25 +75,42 @@ def _default_tracks() -> list[TrackConfig]:
     ]
 
 
+@cache
+def _allowed_fields(cls: type) -> frozenset[str]:
+    return frozenset(f.name for f in dataclass_fields(cls))
+
+
 def _filter_provider_kwargs(cls: type, opts: dict[str, object]) -> dict[str, object]:
-    allowed = {f.name for f in dataclass_fields(cls)}
+    allowed = _allowed_fields(cls)
     return {k: v for k, v in opts.items() if k in allowed}
 
 
 def _provider_for_track(t: TrackConfig) -> Provider:
+    # Provider modules are imported lazily: a run only ever needs the ones its
+    # tracks name, and CLI startup should not pay for the rest.
     if t.provider == "manual":
+        from .providers.manual import ManualProvider
+
         return ManualProvider()
     if t.provider == "copilot":
+        from .providers.copilot_cli import CopilotCliProvider
+
         opts = _filter_provider_kwargs(CopilotCliProvider, t.provider_options)
         opts["model"] = t.model or "gpt-5"
         return CopilotCliProvider(**opts)
     if t.provider == "gemini":
+        from .providers.gemini_cli import GeminiCliProvider
+
         opts = _filter_provider_kwargs(GeminiCliProvider, t.provider_options)
         opts["model"] = t.model or "gemini-3-pro"
         return GeminiCliProvider(**opts)
     if t.provider == "gh_cli":
+        from .providers.gh_cli import GhCliProvider
+
         return GhCliProvider()
     if t.provider == "claude":
+        from .providers.claude_cli import ClaudeCliProvider
+
         opts = _filter_provider_kwargs(ClaudeCliProvider, t.provider_options)
         return ClaudeCliProvider(**opts)
     raise ValueError(f"Unknown provider: {t.provider}")
@@ -135,6 +150,49 @@ def _load_tracks(cfg: RunConfig) -> tuple[list[TrackConfig], bool, int]:
     return _default_tracks(), cfg.use_treesitter, 25
 
 
+def _latest_patch(track_dir: Path) -> Path | None:
+    """Return the PATCH.diff from the newest iter_* dir that has one (no glob + sort)."""
+    try:
+        with os.scandir(track_dir) as it:
+            iter_names = [e.name for e in it if e.name.startswith("iter_")]
+    except OSError:
+        return None
+    # iter_NN is zero-padded, so name order is iteration order; usually the
+    # newest iteration carries the patch and we stop after one stat.
+    for name in sorted(iter_names, reverse=True):
+        patch = track_dir / name / "PATCH.diff"
+        if patch.is_file():
+            return patch
+    return None
+
+
+def _worktree_validation_error(
+    cfg: RunConfig, store: ArtifactStore, wt: WorktreeManager, failed: dict[str, str]
+) -> str:
+    """Actionable WORKTREE_VALIDATION_ERROR.txt body, built in one piece."""
+    lines = ["Worktree validation failed. Actionable diagnostics:"]
+    lines.extend(f"  - Track '{track}': {reason}" for track, reason in failed.items())
+    if not wt._is_git_repo():
+        lines += [
+            "",
+            "Root cause: Repo is not a git repository.",
+            f"Solution: Ensure {cfg.repo_path} is a valid git repo.",
+        ]
+    else:
+        # Likely branch conflict or git command failure
+        lines += [
+            "",
+            "Possible causes:",
+            f"  - Branches dbg/{cfg.run_id}/<track> already exist from stale runs",
+            "  - Git worktree command failed",
+            "",
+            "Solutions:",
+            f"  - Run: anvil cleanup run --run-id {cfg.run_id}",
+            f"  - Check logs in: {store.path('logs')}",
+        ]
+    return "\n".join(lines)
+
+
 def _load_run_status(store: ArtifactStore) -> RunStatus | None:
     try:
         data = store.read_json("RUN_STATUS.json")
@@ -146,9 +204,10 @@ def _load_run_status(store: ArtifactStore) -> RunStatus | None:
 async def run_debug_session(cfg: RunConfig) -> RunResult:
     store = ArtifactStore(cfg.run_dir())
     store.ensure()
-    ev = EventLog(store.path("events.jsonl"))
+    ev = EventLog(store.path("events.jsonl"), buffered=True)
 
     tracks: list[TrackConfig] = []
+    track_names: list[str] = []
     wt: WorktreeManager | None = None
 
     try:
@@ -174,6 +233,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                 pass
 
         tracks, use_ts, max_files = _load_tracks(cfg)
+        track_names = [t.name for t in tracks]
         wt = WorktreeManager(repo=cfg.repo_path, store=store)
 
         if not cfg.resume:
@@ -195,36 +255,16 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
 
         # Setup worktrees (best effort creation, then validate)
         ev.emit(stage="setup", action="worktrees_create")
-        wt.create_worktrees([t.name for t in tracks])
+        wt.create_worktrees(track_names)
         wt.write_worktree_contracts(tracks)
         
         # Validate worktrees with actionable diagnostics
-        validation = wt.validate_worktrees_ready([t.name for t in tracks])
+        validation = wt.validate_worktrees_ready(track_names)
         if validation.failed:
-            # Build actionable error message
-            error_lines = ["Worktree validation failed. Actionable diagnostics:"]
-            for track, reason in validation.failed.items():
-                error_lines.append(f"  - Track '{track}': {reason}")
-            
-            # Check if it's a git repo issue
-            if not wt._is_git_repo():
-                error_lines.append("")
-                error_lines.append("Root cause: Repo is not a git repository.")
-                error_lines.append(f"Solution: Ensure {cfg.repo_path} is a valid git repo.")
-            else:
-                # Likely branch conflict or git command failure
-                error_lines.append("")
-                error_lines.append(f"Possible causes:")
-                error_lines.append(f"  - Branches dbg/{cfg.run_id}/<track> already exist from stale runs")
-                error_lines.append(f"  - Git worktree command failed")
-                error_lines.append("")
-                error_lines.append(f"Solutions:")
-                error_lines.append(f"  - Run: anvil cleanup run --run-id {cfg.run_id}")
-                error_lines.append(f"  - Check logs in: {store.path('logs')}")
-            
-            error_msg = "\n".join(error_lines)
+            error_msg = _worktree_validation_error(cfg, store, wt, validation.failed)
             logger.error(error_msg)
-            store.write_text("WORKTREE_VALIDATION_ERROR.txt", error_msg)
+            # Atomic: a crash mid-write never leaves a truncated diagnostic behind
+            atomic_write_bytes(store.path("WORKTREE_VALIDATION_ERROR.txt"), error_msg.encode("utf-8"))
             store.write_status(
                 RunStatus(
                     run_id=cfg.run_id, 
@@ -236,15 +276,23 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
             return RunResult(status="FAIL", run_dir=store.run_dir)
 
         ev.emit(stage="setup", action="worktrees_validated", ok_tracks=len(validation.ok_tracks))
+        ev.flush()
+
+        # Steps are constructed once and reused for run() + check().
+        context_step = ContextBuilder()
+        repro_step = ReproPlan()
+        verify_step = Verify()
+        judge_step = Judge()
+        blackboard = Blackboard()
 
         # Steps - Skip if artifacts allow
         # ContextBuilder checks if CONTEXT.md exists internally? No, we should check here to skip.
         if not (store.path("CONTEXT.md").exists() and cfg.resume):
-            ContextBuilder().run(
+            context_step.run(
                 store, cfg.repo_path, issue_text=issue_text or "", use_treesitter=use_ts, max_files=max_files
             )
         
-        if ContextBuilder().check(store, cfg.repo_path) != 0:
+        if context_step.check(store, cfg.repo_path) != 0:
             store.write_status(
                 RunStatus(
                     run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message="context check failed"
@@ -269,9 +317,9 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                 pass
 
         if not (store.path("REPRO.md").exists() and cfg.resume):
-            ReproPlan().run(store, cfg.repo_path, issue_text=issue_text or "")
+            repro_step.run(store, cfg.repo_path, issue_text=issue_text or "")
             
-        if ReproPlan().check(store, cfg.repo_path) != 0:
+        if repro_step.check(store, cfg.repo_path) != 0:
             store.write_status(
                 RunStatus(
                     run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message="repro check failed"
@@ -279,7 +327,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
             )
             return RunResult(status="FAIL", run_dir=store.run_dir)
 
-        context_text = store.path("CONTEXT.md").read_text(encoding="utf-8", errors="ignore")
+        context_text = store.read_cached("CONTEXT.md")
         blackboard_text = ""
 
         disqualified: list[str] = []
@@ -350,7 +398,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                     )
                     
                     bb_path = store.path("BLACKBOARD.md")
-                    current_bb = bb_path.read_text(encoding="utf-8", errors="ignore") if bb_path.exists() else ""
+                    current_bb = store.read_cached("BLACKBOARD.md") if bb_path.exists() else ""
                     
 
 
@@ -384,7 +432,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                             
                             # Verify it's a git repo
                             git_check = run_cmd(
-                                "git rev-parse --show-toplevel",
+                                ["git", "rev-parse", "--show-toplevel"],
                                 cwd=wt_path,
                                 timeout_s=5,
                             )
@@ -399,7 +447,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                                 continue
                             
                             # 1. Check patch before applying
-                            check_cmd = f'git apply --check "{patch_path}"'
+                            check_cmd = ["git", "apply", "--check", str(patch_path)]
                             check_res = run_cmd(check_cmd, cwd=wt_path, timeout_s=30)
                             
                             if check_res.returncode != 0:
@@ -413,26 +461,26 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                                 continue
                             
                             # 2. Apply patch
-                            apply_cmd = f'git apply --whitespace=nowarn "{patch_path}"'
+                            apply_cmd = ["git", "apply", "--whitespace=nowarn", str(patch_path)]
                             apply_res = run_cmd(apply_cmd, cwd=wt_path, timeout_s=30)
                             
                             if apply_res.returncode == 0:
                                 # 3. Run Verify with docker flag
                                 iter_store = ArtifactStore(store.path("tracks", t.name, f"iter_{iteration:02d}"))
-                                Verify().run(iter_store, wt_path, use_docker=cfg.use_docker)
+                                verify_step.run(iter_store, wt_path, use_docker=cfg.use_docker)
                             
                             # 4. Robust cleanup (reset + clean untracked files)
                             # Safety: verify we're still in correct directory
                             verify_res = run_cmd(
-                                "git rev-parse --show-toplevel",
+                                ["git", "rev-parse", "--show-toplevel"],
                                 cwd=wt_path,
                                 timeout_s=5,
                             )
                             if verify_res.returncode == 0:
                                 # Reset tracked changes
-                                run_cmd("git reset --hard", cwd=wt_path, timeout_s=30)
+                                run_cmd(["git", "reset", "--hard"], cwd=wt_path, timeout_s=30)
                                 # Clean untracked files (but preserve .dbg/ if it exists)
-                                run_cmd("git clean -fd", cwd=wt_path, timeout_s=30)
+                                run_cmd(["git", "clean", "-fd"], cwd=wt_path, timeout_s=30)
                         except Exception as e:
                             ev.emit(
                                 stage="iterate",
@@ -443,7 +491,7 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                             )
 
                     
-                    chk = TrackIterate().check(store, cfg.repo_path, track=t.name, iteration=iteration)
+                    chk = iter_step.check(store, cfg.repo_path, track=t.name, iteration=iteration)
                     if chk != 0:
                         disqualified.append(t.name)
                         ev.emit(
@@ -462,12 +510,12 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                         signal = data.get("status_signal", "CONTINUE")
                         if signal == "DONE":
                             ev.emit(stage="iterate", track=t.name, iter=iteration, action="done")
-                            Blackboard().write(store, [tr.name for tr in tracks])
+                            blackboard.write(store, track_names)
                             break
                     except Exception:
                         pass
                     
-                    Blackboard().write(store, [tr.name for tr in tracks])
+                    blackboard.write(store, track_names)
 
             except Exception as exc:
                 disqualified.append(t.name)
@@ -485,35 +533,38 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                 if t.name not in disqualified:
                     disqualified.append(t.name)
                 ev.emit(stage="iterate", track=t.name, action="crash", error=str(r))
+        ev.flush()
 
         # Build blackboard (observations-only)
-        Blackboard().write(store, [t.name for t in tracks])
-        blackboard_text = store.path("BLACKBOARD.md").read_text(encoding="utf-8", errors="ignore")
+        blackboard.write(store, track_names)
+        blackboard_text = store.read_cached("BLACKBOARD.md")
 
         # Verify
+        # Not overlapped with the tracks: their worktrees live under
+        # cfg.repo_path/.dbg/worktrees, so a tree-walking verify command (pytest,
+        # ruff, ...) would pick up files agents are still editing.
         # If verify already run? Verify is cheap enough to re-run usually, implies freshness.
         ev.emit(stage="verify", action="run")
-        Verify().run(store, cfg.repo_path, use_docker=cfg.use_docker)
-        Verify().check(store, cfg.repo_path)
+        verify_step.run(store, cfg.repo_path, use_docker=cfg.use_docker)
+        verify_step.check(store, cfg.repo_path)
 
         # Score (artifact-backed)
-        ScoreComputer().write(store, [t.name for t in tracks])
+        ScoreComputer().write(store, track_names)
 
         # Judge
         ev.emit(stage="judge", action="run")
+        ev.flush()
         tracks_map = {t.name: t for t in tracks}
-        decision = Judge().run(store, [t.name for t in tracks], disqualified=disqualified, tracks_config=tracks_map)
-        Judge().check(store, cfg.repo_path)
+        decision = judge_step.run(store, track_names, disqualified=disqualified, tracks_config=tracks_map)
+        judge_step.check(store, cfg.repo_path)
 
         # Apply (only if we have a patch and ANVIL_AUTO_APPLY is enabled)
-        import os
         auto_apply = os.environ.get("ANVIL_AUTO_APPLY", "1").lower() in ("1", "true", "yes")
         winner = decision.winner
         applied = False
         if winner and auto_apply:
-            patches = sorted(store.path("tracks", winner).glob("iter_*/PATCH.diff"))
-            if patches:
-                patch = patches[-1]
+            patch = _latest_patch(store.path("tracks", winner))
+            if patch is not None:
                 ev.emit(stage="apply", action="run", winner=winner, patch=str(patch))
                 rc = Apply().run(store, cfg.repo_path, patch_path=patch)
                 applied = rc == 0
@@ -530,16 +581,24 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                 disqualified_tracks=disqualified,
             )
         )
+        decision_md = store.path("DECISION.md")
         return RunResult(
             status=final_status,
             run_dir=store.run_dir,
-            decision_file=store.path("DECISION.md") if store.path("DECISION.md").exists() else None,
+            decision_file=decision_md if decision_md.is_file() else None,
         )
     except Exception as exc:  # pragma: no cover
         ev.emit(stage="crash", action="exception", error=str(exc))
-        store.write_text("CRASH.txt", traceback.format_exc())
-        store.write_status(
-            RunStatus(run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message=f"crash: {exc}")
+        store.write_batched(
+            [
+                ("CRASH.txt", traceback.format_exc()),
+                (
+                    "RUN_STATUS.json",
+                    RunStatus(
+                        run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message=f"crash: {exc}"
+                    ),
+                ),
+            ]
         )
         return RunResult(status="FAIL", run_dir=store.run_dir)
     finally:
@@ -553,9 +612,10 @@ async def run_debug_session(cfg: RunConfig) -> RunResult:
                 
                 if is_success or cfg.cleanup_always:
                     ev.emit(stage="cleanup", action="run")
-                    wt.cleanup([t.name for t in tracks])
+                    wt.cleanup(track_names)
             except Exception as e:
                 logger.warning(f"Auto-cleanup failed: {e}")
+        ev.flush()
 
 
 async def run_harden_session(cfg: RunConfig) -> RunResult:
@@ -566,13 +626,15 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
     """
     store = ArtifactStore(cfg.run_dir())
     store.ensure()
-    ev = EventLog(store.path("events.jsonl"))
+    ev = EventLog(store.path("events.jsonl"), buffered=True)
     
     tracks: list[TrackConfig] = []
+    track_names: list[str] = []
     wt: WorktreeManager | None = None
 
     try:
         tracks, use_ts, max_files = _load_tracks(cfg)
+        track_names = [t.name for t in tracks]
         
         meta = RunMeta(
             run_id=cfg.run_id,
@@ -588,11 +650,15 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
             RunStatus(run_id=cfg.run_id, mode=cfg.mode, status="RUNNING", message="starting harden")
         )
 
+        context_step = ContextBuilder()
+        verify_step = Verify()
+        blackboard = Blackboard()
+
         # Step 1: Build context (same as debug but may focus on different aspects)
         ev.emit(stage="harden", action="context")
-        ctx_chk = ContextBuilder().check(store, cfg.repo_path)
+        ctx_chk = context_step.check(store, cfg.repo_path)
         if ctx_chk != 0:
-            ContextBuilder().run(
+            context_step.run(
                 store,
                 cfg.repo_path,
                 issue_text=cfg.issue_text or "Harden this codebase: find bugs, vulnerabilities, missing tests.",
@@ -600,47 +666,30 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                 max_files=max_files,
             )
         
-        context_md = store.path("CONTEXT.md").read_text(encoding="utf-8", errors="ignore")
+        context_md = store.read_cached("CONTEXT.md")
         
         # Step 2: Baseline verification
         ev.emit(stage="harden", action="verify_baseline")
-        Verify().run(store, cfg.repo_path, use_docker=cfg.use_docker)
+        verify_step.run(store, cfg.repo_path, use_docker=cfg.use_docker)
+        ev.flush()
         
-        baseline_verify = (
-            store.path("VERIFY.md").read_text(encoding="utf-8", errors="ignore")
-            if store.path("VERIFY.md").exists()
-            else "No baseline verification ran."
-        )
+        try:
+            baseline_verify = store.read_cached("VERIFY.md")
+        except FileNotFoundError:
+            baseline_verify = "No baseline verification ran."
         
         # Step 3: Setup worktrees for breaker tracks
         wt = WorktreeManager(repo=cfg.repo_path, store=store)
-        wt.create_worktrees([t.name for t in tracks])
+        wt.create_worktrees(track_names)
         wt.write_worktree_contracts(tracks)
         
         # Validate worktrees with actionable diagnostics
-        validation = wt.validate_worktrees_ready([t.name for t in tracks])
+        validation = wt.validate_worktrees_ready(track_names)
         if validation.failed:
-            error_lines = ["Worktree validation failed. Actionable diagnostics:"]
-            for track, reason in validation.failed.items():
-                error_lines.append(f"  - Track '{track}': {reason}")
-            
-            if not wt._is_git_repo():
-                error_lines.append("")
-                error_lines.append("Root cause: Repo is not a git repository.")
-                error_lines.append(f"Solution: Ensure {cfg.repo_path} is a valid git repo.")
-            else:
-                error_lines.append("")
-                error_lines.append(f"Possible causes:")
-                error_lines.append(f"  - Branches dbg/{cfg.run_id}/<track> already exist from stale runs")
-                error_lines.append(f"  - Git worktree command failed")
-                error_lines.append("")
-                error_lines.append(f"Solutions:")
-                error_lines.append(f"  - Run: anvil cleanup run --run-id {cfg.run_id}")
-                error_lines.append(f"  - Check logs in: {store.path('logs')}")
-            
-            error_msg = "\n".join(error_lines)
+            error_msg = _worktree_validation_error(cfg, store, wt, validation.failed)
             logger.error(error_msg)
-            store.write_text("WORKTREE_VALIDATION_ERROR.txt", error_msg)
+            # Atomic: a crash mid-write never leaves a truncated diagnostic behind
+            atomic_write_bytes(store.path("WORKTREE_VALIDATION_ERROR.txt"), error_msg.encode("utf-8"))
             store.write_status(
                 RunStatus(
                     run_id=cfg.run_id, 
@@ -688,7 +737,7 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                     )
                     
                     bb_path = store.path("BLACKBOARD.md")
-                    current_bb = bb_path.read_text(encoding="utf-8", errors="ignore") if bb_path.exists() else ""
+                    current_bb = store.read_cached("BLACKBOARD.md") if bb_path.exists() else ""
                     
                     await iter_step.run(
                         store=store,
@@ -709,17 +758,17 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                             wt_path = wt.get_worktree_path(t.name)
                             try:
                                 # 1. Apply patch
-                                apply_cmd = f'git apply --whitespace=nowarn "{patch_path}"'
+                                apply_cmd = ["git", "apply", "--whitespace=nowarn", str(patch_path)]
                                 apply_res = run_cmd(apply_cmd, cwd=wt_path, timeout_s=30)
                                 
                                 if apply_res.returncode == 0:
                                     # 2. Run Verify
                                     iter_store = ArtifactStore(store.path("tracks", t.name, f"iter_{iteration:02d}"))
-                                    Verify().run(iter_store, wt_path, use_docker=cfg.use_docker)
+                                    verify_step.run(iter_store, wt_path, use_docker=cfg.use_docker)
                                 
                                 # 3. Robust Cleanup
-                                run_cmd("git reset --hard", cwd=wt_path)
-                                run_cmd("git clean -fd", cwd=wt_path)
+                                run_cmd(["git", "reset", "--hard"], cwd=wt_path)
+                                run_cmd(["git", "clean", "-fd"], cwd=wt_path)
                             except Exception as e:
                                 logger.warning(f"Harden verification failed for {t.name}: {e}")
                     
@@ -748,7 +797,7 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                             break
                     
                     # Update blackboard with findings from ALL tracks (not just this one)
-                    Blackboard().write(store, [tr.name for tr in tracks])
+                    blackboard.write(store, track_names)
             
             except Exception as exc:
                 # Per-track crash isolation: do not crash whole harden session
@@ -776,6 +825,7 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                     store.path("tracks", t.name, "CRASH.txt"),
                     "".join(traceback.format_exception(type(r), r, r.__traceback__)),
                 )
+        ev.flush()
         
         # Step 6: Compile HARDEN.md report
         harden_report = [
@@ -813,23 +863,32 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                 if patch_path.exists():
                     harden_report.append(f"- `{patch_path.relative_to(store.run_dir)}`")
         
-        store.write_text("HARDEN.md", "\n".join(harden_report))
-        
-        store.write_status(
-            RunStatus(
-                run_id=cfg.run_id, 
-                mode=cfg.mode, 
-                status="DONE", 
-                message=f"harden completed, {len(findings)} tracks processed",
-                disqualified_tracks=disqualified,
-            )
+        final_status = RunStatus(
+            run_id=cfg.run_id,
+            mode=cfg.mode,
+            status="DONE",
+            message=f"harden completed, {len(findings)} tracks processed",
+            disqualified_tracks=disqualified,
+        )
+        store.write_batched(
+            [
+                ("HARDEN.md", "\n".join(harden_report)),
+                ("RUN_STATUS.json", final_status),
+            ]
         )
         return RunResult(status="DONE", run_dir=store.run_dir, decision_file=store.path("HARDEN.md"))
     except Exception as exc:  # pragma: no cover
         ev.emit(stage="crash", action="exception", error=str(exc))
-        store.write_text("CRASH.txt", traceback.format_exc())
-        store.write_status(
-            RunStatus(run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message=f"crash: {exc}")
+        store.write_batched(
+            [
+                ("CRASH.txt", traceback.format_exc()),
+                (
+                    "RUN_STATUS.json",
+                    RunStatus(
+                        run_id=cfg.run_id, mode=cfg.mode, status="FAIL", message=f"crash: {exc}"
+                    ),
+                ),
+            ]
         )
         return RunResult(status="FAIL", run_dir=store.run_dir)
     finally:
@@ -842,7 +901,8 @@ async def run_harden_session(cfg: RunConfig) -> RunResult:
                 
                 if is_success or cfg.cleanup_always:
                     ev.emit(stage="cleanup", action="run")
-                    wt.cleanup([t.name for t in tracks])
+                    wt.cleanup(track_names)
             except Exception as e:
                 logger.warning(f"Auto-cleanup failed: {e}")
+        ev.flush()
 
@@ -12,16 +12,17 @@ CONTRACT
   - Raises FileNotFoundError/ValueError if profile missing
 """
 
+import functools
 import importlib.resources
 
-
 from . import profiles
 
 
+@functools.lru_cache(maxsize=16)
 def load_profile(name: str) -> str:
-    fname = f"{name}.md"
-    with importlib.resources.open_text(profiles, fname, encoding="utf-8") as f:
-        return f.read()
+    # Bundled profiles are immutable for the life of the process; TrackIterate
+    # asks for the same one every iteration.
+    return importlib.resources.files(profiles).joinpath(f"{name}.md").read_text(encoding="utf-8")
 
 
 if __name__ == "__main__":
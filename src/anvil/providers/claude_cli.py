@@ -15,109 +15,42 @@ CONTRACT
 
 from __future__ import annotations
 
-import asyncio
-import json
-import os
 from dataclasses import dataclass, field
-from pathlib import Path
+from typing import Any
 
-from ..util.shell import which
-from .base import Provider, ProviderResult
-from .common import build_prompt, extract_between, normalize_iteration_json
-
-_BEGIN_JSON = "BEGIN_ITERATION_JSON"
-_END_JSON = "END_ITERATION_JSON"
-_BEGIN_DIFF = "BEGIN_PATCH_DIFF"
-_END_DIFF = "END_PATCH_DIFF"
+from .marker_cli import MarkerCliProvider
 
 
 @dataclass
-class ClaudeCliProvider(Provider):
+class ClaudeCliProvider(MarkerCliProvider):
+    provider_name = "claude"
+
     claude_cmd: str = "claude"
     timeout_s: int = 600
     # Allow passing extra args via config if needed (e.g. ["--expensive"])
     extra_args: list[str] = field(default_factory=list)
 
-    async def run_iteration(
-        self,
-        *,
-        repo: Path,
-        track: str,
-        iteration: int,
-        role: str,
-        directions: str,
-        context: str,
-        blackboard: str,
-    ) -> ProviderResult:
-        if which(self.claude_cmd) is None:
-            raise RuntimeError("claude CLI not found in PATH")
-
-        prompt = build_prompt(
-            track=track,
-            iteration=iteration,
-            role=role,
-            directions=directions,
-            context=context,
-            blackboard=blackboard,
-        )
+    def command(self) -> str:
+        return self.claude_cmd
 
+    def build_argv(self, prompt: str) -> list[str]:
         # Invocation: claude [extra_args] -p <prompt>
         # Adjust as needed for specific Claude CLI variants.
         argv = [self.claude_cmd]
         if self.extra_args:
             argv.extend(self.extra_args)
         argv.extend(["-p", prompt])
+        return argv
 
-        proc = await asyncio.create_subprocess_exec(
-            *argv,
-            cwd=str(repo),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=os.environ,
-        )
-
-        try:
-            stdout_b, stderr_b = await asyncio.wait_for(proc.communicate(), timeout=self.timeout_s)
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.wait()
-            raise RuntimeError(f"claude timed out after {self.timeout_s}s")
-
-        stdout = stdout_b.decode() if stdout_b else ""
-        stderr = stderr_b.decode() if stderr_b else ""
-        combined = stdout + (("\n" + stderr) if stderr else "")
-
-        if proc.returncode != 0:
-            raise RuntimeError(f"claude failed (rc={proc.returncode}). Output:\n{combined}")
-
-        json_block = extract_between(combined, _BEGIN_JSON, _END_JSON)
-        if not json_block:
-            raise ValueError("claude output missing iteration JSON markers")
-
-        diff_block = extract_between(combined, _BEGIN_DIFF, _END_DIFF)
-        patch_diff = None
-        if diff_block and diff_block.strip() != "NO_PATCH":
-            patch_diff = diff_block.strip() + "\n"
-
-        normalized_json_str = normalize_iteration_json(json_block)
-        it = json.loads(normalized_json_str)
-        it["track"] = track
-        it["iteration"] = iteration
-        if patch_diff:
-            if "proposed_changes" not in it:
-                it["proposed_changes"] = {}
-            it["proposed_changes"]["has_patch"] = True
-        return ProviderResult(
-            text=combined,
-            iteration_json=it,
-            patch_diff=patch_diff,
-            meta={"provider": "claude", "cmd": self.claude_cmd},
-        )
-
+    def result_meta(self) -> dict[str, Any]:
+        return {"provider": "claude", "cmd": self.claude_cmd}
 
 if __name__ == "__main__":
     import argparse
+    import asyncio
+    import json
     import sys
+    from pathlib import Path
 
     parser = argparse.ArgumentParser(description="Claude Provider CLI")
     parser.add_argument("--repo", required=True, help="Path to repo")
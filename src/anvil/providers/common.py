@@ -6,14 +6,14 @@ CONTRACT
 - Invariants:
   - extract_json always returns a string (empty if failed)
   - normalize_iteration_json always returns strict JSON schema
+  - normalize_iteration_dict returns the same envelope as a fresh dict
 - Failure:
   - Returns empty string or minimal valid JSON on failure
 """
 
-import json
 import re
 
-from ..util.json_utils import parse_json
+from ..util.json_utils import dumps_indented, parse_json
 
 def extract_between(text: str, start_marker: str, end_marker: str) -> str:
     """Extract text between valid markers."""
@@ -39,38 +39,53 @@ def extract_between(text: str, start_marker: str, end_marker: str) -> str:
     except Exception:
         return ""
 
+# Defaults for keys an LLM envelope may omit. Values are immutable, so a
+# shallow merge never aliases module state into a provider result.
+_ITERATION_DEFAULTS = {
+    "thought": "No thought provided",
+    "resolution": "loose",
+    "confidence": 0.5,
+    "schema_version": 1,
+    "status_signal": "NEEDS_MORE_WORK",
+}
+
+_ITERATION_FALLBACK = {
+    "schema_version": 1,
+    "status_signal": "NEEDS_MORE_WORK",
+    "thought": "Failed to parse JSON",
+    "resolution": "loose",
+    "confidence": 0.0,
+}
+# Serialized once: the parse-failure path returns this string as-is.
+_ITERATION_FALLBACK_JSON = dumps_indented(_ITERATION_FALLBACK)
+
+
+def normalize_iteration_dict(raw_json: str) -> dict:
+    """Parse and default-fill an iteration envelope, returning a fresh dict.
+
+    Providers use this directly to avoid a dumps/loads round trip.
+    """
+    # Use robust parse_json which applies json_repair
+    data = parse_json(raw_json)
+
+    # If parse_json failed completely, return fallback
+    if not isinstance(data, dict):
+        return dict(_ITERATION_FALLBACK)
+
+    # Ensure required fields (single C-level merge; parsed values win)
+    return {**_ITERATION_DEFAULTS, **data}
+
+
 def normalize_iteration_json(raw_json: str) -> str:
     """Ensure iteration JSON matches schema minimal requirements.
     
     Uses json_repair library to handle malformed LLM output (control chars,
     trailing commas, unquoted keys, etc).
     """
-    # Use robust parse_json which applies json_repair
     data = parse_json(raw_json)
-    
-    # If parse_json failed completely, return fallback
     if not isinstance(data, dict):
-        return json.dumps({
-            "schema_version": 1,
-            "status_signal": "NEEDS_MORE_WORK",
-            "thought": "Failed to parse JSON",
-            "resolution": "loose",
-            "confidence": 0.0
-        })
-    
-    # Ensure required fields
-    if "thought" not in data:
-        data["thought"] = "No thought provided"
-    if "resolution" not in data:
-        data["resolution"] = "loose"
-    if "confidence" not in data:
-        data["confidence"] = 0.5
-    if "schema_version" not in data:
-        data["schema_version"] = 1
-    if "status_signal" not in data:
-        data["status_signal"] = "NEEDS_MORE_WORK"
-        
-    return json.dumps(data, indent=2)
+        return _ITERATION_FALLBACK_JSON
+    return dumps_indented({**_ITERATION_DEFAULTS, **data})
 
 def build_prompt(
     *,
@@ -137,7 +152,7 @@ def build_prompt(
         "Return EXACTLY the following markers and contents:\n"
         f"{_BEGIN_JSON}\n"
         "JSON must be a single object matching this shape (use status_signal DONE when proposing a fix):\n"
-        f"{json.dumps(schema_hint, indent=2)}\n"
+        f"{dumps_indented(schema_hint)}\n"
         f"{_END_JSON}\n"
         f"{_BEGIN_DIFF}\n"
         "A complete unified diff (git diff format) that fixes the issue.\n"
@@ -14,52 +14,26 @@ CONTRACT
 
 from __future__ import annotations
 
-import json
-import subprocess
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Any
 
-from ..util.shell import which
-from .base import Provider, ProviderResult
-from .common import extract_between, normalize_iteration_json, build_prompt
-
-_BEGIN_JSON = "BEGIN_ITERATION_JSON"
-_END_JSON = "END_ITERATION_JSON"
-_BEGIN_DIFF = "BEGIN_PATCH_DIFF"
-_END_DIFF = "END_PATCH_DIFF"
+from .marker_cli import MarkerCliProvider
 
 
 @dataclass
-class GeminiCliProvider(Provider):
+class GeminiCliProvider(MarkerCliProvider):
+    provider_name = "gemini"
+
     gemini_cmd: str = "gemini"
     model: str = "gemini-3-pro"
     timeout_s: int = 600
 
-    async def run_iteration(
-        self,
-        *,
-        repo: Path,
-        track: str,
-        iteration: int,
-        role: str,
-        directions: str,
-        context: str,
-        blackboard: str,
-    ) -> ProviderResult:
-        if which(self.gemini_cmd) is None:
-            raise RuntimeError("gemini CLI not found in PATH")
-
-        prompt = build_prompt(
-            track=track,
-            iteration=iteration,
-            role=role,
-            directions=directions,
-            context=context,
-            blackboard=blackboard,
-        )
+    def command(self) -> str:
+        return self.gemini_cmd
 
-        args = [
+    def build_argv(self, prompt: str) -> list[str]:
+        return [
+            self.gemini_cmd,
             "--model",
             self.model,
             "--output-format",
@@ -67,66 +41,15 @@ class GeminiCliProvider(Provider):
             "--prompt",
             prompt,
         ]
-        
-        import asyncio
-        import os
-
-        process = await asyncio.create_subprocess_exec(
-            self.gemini_cmd,
-            *args,
-            cwd=str(repo),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=os.environ,
-        )
-
-        try:
-            stdout_b, stderr_b = await asyncio.wait_for(process.communicate(), timeout=self.timeout_s)
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
-            raise RuntimeError(f"gemini timed out after {self.timeout_s}s")
-
-        stdout_text = stdout_b.decode() if stdout_b else ""
-        stderr_text = stderr_b.decode() if stderr_b else ""
-        combined = stdout_text + (("\n" + stderr_text) if stderr_text else "")
-
-        if process.returncode != 0:
-            raise RuntimeError(f"gemini failed (rc={process.returncode}). Output:\n{combined}")
-
-        json_block = extract_between(combined, _BEGIN_JSON, _END_JSON)
-        if not json_block:
-            raise ValueError("gemini output missing iteration JSON markers")
-        # Extract patch first
-        diff_block = extract_between(combined, _BEGIN_DIFF, _END_DIFF)
-        patch_diff = None
-        if diff_block and diff_block.strip() != "NO_PATCH":
-            patch_diff = diff_block.strip() + "\n"
-
-        normalized_json_str = normalize_iteration_json(json_block)
-        it = json.loads(normalized_json_str)
-
-        # Apply defaults manually if needed, or trust normalize?
-        # normalize_iteration_json already ensures schema.
-        # But we might want to override track/iteration to be safe?
-        it["track"] = track
-        it["iteration"] = iteration
-        if patch_diff:
-            if "proposed_changes" not in it:
-                it["proposed_changes"] = {}
-            it["proposed_changes"]["has_patch"] = True
-            
-        return ProviderResult(
-            text=combined,
-            iteration_json=it,
-            patch_diff=patch_diff,
-            meta={"provider": "gemini", "model": self.model},
-        )
 
+    def result_meta(self) -> dict[str, Any]:
+        return {"provider": "gemini", "model": self.model}
 
 if __name__ == "__main__":
     import argparse
+    import json
     import sys
+    from pathlib import Path
 
     parser = argparse.ArgumentParser(description="Gemini Provider CLI")
     parser.add_argument("--repo", required=True, help="Path to repo")
@@ -15,7 +15,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from ..util.shell import which
+from ..util.shell import which_cached
 from .base import Provider, ProviderResult
 
 
@@ -34,7 +34,7 @@ class GhCliProvider(Provider):
         context: str,
         blackboard: str,
     ) -> ProviderResult:
-        if which(self.gh_cmd) is None:
+        if which_cached(self.gh_cmd) is None:
             raise RuntimeError("gh CLI not found in PATH")
         # Placeholder: write prompt to a file and use gh as a transport (user will customize).
         # We keep a basic command that will usually fail unless user wires it.
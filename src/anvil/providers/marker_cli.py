@@ -0,0 +1,121 @@
+"""Shared base for marker-protocol CLI providers.
+
+CONTRACT
+- Inputs: Repo, track, iteration, role, directions, context, blackboard
+- Outputs (required):
+  - ProviderResult with parsed JSON and optional patch diff
+- Invariants:
+  - Subclasses only describe how to invoke their CLI (abstract `command()` +
+    `build_argv()`); an incomplete subclass fails at instantiation
+  - Output must contain strict BEGIN_ITERATION_JSON/END_ITERATION_JSON markers
+  - Patch diff must be between BEGIN_PATCH_DIFF/END_PATCH_DIFF
+  - track/iteration in the returned JSON always match the call arguments
+- Failure:
+  - Raises RuntimeError if the CLI is missing, fails, or times out
+  - Raises ValueError if output is missing markers
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+from pathlib import Path
+from typing import Any, ClassVar
+
+from ..util.shell import which_cached
+from .base import Provider, ProviderResult
+from .common import build_prompt, extract_between, normalize_iteration_dict
+
+BEGIN_JSON = "BEGIN_ITERATION_JSON"
+END_JSON = "END_ITERATION_JSON"
+BEGIN_DIFF = "BEGIN_PATCH_DIFF"
+END_DIFF = "END_PATCH_DIFF"
+
+
+class MarkerCliProvider(Provider, abc.ABC):
+    """Run a local agent CLI once per iteration and parse its marker blocks.
+
+    Concrete providers are dataclasses that declare `timeout_s` and implement
+    `command()` and `build_argv()`; everything else is shared here.
+    """
+
+    provider_name: ClassVar[str] = "cli"
+    timeout_s: int
+
+    @abc.abstractmethod
+    def command(self) -> str:
+        """Executable name looked up on PATH."""
+
+    @abc.abstractmethod
+    def build_argv(self, prompt: str) -> list[str]:
+        """Full argv (executable first) for one non-interactive prompt."""
+
+    def result_meta(self) -> dict[str, Any]:
+        return {"provider": self.provider_name}
+
+    async def run_iteration(
+        self,
+        *,
+        repo: Path,
+        track: str,
+        iteration: int,
+        role: str,
+        directions: str,
+        context: str,
+        blackboard: str,
+    ) -> ProviderResult:
+        name = self.provider_name
+        if which_cached(self.command()) is None:
+            raise RuntimeError(f"{name} CLI not found in PATH")
+
+        prompt = build_prompt(
+            track=track,
+            iteration=iteration,
+            role=role,
+            directions=directions,
+            context=context,
+            blackboard=blackboard,
+        )
+
+        proc = await asyncio.create_subprocess_exec(
+            *self.build_argv(prompt),
+            cwd=str(repo),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            stdout_b, stderr_b = await asyncio.wait_for(proc.communicate(), timeout=self.timeout_s)
+        except TimeoutError as err:
+            proc.kill()
+            await proc.wait()
+            raise RuntimeError(f"{name} timed out after {self.timeout_s}s") from err
+
+        stdout = stdout_b.decode() if stdout_b else ""
+        stderr = stderr_b.decode() if stderr_b else ""
+        combined = stdout + (("\n" + stderr) if stderr else "")
+
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed (rc={proc.returncode}). Output:\n{combined}")
+
+        json_block = extract_between(combined, BEGIN_JSON, END_JSON)
+        if not json_block:
+            raise ValueError(f"{name} output missing iteration JSON markers")
+
+        diff_block = extract_between(combined, BEGIN_DIFF, END_DIFF)
+        patch_diff = None
+        if diff_block and diff_block.strip() != "NO_PATCH":
+            patch_diff = diff_block.strip() + "\n"
+
+        it = normalize_iteration_dict(json_block)
+        # Inject/Fix metadata that normalize might not know about
+        it["track"] = track
+        it["iteration"] = iteration
+        if patch_diff:
+            it.setdefault("proposed_changes", {})["has_patch"] = True
+        return ProviderResult(
+            text=combined,
+            iteration_json=it,
+            patch_diff=patch_diff,
+            meta=self.result_meta(),
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from ..artifacts.store import ArtifactStore
@@ -15,37 +16,58 @@ class ScoreComputer:
       - SCORES.json
     - Invariants:
       - Scoring is deterministic based on file presence/content
+      - Tracks are scored concurrently (I/O-bound walks); SCORES.json keeps input order
       - +5 for ITERATION.json, +10 for PATCH.diff, +40 for VERIFY PASS
     - Failure:
       - Returns 0.0 for tracks with missing artifacts
     """
 
-    def score_track(self, store: ArtifactStore, track: str) -> float:
+    def _verify_pass(self, store: ArtifactStore) -> bool:
+        try:
+            txt = store.path("VERIFY.md").read_text(encoding="utf-8", errors="ignore")
+        except FileNotFoundError:
+            return False
+        return "PASS" in txt and "FAIL" not in txt
+
+    def _track_evidence(self, store: ArtifactStore, track: str) -> tuple[bool, bool]:
+        """(has ITERATION.json, has PATCH.diff) under tracks/<track>/iter_*/."""
+        found = store.iter_files(track, ("ITERATION.json", "PATCH.diff"))
+        return bool(found["ITERATION.json"]), bool(found["PATCH.diff"])
+
+    def score_track(
+        self, store: ArtifactStore, track: str, verify_pass: bool | None = None
+    ) -> float:
         score = 0.0
-        tdir = store.path("tracks", track)
+        has_iter, has_patch = self._track_evidence(store, track)
 
         # Evidence: has any ITERATION.json
-        iters = list(tdir.glob("iter_*/ITERATION.json"))
-        if iters:
+        if has_iter:
             score += 5.0
 
         # Evidence: has PATCH.diff
-        patches = list(tdir.glob("iter_*/PATCH.diff"))
-        if patches:
+        if has_patch:
             score += 10.0
 
-        # Verification: PASS?
-        verify_md = store.path("VERIFY.md")
-        if verify_md.exists():
-            txt = verify_md.read_text(encoding="utf-8", errors="ignore")
-            if "PASS" in txt and "FAIL" not in txt:
-                score += 40.0
+        # Verification: PASS? (run-level VERIFY.md; read once per write())
+        if verify_pass is None:
+            verify_pass = self._verify_pass(store)
+        if verify_pass:
+            score += 40.0
 
         # Disqualification handled elsewhere.
         return score
 
     def write(self, store: ArtifactStore, tracks: list[str]) -> None:
-        data = {"schema_version": 1, "scores": {t: self.score_track(store, t) for t in tracks}}
+        verify_pass = self._verify_pass(store)
+        def _score(t: str) -> float:
+            return self.score_track(store, t, verify_pass=verify_pass)
+
+        if len(tracks) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(tracks))) as ex:
+                scores = dict(zip(tracks, ex.map(_score, tracks), strict=True))
+        else:
+            scores = {t: _score(t) for t in tracks}
+        data = {"schema_version": 1, "scores": scores}
         store.write_json("SCORES.json", data)
 
 
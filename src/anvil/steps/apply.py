@@ -8,6 +8,11 @@ CONTRACT
   - logs/apply.stderr.log
 - Invariants:
   - Applies patch using `git apply --whitespace=nowarn`
+  - Always dry-runs (`--check`) first; the real apply only runs if a check passed
+  - If the plain check fails in a git repo, trial-applies with `--3way` to a
+    scratch copy of the index (`--cached`, GIT_INDEX_FILE) and only applies
+    with `--3way` (changes are staged) when that merge is conflict-free.
+    `git apply --check --3way` is not used: it exits 0 on conflicts.
   - Records exit code in APPLY.md
 - Failure:
   - If patch fails (exit != 0), APPLY.md records failure code but run() returns exit code
@@ -15,11 +20,19 @@ CONTRACT
 
 from __future__ import annotations
 
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
 
 from ..artifacts.store import ArtifactStore
-from ..util.shell import run_cmd
+from ..util.shell import CmdResult, run_cmd, run_cmd_capture
+
+
+def _read_log(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore").strip()
+    except Exception:
+        return ""
 
 
 @dataclass
@@ -29,15 +42,22 @@ class Apply:
     def run(self, store: ArtifactStore, repo: Path, patch_path: Path) -> int:
         is_git_repo = (repo / ".git").exists() or (repo / ".git").is_file()
         
-        # Task 4.7: Check first
+        # Task 4.7: Check first (cheap dry run; fail fast before touching the tree)
         check_res = run_cmd(
-            cmd=f'git apply --check --whitespace=nowarn "{patch_path}"',
+            cmd=["git", "apply", "--check", "--whitespace=nowarn", str(patch_path)],
             cwd=repo,
             stdout_path=store.path("logs", "apply_check.stdout.log"),
             stderr_path=store.path("logs", "apply_check.stderr.log"),
-            timeout_s=30,
+            timeout_s=15,
         )
-        
+        mode: list[str] = []
+        if check_res.returncode != 0 and is_git_repo:
+            # Context drifted? A 3-way merge against the patch's base blobs
+            # often succeeds where a plain apply does not.
+            three_way = self._trial_three_way(store, repo, patch_path)
+            if three_way is not None and three_way.returncode == 0:
+                check_res, mode = three_way, ["--3way"]
+
         md_lines = ["# APPLY", "", f"Patch: `{patch_path}`"]
         
         if check_res.returncode != 0:
@@ -45,7 +65,7 @@ class Apply:
                 "", 
                 "## Check Failed", 
                 "```text", 
-                check_res.stderr.strip() if check_res.stderr else "See logs/apply_check.stderr.log",
+                _read_log(check_res.stderr_path) or "See logs/apply_check.stderr.log",
                 "```",
                 f"Exit: {check_res.returncode}",
             ])
@@ -54,14 +74,17 @@ class Apply:
 
         # If check passed, apply
         res = run_cmd(
-            cmd=f'git apply --whitespace=nowarn "{patch_path}"',
+            cmd=["git", "apply", *mode, "--whitespace=nowarn", str(patch_path)],
             cwd=repo,
             stdout_path=store.path("logs", "apply.stdout.log"),
             stderr_path=store.path("logs", "apply.stderr.log"),
             timeout_s=60,
+            drop_cache=True,
         )
         
         md_lines.extend(["", f"Exit: {res.returncode}", ""])
+        if mode:
+            md_lines += ["Applied with `--3way` (changes are staged in the index).", ""]
         if not is_git_repo:
             md_lines += [
                 "",
@@ -71,6 +94,41 @@ class Apply:
         store.write_text("APPLY.md", "\n".join(md_lines) + "\n")
         return res.returncode
 
+    def _trial_three_way(
+        self, store: ArtifactStore, repo: Path, patch_path: Path
+    ) -> CmdResult | None:
+        """Merge the patch into a throwaway copy of the index (None: no index path).
+
+        Conflicts make this exit non-zero, and neither the work tree nor the
+        real index is touched. The real `--3way` apply requires the touched
+        files to match the index, so a clean trial means a clean apply.
+        """
+        rc, out, _ = run_cmd_capture(
+            ["git", "rev-parse", "--git-path", "index"], cwd=repo, timeout_s=5
+        )
+        if rc != 0 or not out.strip():
+            return None
+        real_index = Path(out.strip())
+        if not real_index.is_absolute():
+            real_index = repo / real_index
+        scratch = store.path("logs", "apply_3way.index").resolve()
+        scratch.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(real_index, scratch)
+        except OSError:
+            scratch.unlink(missing_ok=True)  # no index yet: git starts from an empty one
+        try:
+            return run_cmd(
+                cmd=["git", "apply", "--cached", "--3way", "--whitespace=nowarn", str(patch_path)],
+                cwd=repo,
+                stdout_path=store.path("logs", "apply_check_3way.stdout.log"),
+                stderr_path=store.path("logs", "apply_check_3way.stderr.log"),
+                env={"GIT_INDEX_FILE": str(scratch)},
+                timeout_s=15,
+            )
+        finally:
+            scratch.unlink(missing_ok=True)
+
 if __name__ == "__main__":
     import argparse
     import sys
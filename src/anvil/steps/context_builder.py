@@ -18,7 +18,10 @@ CONTRACT
 
 from __future__ import annotations
 
+import contextlib
+import io
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -26,8 +29,83 @@ from typing import Any
 from ..artifacts.schemas import FilesIndex
 from ..artifacts.store import ArtifactStore
 from ..contracts.validate import check_required_artifacts
-from ..treesitter_utils import outline_symbols
-from ..util.shell import run_cmd, which
+from ..treesitter_utils import load_outline_cache, outline_symbols, save_outline_cache
+from ..util.json_utils import loads
+from ..util.shell import iter_cmd_lines, which
+from ..util.text import map_file
+
+# Task 4.4: Improve keyword extraction
+# - Lower min length to 2
+# - Allow hyphens inside words
+# regex: start with word char, followed by 1+ word/hyphen chars
+_WORD_RE = re.compile(r"\b[A-Za-z_][A-Za-z0-9_-]+\b")
+
+
+def _rg_json_paths(lines: Iterable[str]) -> Iterator[str]:
+    """Yield file paths from `rg --json` output ("begin" events only).
+
+    Paths that are not valid UTF-8 (reported as base64 "bytes") are skipped.
+    """
+    for line in lines:
+        if not line.startswith('{"type":"begin"'):
+            continue
+        try:
+            path = loads(line)["data"]["path"]["text"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        if isinstance(path, str):
+            yield path
+
+
+def _scan_tracked_files(repo: Path, keywords: list[str]) -> Iterator[str]:
+    """Yield `git ls-files` paths whose contents contain any keyword.
+
+    Mirrors the rg invocation: fixed strings, case-sensitive, files over 1MB
+    skipped, stops as soon as the caller stops consuming.
+    """
+    pattern = re.compile(b"|".join(re.escape(k.encode("utf-8")) for k in keywords))
+    for rel in iter_cmd_lines(["git", "ls-files"], cwd=repo, timeout_s=30):
+        if not rel or rel.startswith('"'):  # skip C-quoted unusual names
+            continue
+        fp = repo / rel
+        try:
+            if fp.stat().st_size > 1_000_000:
+                continue
+            with map_file(fp) as data:
+                hit = pattern.search(data) is not None
+        except OSError:
+            continue
+        if hit:
+            yield rel
+
+
+def _accept_files(repo: Path, hits: Iterable[str], max_files: int) -> list[str]:
+    """First max_files distinct hits that are small, readable text files."""
+    files: list[str] = []
+    seen: set[str] = set()  # O(1) dedupe; `files` keeps hit order
+    for path_str in hits:
+        if not path_str or path_str in seen:
+            continue
+        seen.add(path_str)
+
+        # Task 4.5: Safety checks (size, binary)
+        fp = repo / path_str
+        try:
+            stats = fp.stat()
+            if stats.st_size > 1_000_000:  # 1MB cap
+                continue
+            # check binary content (null bytes in first chunk)
+            with fp.open("rb") as f:
+                chunk = f.read(1024)
+                if b"\0" in chunk:
+                    continue
+        except Exception:
+            continue
+
+        files.append(path_str)
+        if len(files) >= max_files:
+            break
+    return files
 
 
 @dataclass
@@ -46,60 +124,49 @@ class ContextBuilder:
         rg = which("rg")
         candidates: list[dict[str, Any]] = []
 
+        # Dedupe (first occurrence wins) *before* truncating, so repeated
+        # words in the issue don't crowd out distinct keywords.
+        words = list(dict.fromkeys(w.lower() for w in _WORD_RE.findall(issue_text)))[:20]
+
+        # Simple frequency filter could go here, but unique sorted is a start
+        keywords = sorted(words) if words else ["TODO"]
+
         if rg:
-            # Task 4.4: Improve keyword extraction
-            # - Lower min length to 2
-            # - Allow hyphens inside words
-            # regex: start with word char, followed by 1+ word/hyphen chars
-            words = [
-                w.lower()
-                for w in re.findall(r"\b[A-Za-z_][A-Za-z0-9_-]+\b", issue_text)
-                if len(w) >= 2
-            ][:20]  # increased limit slightly
-            
-            # Simple frequency filter could go here, but unique sorted is a start
-            query = "|".join(sorted(set(words))) if words else "TODO"
-            
+            # Fixed-string pattern file (-F -f) lets rg use its multi-literal
+            # matcher instead of compiling a regex alternation. Absolute, since
+            # rg runs in the repo while the run dir may be relative to our cwd.
+            patterns_path = store.write_text("logs/rg_patterns.txt", "\n".join(keywords) + "\n")
+            patterns_path = patterns_path.resolve()
+
             # Task 4.5: Safety - ignore generated dirs
-            cmd = f'rg -n --hidden --glob "!.git/*" --glob "!.dbg/*" --glob "!__pycache__/*" "{query}" .'
-            res = run_cmd(
-                cmd=cmd,
+            # --json -m 1: one begin/match/end group per matching file; only
+            # "begin" events are decoded. We stream rg's stdout and stop it as
+            # soon as max_files paths have been accepted.
+            argv = [
+                rg, "--json", "-m", "1", "--hidden", "-F", "-f", str(patterns_path),
+                "--max-filesize", "1M",
+                "--glob", "!.git/*", "--glob", "!.dbg/*", "--glob", "!__pycache__/*",
+                "--glob", "!node_modules/*", "--glob", "!target/*",
+                ".",
+            ]
+            rg_lines = iter_cmd_lines(
+                argv,
                 cwd=repo,
-                stdout_path=store.path("logs", "context_rg.stdout.log"),
                 stderr_path=store.path("logs", "context_rg.stderr.log"),
                 timeout_s=30,
             )
-            if res.returncode == 0:
-                out = store.path("logs", "context_rg.stdout.log").read_text(
-                    encoding="utf-8", errors="ignore"
-                )
-                files = []
-                for line in out.splitlines():
-                    if ":" in line:
-                        path_str = line.split(":", 1)[0]
-                        if not path_str or path_str in files:
-                            continue
-                            
-                        # Task 4.5: Safety checks (size, binary)
-                        fp = repo / path_str
-                        try:
-                            stats = fp.stat()
-                            if stats.st_size > 1_000_000:  # 1MB cap
-                                continue
-                            # check binary content (null bytes in first chunk)
-                            with fp.open("rb") as f:
-                                chunk = f.read(1024)
-                                if b"\0" in chunk:
-                                    continue
-                        except Exception:
-                            continue
-                            
-                        files.append(path_str)
-                        
-                    if len(files) >= max_files:
-                        break
-                candidates = [{"path": p, "rationale": "keyword hit"} for p in files]
+            # Close explicitly: stopping early must kill rg now, not whenever
+            # the suspended generator happens to be collected.
+            with contextlib.closing(rg_lines):
+                files = _accept_files(repo, _rg_json_paths(rg_lines), max_files)
         else:
+            # No rg: list tracked files once and match in-process with one
+            # precompiled literal alternation (empty outside a git checkout).
+            files = _accept_files(repo, _scan_tracked_files(repo, keywords), max_files)
+
+        candidates = [{"path": p, "rationale": "keyword hit"} for p in files]
+
+        if not rg and not candidates:
             # Fallback: include a few common files if present
             for p in ["README.md", "pyproject.toml", "package.json"]:
                 if (repo / p).exists():
@@ -109,22 +176,19 @@ class ContextBuilder:
         files_index = FilesIndex(files=candidates)
         store.write_json("FILES.json", files_index.model_dump())
 
-        context_md = [
-            "# CONTEXT",
-            "",
-            "## Issue",
-            "```text",
-            issue_text.strip(),
-            "```",
-            "",
-            "## Selected files (FILES.json)",
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        w(f"# CONTEXT\n\n## Issue\n```text\n{issue_text.strip()}\n```\n\n")
+        w("## Selected files (FILES.json)\n")
         for c in candidates:
-            context_md.append(f"- `{c['path']}` — {c.get('rationale', '')}")
-        context_md.append("")
-        store.write_text("CONTEXT.md", "\n".join(context_md) + "\n")
+            w(f"- `{c['path']}` — {c.get('rationale', '')}\n")
+        w("\n")
+        store.write_text("CONTEXT.md", buf.getvalue())
 
         if use_treesitter:
+            # Outlines persist across runs; unchanged files are not re-parsed.
+            cache_file = repo / ".dbg" / "cache" / "outline.json"
+            load_outline_cache(cache_file)
             symbols: dict[str, Any] = {"schema_version": 1, "symbols": []}
             for c in candidates:
                 fp = repo / c["path"]
@@ -133,6 +197,10 @@ class ContextBuilder:
                     if outline:
                         symbols["symbols"].append({"path": c["path"], "outline": outline})
             store.write_json("SYMBOLS.json", symbols)
+            try:
+                save_outline_cache(cache_file)
+            except OSError:
+                pass  # cache is best-effort
 
     def check(self, store: ArtifactStore, repo: Path) -> int:
         res = check_required_artifacts(store.run_dir, ["CONTEXT.md", "FILES.json"])
@@ -15,6 +15,7 @@ CONTRACT
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -24,6 +25,8 @@ from ..contracts.validate import check_required_artifacts
 
 from ..config import TrackConfig
 
+_EVIDENCE_FILES = ("ITERATION.json", "PATCH.diff", "VERIFY.md")
+
 
 @dataclass
 class Judge:
@@ -68,10 +71,10 @@ class Judge:
             # Let's use `confidence` from ITERATION.json as primary signal + global verify if applicable.
             # And check if the track produced a valid patch.
 
-            tdir = store.path("tracks", t)
+            evidence = store.iter_files(t, _EVIDENCE_FILES)
 
             # Latest iteration
-            iters = sorted(tdir.glob("iter_*/ITERATION.json"))
+            iters = evidence["ITERATION.json"]
             confidence = 0.0
             if iters:
                 latest_iter = iters[-1]
@@ -101,7 +104,7 @@ class Judge:
             is_fixer = track_role in ("fixer", "debugger", "backend_fixer", "frontend_fixer")
 
             # Patch presence
-            patches = list(tdir.glob("iter_*/PATCH.diff"))
+            patches = evidence["PATCH.diff"]
             if patches:
                 score += 20.0
                 details.append("Patch found (+20)")
@@ -116,7 +119,7 @@ class Judge:
                     details.append(f"No patch (-10, {track_role} role)")
 
             # Per-track VERIFY.md existence and signal
-            verify_files = sorted(tdir.glob("iter_*/VERIFY.md"))
+            verify_files = evidence["VERIFY.md"]
             if verify_files:
                 score += 10.0  # small bonus for having run verification
                 details.append("Verification artifact found (+10)")
@@ -170,25 +173,20 @@ class Judge:
         )
         store.write_json("SCORECARD.json", decision.model_dump())
 
-        md = [
-            "# DECISION",
-            "",
-            f"Winner: **{winner or 'NONE'}**",
-            "",
-            "## Reason",
-            reason,
-            "",
-            "## Scores",
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        w("# DECISION\n\n")
+        w(f"Winner: **{winner or 'NONE'}**\n\n")
+        w(f"## Reason\n{reason}\n\n")
+        w("## Scores\n")
         for t, s in scores.items():
-            md.append(f"- {t}: {s:.1f}")
+            w(f"- {t}: {s:.1f}\n")
             # Include track details for transparency ("no vibes")
-            if t in track_details:
-                for detail in track_details[t]:
-                    md.append(f"  - {detail}")
+            for detail in track_details.get(t, ()):
+                w(f"  - {detail}\n")
         if disqualified:
-            md += ["", "## Disqualified", "", ", ".join(disqualified)]
-        store.write_text("DECISION.md", "\n".join(md) + "\n")
+            w(f"\n## Disqualified\n\n{', '.join(disqualified)}\n")
+        store.write_text("DECISION.md", buf.getvalue())
 
         return decision
 
@@ -9,6 +9,8 @@ CONTRACT
   - tracks/<track>/iter_<NN>/PATCH.diff
 - Invariants:
   - ITERATION.json follows IterationEnvelope schema (schema_version=1)
+  - Each artifact is written atomically (temp file + rename); ITERATION.json
+    is written last, so its presence implies ITERATION.txt/PATCH.diff are complete
   - Retries on provider checks are NOT handled here (handled by Policy/Orchestrator)
 - Failure:
   - check() returns 2 if ITERATION.json is missing or invalid
@@ -16,7 +18,6 @@ CONTRACT
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -27,6 +28,8 @@ from ..artifacts.store import ArtifactStore
 from ..contracts.validate import check_required_artifacts
 from ..prompts.load import load_profile
 from ..providers.base import Provider, ProviderResult
+from ..util.json_utils import dumps_indented
+from ..util.paths import atomic_write_bytes
 from ..util.redaction import Redactor
 
 
@@ -85,16 +88,22 @@ class TrackIterate:
 
         # Redact text outputs defensively.
         result_text = result.text or "(No text output from provider)"
-        (iter_dir / "ITERATION.txt").write_text(self.redactor.redact(result_text), encoding="utf-8")
+        atomic_write_bytes(
+            iter_dir / "ITERATION.txt", self.redactor.redact(result_text).encode("utf-8")
+        )
+
+        if result.patch_diff:
+            # Bytes, not text mode: no newline translation, so `git apply`
+            # sees exactly what the provider emitted on every platform.
+            atomic_write_bytes(iter_dir / "PATCH.diff", result.patch_diff.encode("utf-8"))
 
         # Task 4.6: Redact ITERATION.json content
         # We redact the JSON string to catch secrets in values 
         # (simpler than traversing dict)
-        json_str = json.dumps(result.iteration_json, indent=2, ensure_ascii=False)
-        (iter_dir / "ITERATION.json").write_text(self.redactor.redact(json_str) + "\n", encoding="utf-8")
-
-        if result.patch_diff:
-            (iter_dir / "PATCH.diff").write_text(result.patch_diff, encoding="utf-8")
+        json_str = dumps_indented(result.iteration_json)
+        atomic_write_bytes(
+            iter_dir / "ITERATION.json", (self.redactor.redact(json_str) + "\n").encode("utf-8")
+        )
 
     def check(self, store: ArtifactStore, repo: Path, track: str, iteration: int) -> int:
         iter_rel = f"tracks/{track}/iter_{iteration:02d}/ITERATION.json"
@@ -105,14 +114,14 @@ class TrackIterate:
             )
             return res.exit_code
 
-        # Validate schema.
+        # Validate schema. model_validate_json parses the bytes and validates
+        # in one pydantic-core call (malformed JSON is a ValidationError too).
         try:
-            raw = json.loads((store.run_dir / iter_rel).read_text(encoding="utf-8"))
-            IterationEnvelope.model_validate(raw)
+            IterationEnvelope.model_validate_json((store.run_dir / iter_rel).read_bytes())
             ok = True
             exit_code = 0
             details = "OK"
-        except (json.JSONDecodeError, ValidationError) as e:
+        except ValidationError as e:
             ok = False
             exit_code = 2
             details = f"Invalid ITERATION.json schema: {e}"
@@ -6,10 +6,16 @@ CONTRACT
   - VERIFY.md
   - logs/verify.commands.json
 - Outputs (optional):
-  - logs/verify.<name>.stdout.log
-  - logs/verify.<name>.stderr.log
+  - logs/verify.<index>.<name>.stdout.log
+  - logs/verify.<index>.<name>.stderr.log
 - Invariants:
   - Runs all commands in valid YAML contract
+  - Commands run concurrently unless marked `serial: true`; serial commands
+    run afterwards, one at a time, in contract order
+  - logs/verify.commands.json and VERIFY.md list commands in contract order
+  - Log names carry the command's contract index, so commands sharing a
+    (sanitized) name never write the same files concurrently
+  - The contract is parsed once per (path, mtime_ns); callers must not mutate it
   - Records pass/fail status in VERIFY.md
 - Failure:
   - check() returns 2 if VERIFY.md or command logs missing
@@ -17,6 +23,7 @@ CONTRACT
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -28,6 +35,11 @@ from ..contracts.validate import check_required_artifacts
 from ..util.paths import safe_filename
 from ..util.shell import run_cmd
 
+# LibYAML's C loader when PyYAML was built with it; same semantics as SafeLoader.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_CONTRACT_CACHE: dict[tuple[str, int], dict[str, Any]] = {}
+
 
 @dataclass
 class Verify:
@@ -35,48 +47,66 @@ class Verify:
 
     def _load_contract(self, repo: Path) -> dict[str, Any]:
         p = repo / ".dbg" / "verify_contract.yaml"
-        if p.exists():
-            return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-        return {"schema_version": 1, "commands": []}
+        try:
+            key = (str(p), p.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return {"schema_version": 1, "commands": []}
+        contract = _CONTRACT_CACHE.get(key)
+        if contract is None:
+            contract = yaml.load(p.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+            _CONTRACT_CACHE[key] = contract
+        return contract
 
     def run(self, store: ArtifactStore, repo: Path, use_docker: bool = False) -> None:
         from ..util.shell import run_cmd_docker
         
         contract = self._load_contract(repo)
         commands = contract.get("commands", []) or []
-        ran: list[dict[str, Any]] = []
-        failures: list[str] = []
+        # Choose execution method based on use_docker flag
+        runner = run_cmd_docker if use_docker else run_cmd
 
-        for c in commands:
+        def _exec(i: int, c: dict[str, Any]) -> dict[str, Any]:
             name = str(c.get("name", "cmd"))
             safe_name = safe_filename(name, default="cmd")
             cmd = str(c.get("cmd", ""))
             required = bool(c.get("required", False))
-            if not cmd:
-                continue
-
-            # Choose execution method based on use_docker flag
-            runner = run_cmd_docker if use_docker else run_cmd
-            
             res = runner(
                 cmd=cmd,
                 cwd=repo,
-                stdout_path=store.path("logs", f"verify.{safe_name}.stdout.log"),
-                stderr_path=store.path("logs", f"verify.{safe_name}.stderr.log"),
+                stdout_path=store.path("logs", f"verify.{i}.{safe_name}.stdout.log"),
+                stderr_path=store.path("logs", f"verify.{i}.{safe_name}.stderr.log"),
                 timeout_s=600,
+                drop_cache=True,  # test-runner logs are large and rarely re-read
             )
             # Task 4.10: Capture duration and bytes
-            ran.append({
-                "name": name, 
-                "cmd": cmd, 
-                "required": required, 
+            return {
+                "name": name,
+                "cmd": cmd,
+                "required": required,
                 "exit": res.returncode,
                 "elapsed_s": res.elapsed_s,
                 "stdout_bytes": res.stdout_bytes,
                 "stderr_bytes": res.stderr_bytes,
-            })
-            if required and res.returncode != 0:
-                failures.append(name)
+            }
+
+        runnable = [(i, c) for i, c in enumerate(commands) if str(c.get("cmd", ""))]
+        parallel = [(i, c) for i, c in runnable if not c.get("serial", False)]
+        serial = [(i, c) for i, c in runnable if c.get("serial", False)]
+
+        results: dict[int, dict[str, Any]] = {}
+        if len(parallel) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(parallel))) as ex:
+                done = ex.map(lambda ic: _exec(*ic), parallel)
+                for (i, _), r in zip(parallel, done, strict=True):
+                    results[i] = r
+        else:
+            for i, c in parallel:
+                results[i] = _exec(i, c)
+        for i, c in serial:
+            results[i] = _exec(i, c)
+
+        ran: list[dict[str, Any]] = [results[i] for i in sorted(results)]
+        failures: list[str] = [r["name"] for r in ran if r["required"] and r["exit"] != 0]
 
         store.write_json(
             "logs/verify.commands.json", {"schema_version": 1, "ran": ran, "failures": failures}
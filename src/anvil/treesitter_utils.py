@@ -7,12 +7,23 @@ CONTRACT
 - Invariants:
   - If tree-sitter deps missing, returns empty list (no crash)
   - Supports .py, .js, .ts, .tsx, .jsx
+  - One parser (and one compiled symbol Query) per language is reused across files
+  - Symbols are matched with tree-sitter Queries; a Python-side tree walk is
+    only the fallback when a Query cannot be compiled or run
+  - Outlines are cached by (path, mtime_ns, size); an unchanged file is parsed once
+  - The cache keeps at most _OUTLINE_CACHE_MAX files (least recently used go
+    first); callers get fresh dict copies, never the cached ones
+  - load_outline_cache/save_outline_cache persist that cache as JSON; entries
+    for files that no longer exist are dropped on save
 - Failure:
   - Returns empty list on any parse error or missing dependency
 """
 
 from __future__ import annotations
 
+import functools
+import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -34,6 +45,7 @@ class Symbol:
     end_line: int
 
 
+@functools.cache
 def _try_import_treesitter_tools():
     try:
         from treesitter_tools.api import list_symbols  # type: ignore
@@ -43,6 +55,7 @@ def _try_import_treesitter_tools():
         return None
 
 
+@functools.cache
 def _try_import_tree_sitter_languages():
     try:
         from tree_sitter_languages import get_parser  # type: ignore
@@ -52,7 +65,135 @@ def _try_import_tree_sitter_languages():
         return None
 
 
+# lang_name -> Parser; grammar loading happens once per language per process.
+_PARSER_CACHE: dict[str, Any] = {}
+
+
+def _parser_for(lang_name: str, get_parser) -> Any:
+    parser = _PARSER_CACHE.get(lang_name)
+    if parser is None:
+        parser = _PARSER_CACHE[lang_name] = get_parser(lang_name)
+    return parser
+
+
+# Capture names double as Symbol.kind; @name is the identifier node.
+_PYTHON_QUERY = """
+(function_definition name: (identifier) @name) @function
+(class_definition name: (identifier) @name) @class
+"""
+_JS_QUERY = """
+(function_declaration name: (_) @name) @function
+(method_definition name: (_) @name) @function
+(class_declaration name: (_) @name) @class
+"""
+
+# lang_name -> compiled Query, or None when the grammar rejects it.
+_QUERY_CACHE: dict[str, Any] = {}
+
+
+def _query_for(lang_name: str) -> Any:
+    if lang_name not in _QUERY_CACHE:
+        try:
+            from tree_sitter_languages import get_language  # type: ignore
+
+            src = _PYTHON_QUERY if lang_name == "python" else _JS_QUERY
+            _QUERY_CACHE[lang_name] = get_language(lang_name).query(src)
+        except Exception:
+            _QUERY_CACHE[lang_name] = None
+    return _QUERY_CACHE[lang_name]
+
+
+def _symbols_from_query(query: Any, root: Any, text_for) -> list[Symbol]:
+    symbols: list[Symbol] = []
+    for _, caps in query.matches(root):
+        kind = "function" if "function" in caps else "class"
+        node, name_node = caps.get(kind), caps.get("name")
+        # py-tree-sitter >= 0.23 returns lists of nodes per capture
+        if isinstance(node, list):
+            node = node[0] if node else None
+        if isinstance(name_node, list):
+            name_node = name_node[0] if name_node else None
+        if node is None or name_node is None:
+            continue
+        symbols.append(
+            Symbol(
+                kind=kind,
+                name=text_for(name_node),
+                start_line=node.start_point[0] + 1,
+                end_line=node.end_point[0] + 1,
+            )
+        )
+    return symbols
+
+
+# path -> (mtime_ns, size, outline). Only filled when a backend is available,
+# so installing tree-sitter later never leaves stale empty outlines behind.
+# Insertion order doubles as recency: hits move to the end, eviction pops the front.
+_OUTLINE_CACHE: dict[str, tuple[int, int, list[dict[str, Any]]]] = {}
+_OUTLINE_CACHE_MAX = 4096
+
+
+def _cache_put(key: str, entry: tuple[int, int, list[dict[str, Any]]]) -> None:
+    _OUTLINE_CACHE.pop(key, None)
+    _OUTLINE_CACHE[key] = entry
+    while len(_OUTLINE_CACHE) > _OUTLINE_CACHE_MAX:
+        del _OUTLINE_CACHE[next(iter(_OUTLINE_CACHE))]
+
+
+def load_outline_cache(cache_file: Path) -> None:
+    """Merge a persisted outline cache into memory (missing/corrupt file is ignored).
+
+    In-memory entries win, and loading stops once the cache is full.
+    """
+    try:
+        raw = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if not isinstance(raw, dict):
+        return
+    for key, entry in raw.items():
+        if len(_OUTLINE_CACHE) >= _OUTLINE_CACHE_MAX:
+            break
+        if key in _OUTLINE_CACHE:
+            continue
+        try:
+            _OUTLINE_CACHE[key] = (
+                int(entry["mtime_ns"]), int(entry["size"]), list(entry["outline"])
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+
+
+def save_outline_cache(cache_file: Path) -> None:
+    """Persist the in-memory outline cache as {path: {mtime_ns, size, outline}}."""
+    for key in [k for k in _OUTLINE_CACHE if not os.path.exists(k)]:
+        del _OUTLINE_CACHE[key]
+    data = {
+        key: {"mtime_ns": mtime_ns, "size": size, "outline": outline}
+        for key, (mtime_ns, size, outline) in _OUTLINE_CACHE.items()
+    }
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps(data), encoding="utf-8")
+
+
 def outline_symbols(path: Path) -> list[dict[str, Any]]:
+    if _try_import_treesitter_tools() is None and _try_import_tree_sitter_languages() is None:
+        return []
+    try:
+        st = path.stat()
+    except OSError:
+        return []
+    key = str(path.resolve())
+    hit = _OUTLINE_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        _cache_put(key, hit)
+        return [dict(sym) for sym in hit[2]]
+    outline = _outline_uncached(path)
+    _cache_put(key, (st.st_mtime_ns, st.st_size, outline))
+    return [dict(sym) for sym in outline]
+
+
+def _outline_uncached(path: Path) -> list[dict[str, Any]]:
     list_symbols = _try_import_treesitter_tools()
     if list_symbols is not None:
         try:
@@ -81,7 +222,7 @@ def outline_symbols(path: Path) -> list[dict[str, Any]]:
         return []
 
     try:
-        parser = get_parser(lang_name)
+        parser = _parser_for(lang_name, get_parser)
     except Exception:
         return []
 
@@ -98,8 +239,14 @@ def outline_symbols(path: Path) -> list[dict[str, Any]]:
     def text_for(node) -> str:
         return src[node.start_byte : node.end_byte].decode("utf-8", errors="ignore")
 
-    # Very small, pragmatic queries; refine per-language later.
-    # We avoid Query objects to keep this simple and robust.
+    query = _query_for(lang_name)
+    if query is not None:
+        try:
+            return [s.__dict__ for s in _symbols_from_query(query, root, text_for)]
+        except Exception:
+            pass  # fall back to the manual walk below
+
+    # Fallback: manual walk over every node.
     stack = [root]
     while stack:
         node = stack.pop()
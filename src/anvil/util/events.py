@@ -9,13 +9,17 @@ CONTRACT
 - Invariants:
   - Adds `ts_ms` timestamp automatically
   - Thread-safe (file append is atomic-ish on POSIX)
+  - When `buffered=True`, events are held in memory and appended with a
+    single write on `flush()`, context-manager exit, or once the buffer
+    reaches `flush_bytes` / is older than `flush_every_s`
 - Failure:
   - Raises IOError if log path is not writable
 """
 
 import json
 import time
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -24,14 +28,52 @@ from typing import Any
 class EventLog:
     path: Path
     run_id: str | None = None
+    buffered: bool = False
+    flush_bytes: int = 64 * 1024
+    flush_every_s: float = 1.0
+    _buf: list[str] = field(default_factory=list, init=False, repr=False)
+    _buf_bytes: int = field(default=0, init=False, repr=False)
+    _last_flush: float = field(default_factory=lambda: time.monotonic(), init=False, repr=False)
 
     def emit(self, **event: Any) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
         event.setdefault("ts_ms", int(time.time() * 1000))
         if self.run_id and "run_id" not in event:
             event["run_id"] = self.run_id
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        self._buf.append(line)
+        self._buf_bytes += len(line)
+        if (
+            not self.buffered
+            or self._buf_bytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_every_s
+        ):
+            self.flush()
+
+    def emit_batch(self, events: Iterable[dict[str, Any]]) -> None:
+        buffered, self.buffered = self.buffered, True
+        try:
+            for event in events:
+                self.emit(**event)
+        finally:
+            self.buffered = buffered
+        if not self.buffered:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buf:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
         with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.write("".join(self._buf))
+        self._buf.clear()
+        self._buf_bytes = 0
+
+    def __enter__(self) -> EventLog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.flush()
 
 
 if __name__ == "__main__":
@@ -14,24 +14,26 @@ CONTRACT
   - Raises ValueError on invalid IDs
 """
 
-import datetime
 import random
 import re
 import string
+import time
 
-_RUN_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
-_TRACK_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,31}$")
+# Anchored with \A/\Z so a plain .match() is a full match ($ would accept a trailing newline)
+_RUN_ID_RE = re.compile(r"\A[A-Za-z0-9][A-Za-z0-9_.-]{0,63}\Z")
+_TRACK_NAME_RE = re.compile(r"\A[A-Za-z0-9][A-Za-z0-9_-]{0,31}\Z")
+_SUFFIX_ALPHABET = string.ascii_lowercase + string.digits
 
 
 def new_run_id() -> str:
     # YYYYMMDD_HHMMSS_<rand4>
-    ts = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d_%H%M%S")
-    suffix = "".join(random.choice(string.ascii_lowercase + string.digits) for _ in range(4))
+    ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+    suffix = "".join(random.choices(_SUFFIX_ALPHABET, k=4))
     return f"{ts}_{suffix}"
 
 
 def validate_run_id(run_id: str) -> str:
-    if not _RUN_ID_RE.fullmatch(run_id):
+    if not _RUN_ID_RE.match(run_id):
         raise ValueError(
             "Invalid run id. Use 1-64 chars: letters/digits, plus '._-'. Must start with a letter "
             "or digit."
@@ -40,7 +42,7 @@ def validate_run_id(run_id: str) -> str:
 
 
 def validate_track_name(name: str) -> str:
-    if not _TRACK_NAME_RE.fullmatch(name):
+    if not _TRACK_NAME_RE.match(name):
         raise ValueError(
             "Invalid track name. Use 1-32 chars: letters/digits, plus '_-'. Must start with a "
             "letter or digit."
@@ -7,6 +7,8 @@ CONTRACT
   - remove-magenta: produces transparent PNGs from magenta backgrounds
   - analyze: validates transparency and foreground integrity
   - resize: resizes preserving aspect ratio
+  - Per-pixel work runs as whole-array NumPy ops when numpy is installed
+    (pip install 'anvil[fast]'); results are identical to the Pillow-only path
 - Failure:
   - Raises typer.Exit(1) on IO errors or validation failures
 """
@@ -17,10 +19,15 @@ from typing import Annotated
 
 try:
     import typer
-    from PIL import Image
+    from PIL import Image, ImageMath
 except ImportError as e:
     raise ImportError(f"Missing dependency: {e}. Please install 'typer' and 'pillow'.") from e
 
+try:  # optional accelerator
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
 
 app = typer.Typer(help="Image processing utilities.")
 
@@ -28,8 +35,9 @@ app = typer.Typer(help="Image processing utilities.")
 def _is_magenta(r: int, g: int, b: int, threshold: int) -> bool:
     # Magenta is high R, high B, low G.
     # Distance from (255, 0, 255)
-    dist = math.sqrt((r - 255) ** 2 + (g - 0) ** 2 + (b - 255) ** 2)
-    return dist < threshold
+    # Squared compare: sqrt(d2) < t  <=>  d2 < t*t for non-negative ints
+    dist2 = (r - 255) ** 2 + g * g + (b - 255) ** 2
+    return dist2 < threshold * threshold
 
 
 @app.command()
@@ -59,9 +67,6 @@ def remove_magenta(
         typer.echo(f"Error opening image: {e}", err=True)
         raise typer.Exit(1) from e
 
-    width, height = img.size
-    pixels = img.load()
-    
     # Parse background color
     bg_r, bg_g, bg_b = 255, 0, 255
     if bg_color.startswith("#") and len(bg_color) == 7:
@@ -69,33 +74,8 @@ def remove_magenta(
         bg_g = int(bg_color[3:5], 16)
         bg_b = int(bg_color[5:7], 16)
     
-    # Helper: Detect pure magenta (not purple anvil colors)
-    def is_magenta(r, g, b, thresh):
-        # Distance check
-        dist = math.sqrt((r - bg_r) ** 2 + (g - bg_g) ** 2 + (b - bg_b) ** 2)
-        if dist > thresh:
-            return False
-        
-        # Green ratio check: magenta has low green relative to red+blue
-        # Adjusted to 0.35 to catch Gemini logo and edge pixels
-        if r + b > 100:
-            green_ratio = g / (r + b)
-            if green_ratio > 0.35:  # Relaxed to catch more magenta
-                return False
-        
-        return True
-    
-    # Create binary alpha mask (255 = keep, 0 = remove)
-    mask = Image.new("L", (width, height), 0)
-    mask_pixels = mask.load()
-    
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            # If NOT magenta, keep it
-            if not is_magenta(r, g, b, threshold):
-                mask_pixels[x, y] = 255
-    
+    mask = _keep_mask(img, (bg_r, bg_g, bg_b), threshold)
+
     # Apply inward erosion (choke) to remove contaminated edge
     # This shrinks the foreground slightly, removing fringe
     if choke_px > 0:
@@ -109,6 +89,42 @@ def remove_magenta(
     typer.echo(f"Saved to {out_path} (threshold={threshold}, choke={choke_px}px)")
 
 
+def _keep_mask(img: "Image.Image", bg: tuple[int, int, int], threshold: int) -> "Image.Image":
+    """Binary mode "1" mask for an RGBA image: 1 = keep, 0 = magenta background.
+
+    Mode "1" is bit-packed (1/8 the memory of "L"); MinFilter and putalpha
+    accept it directly and give the same result as a 0/255 "L" mask.
+    """
+    bg_r, bg_g, bg_b = bg
+
+    if np is not None:
+        # int32: squared distances reach 3 * 255**2, past int16
+        rgba = np.asarray(img, dtype=np.int32)
+        r, g, b = rgba[..., 0], rgba[..., 1], rgba[..., 2]
+        d2 = (r - bg_r) ** 2 + (g - bg_g) ** 2 + (b - bg_b) ** 2
+        rb = r + b
+        # dist <= thresh, and green ratio g/(r+b) <= 0.35 whenever r+b > 100
+        is_mag = (d2 <= threshold * threshold) & ((rb <= 100) | (g * 100 <= 35 * rb))
+        # packbits pads each row to a byte, MSB first: exactly mode "1"'s raw layout
+        packed = np.packbits(~is_mag, axis=1)
+        return Image.frombytes("1", img.size, packed.tobytes())
+
+    # Pillow-only: the same rule as whole-image ImageMath ops ("I" mode, int32),
+    # so the per-pixel loop runs inside libImaging instead of Python.
+    r, g, b, _ = img.split()
+    t2 = threshold * threshold
+
+    def keep(ch):
+        R, G, B = ch["R"], ch["G"], ch["B"]
+        d2 = (R - bg_r) * (R - bg_r) + (G - bg_g) * (G - bg_g) + (B - bg_b) * (B - bg_b)
+        rb = R + B
+        # Magenta: dist <= thresh and green ratio g/(r+b) <= 0.35 whenever r+b > 100
+        is_mag = (d2 <= t2) & ((rb <= 100) | (G * 100 <= rb * 35))
+        return is_mag * -255 + 255  # 1 -> 0 (remove), 0 -> 255 (keep)
+
+    return ImageMath.lambda_eval(keep, R=r, G=g, B=b).convert("1", dither=Image.Dither.NONE)
+
+
 @app.command()
 def analyze(
     original_path: Annotated[Path, typer.Option("--original", exists=True)],
@@ -126,6 +142,49 @@ def analyze(
 
     width, height = orig.size
     total_pixels = width * height
+    spill_count, diff_sum, diff_max, opaque_count = _cutout_stats(
+        orig, cut, alpha_min, magenta_threshold
+    )
+
+    spill_pct = (spill_count / total_pixels) * 100
+    mean_diff = (diff_sum / opaque_count) if opaque_count > 0 else 0.0
+
+    print(f"Total pixels: {total_pixels}")
+    print(
+        f"Spill (alpha>={alpha_min}, magenta-dist<{magenta_threshold}): "
+        f"{spill_count} ({spill_pct:.4f}%)"
+    )
+    print(f"Integrity (alpha>=250): mean_diff={mean_diff:.4f}, max_diff={diff_max:.4f}")
+
+    if spill_pct > 0.1:  # Default tiny tolerance
+        typer.echo("FAIL: Too much spill.", err=True)
+        raise typer.Exit(1)
+
+    print("PASS")
+
+
+def _cutout_stats(
+    orig: "Image.Image", cut: "Image.Image", alpha_min: int, magenta_threshold: int
+) -> tuple[int, float, float, int]:
+    """(spill_count, diff_sum, diff_max, opaque_count) for same-size RGBA images."""
+    if np is not None:
+        o = np.asarray(orig, dtype=np.int32)
+        c = np.asarray(cut, dtype=np.int32)
+        ca = c[..., 3]
+        # Spill: meaningful alpha AND still within magenta_threshold of (255, 0, 255)
+        mag_d2 = (c[..., 0] - 255) ** 2 + c[..., 1] ** 2 + (c[..., 2] - 255) ** 2
+        spill = (ca >= alpha_min) & (mag_d2 < magenta_threshold * magenta_threshold)
+        # Integrity: RGB distance to the original for opaque output pixels
+        opaque = ca >= 250
+        d = np.sqrt(((o[..., :3] - c[..., :3]) ** 2).sum(axis=-1)[opaque])
+        return (
+            int(spill.sum()),
+            float(d.sum()),
+            float(d.max()) if d.size else 0,
+            int(d.size),
+        )
+
+    width, height = orig.size
     spill_count = 0
 
     diff_sum = 0
@@ -134,6 +193,7 @@ def analyze(
 
     o_pix = orig.load()
     c_pix = cut.load()
+    mag_thresh2 = magenta_threshold * magenta_threshold
 
     for y in range(height):
         for x in range(width):
@@ -142,8 +202,7 @@ def analyze(
 
             # Check spill: meaningful alpha AND still looks magenta?
             if ca >= alpha_min:
-                dist = math.sqrt((cr - 255) ** 2 + (cg - 0) ** 2 + (cb - 255) ** 2)
-                if dist < magenta_threshold:
+                if (cr - 255) ** 2 + cg * cg + (cb - 255) ** 2 < mag_thresh2:
                     spill_count += 1
 
             # Check integrity: if opaque in result, should match original (ignoring background)
@@ -162,21 +221,14 @@ def analyze(
                 diff_max = max(diff_max, d_pix)
                 opaque_count += 1
 
-    spill_pct = (spill_count / total_pixels) * 100
-    mean_diff = (diff_sum / opaque_count) if opaque_count > 0 else 0.0
-
-    print(f"Total pixels: {total_pixels}")
-    print(
-        f"Spill (alpha>={alpha_min}, magenta-dist<{magenta_threshold}): "
-        f"{spill_count} ({spill_pct:.4f}%)"
-    )
-    print(f"Integrity (alpha>=250): mean_diff={mean_diff:.4f}, max_diff={diff_max:.4f}")
+    return spill_count, diff_sum, diff_max, opaque_count
 
-    if spill_pct > 0.1:  # Default tiny tolerance
-        typer.echo("FAIL: Too much spill.", err=True)
-        raise typer.Exit(1)
 
-    print("PASS")
+_RESAMPLE = {
+    "lanczos": Image.Resampling.LANCZOS,
+    "bicubic": Image.Resampling.BICUBIC,
+    "box": Image.Resampling.BOX,
+}
 
 
 @app.command()
@@ -188,10 +240,21 @@ def resize(
     format: str = "png",
     quality: int = 85,
     optimize: bool = False,
+    resample: str = "lanczos",
 ):
-    """Resize an image."""
+    """Resize an image.
+
+    thumbnail() already pre-shrinks large inputs cheaply (JPEG draft decode,
+    then integer reduce() down to 2x the target), so the resample filter only
+    covers the last <=2x step. "bicubic" or "box" trade a little sharpness
+    for speed on big batches.
+    """
+    filt = _RESAMPLE.get(resample.lower())
+    if filt is None:
+        typer.echo(f"Unknown --resample {resample!r}; use one of {', '.join(_RESAMPLE)}", err=True)
+        raise typer.Exit(1)
     img = Image.open(img_path)
-    img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+    img.thumbnail((max_width, max_height), filt, reducing_gap=2.0)
     
     kwargs = {}
     if format.lower() in ("jpg", "jpeg"):
@@ -7,6 +7,7 @@ CONTRACT
   - clean_json_string: returns normalized JSON string or {}
 - Invariants:
   - Uses json_repair library to handle control chars, trailing commas, unquoted keys
+  - Uses orjson for loads/dumps_indented when installed, stdlib json otherwise
   - Never raises on malformed input (returns fallback)
 - Failure:
   - Returns original content if all repair attempts fail
@@ -22,6 +23,11 @@ from typing import Any, Union, List, Dict, Iterable
 
 from json_repair import repair_json
 
+try:  # optional accelerator: pip install 'anvil[fast]'
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 
 __all__ = [
     "PathEncoder",
@@ -31,7 +37,10 @@ __all__ = [
     "parse_json",
     "clean_json_string",
     "load_jsonl",
-    "iter_jsonl"
+    "iter_jsonl",
+    "loads",
+    "dumps_indented",
+    "dumps_indented_bytes",
 ]
 
 logger = logging.getLogger(__name__)
@@ -46,6 +55,41 @@ class PathEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def loads(content: Union[str, bytes]) -> Any:
+    """Parse JSON text, via orjson when available.
+
+    Raises ``json.JSONDecodeError`` on invalid input in both cases
+    (``orjson.JSONDecodeError`` subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_indented(data: Any) -> str:
+    """Serialise ``data`` with 2-space indentation, via orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass  # e.g. non-str keys or >64-bit ints; stdlib handles these
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def dumps_indented_bytes(data: Any) -> bytes:
+    """``dumps_indented(data) + "\n"`` as UTF-8 bytes, ready for one file write.
+
+    With orjson the bytes come straight from the serializer (no str decode /
+    re-encode round trip).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 def json_serialize(data: Any, *, handle_paths: bool = False, **kwargs: Any) -> str:
     """Serialise ``data`` to JSON, optionally handling ``Path`` instances."""
 
@@ -100,7 +144,7 @@ def parse_json(content: str) -> Union[Dict[str, Any], List[Any], str]:
     """Attempt to parse ``content`` as JSON; fall back to repairing the string."""
 
     try:
-        return json.loads(content)
+        return loads(content)
     except json.JSONDecodeError:
         pass
 
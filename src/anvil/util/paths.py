@@ -8,6 +8,7 @@ CONTRACT
   - safe_filename() returns sanitized string (no path separators)
   - ensure_dir() creates directory tree
   - copy_template() writes bundled resource to dest
+  - atomic_write_bytes() replaces dest in one rename (readers never see a partial file)
 - Invariants:
   - safe_filename removes dangerous chars `[^A-Za-z0-9_.-]`
   - copy_template never overwrites existing files (unless `overwrite=True`)
@@ -15,31 +16,55 @@ CONTRACT
   - copy_template raises if resource missing
 """
 
+import functools
 import importlib.resources
+import os
 import re
+import string
 from pathlib import Path
 
 from .. import templates
 
 _SAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+# Deletes every safe char: an empty result means there is nothing to replace.
+_DROP_SAFE_CHARS = str.maketrans("", "", string.ascii_letters + string.digits + "_.-")
 
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=32)
+def _load_template(template_name: str) -> str:
+    # Bundled templates are immutable for the life of the process.
+    return importlib.resources.files(templates).joinpath(template_name).read_text(encoding="utf-8")
+
+
 def copy_template(template_name: str, dest: Path, overwrite: bool = False) -> None:
     # Only write if missing (avoid clobber) unless forced.
     if dest.exists() and not overwrite:
         return
-    with importlib.resources.open_text(templates, template_name, encoding="utf-8") as f:
-        dest.write_text(f.read(), encoding="utf-8")
+    dest.write_text(_load_template(template_name), encoding="utf-8")
 
 
 def safe_filename(name: str, *, default: str = "item") -> str:
-    cleaned = _SAFE_FILENAME_RE.sub("_", name).strip("._-")
+    # Most names (command/track names) are already clean: one C-level
+    # translate skips the regex substitution for them.
+    if name.isascii() and not name.translate(_DROP_SAFE_CHARS):
+        cleaned = name.strip("._-")
+    else:
+        cleaned = _SAFE_FILENAME_RE.sub("_", name).strip("._-")
     return cleaned or default
 
+def atomic_write_bytes(dest: Path, data: bytes) -> None:
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 if __name__ == "__main__":
     import argparse
     import sys
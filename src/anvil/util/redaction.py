@@ -6,14 +6,20 @@ CONTRACT
 - Inputs: text strings
 - Outputs:
   - redacted text string
+  - redact_lines: redacted lines, one at a time (large logs never held whole)
 - Invariants:
   - Replaces known secrets (GitHub tokens, OpenAI keys) with [REDACTED]
   - Best-effort; does not guarantee all secrets are caught
+  - Patterns sharing the same flags are applied as one combined regex (one
+    pass over the text); mixed flags, capturing groups (backreferences would
+    be renumbered) or a join that does not compile (e.g. inline global flags)
+    fall back to one pass per pattern
 - Failure:
   - None (returns original text on error or no match)
 """
 
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -25,16 +31,38 @@ DEFAULT_PATTERNS = [
 ]
 
 
+def _combine(patterns: list[re.Pattern]) -> re.Pattern | None:
+    if not patterns or len({p.flags for p in patterns}) != 1:
+        return None
+    if any(p.groups for p in patterns):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns), patterns[0].flags)
+    except re.error:
+        return None
+
+
 @dataclass(frozen=True)
 class Redactor:
     patterns: list[re.Pattern] = field(default_factory=lambda: list(DEFAULT_PATTERNS))
+    _combined: re.Pattern | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_combined", _combine(self.patterns))
 
     def redact(self, text: str) -> str:
+        if self._combined is not None:
+            return self._combined.sub("[REDACTED]", text)
         out = text
         for pat in self.patterns:
             out = pat.sub("[REDACTED]", out)
         return out
 
+    def redact_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Redact line by line; safe because no default pattern matches a newline."""
+        for line in lines:
+            yield self.redact(line)
+
 if __name__ == "__main__":
     import argparse
     import sys
@@ -49,8 +77,8 @@ if __name__ == "__main__":
         print(r.redact(args.text))
     elif args.file:
         try:
-            content = Path(args.file).read_text(encoding="utf-8")
-            print(r.redact(content))
+            with Path(args.file).open(encoding="utf-8") as f:
+                sys.stdout.writelines(r.redact_lines(f))
         except Exception as e:
             print(f"Error reading file: {e}", file=sys.stderr)
             sys.exit(1)
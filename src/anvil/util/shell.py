@@ -6,29 +6,109 @@ CONTRACT
 - Inputs: Command string, cwd, timeout
 - Outputs (required):
   - CmdResult(returncode, stdout_path, stderr_path)
+  - run_cmd_async: same CmdResult, awaited on the running event loop
+  - iter_cmd_lines: stdout lines streamed as they arrive (no stdout file)
+  - run_cmd_capture: (returncode, stdout, stderr) held in memory (no files)
 - Invariants:
   - Writes stdout/stderr to specified files
   - Respects timeout_s (raises SubprocessTimeout if exceeded)
+  - drop_cache=True advises the kernel to evict the log pages afterwards
+    (posix_fadvise DONTNEED; no-op where unsupported)
+  - Never pass preexec_fn, user/group or umask changes to subprocess: they
+    push CPython off its vfork() spawn path onto a full fork(), which copies
+    the page tables of a large parent. (posix_spawn is out anyway, since it
+    requires cwd=None and every call here sets cwd.)
 - Failure:
   - Returns CmdResult with exit code (does NOT raise on non-zero exit)
 """
 
+import asyncio
+import functools
+import math
 import os
+import select
 import shlex
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
 
 def which(cmd: str) -> str | None:
-    for p in os.environ.get("PATH", "").split(os.pathsep):
-        candidate = Path(p) / cmd
-        if candidate.exists() and os.access(candidate, os.X_OK):
-            return str(candidate)
-    return None
+    # Reads PATH at call time (tests prepend fake bins); skips non-file entries.
+    return shutil.which(cmd)
 
 
-@dataclass(frozen=True)
+@functools.cache
+def which_cached(cmd: str) -> str | None:
+    """Memoized `which` for provider CLI discovery.
+
+    PATH is walked once per command name; call `which_cached.cache_clear()`
+    to force a fresh lookup (e.g. after installing a CLI mid-session).
+    """
+    return which(cmd)
+
+
+def _open_log(path: Path):
+    """Open a log for writing, creating its parent only when the open fails.
+
+    Log dirs almost always exist already, so this skips the per-call
+    mkdir/stat pair; a directory removed mid-run is simply recreated.
+    """
+    try:
+        return path.open("w", encoding="utf-8")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open("w", encoding="utf-8")
+
+
+def _wait_timeout(proc: subprocess.Popen, timeout_s: float) -> int:
+    """Wait for proc, raising TimeoutExpired after timeout_s.
+
+    Popen.wait(timeout) polls with sleeps of up to 50ms; a pidfd (Linux 5.3+)
+    turns readable the moment the child exits, so one poll() covers both
+    "exited" and "deadline passed". poll(), unlike select(), accepts fds past
+    FD_SETSIZE (1024). Falls back to Popen.wait where pidfds are unavailable.
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        return proc.wait(timeout=timeout_s)
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        ready = poller.poll(math.ceil(timeout_s * 1000))
+    except (ValueError, OSError):
+        return proc.wait(timeout=timeout_s)
+    finally:
+        os.close(pidfd)
+    if not ready:
+        raise subprocess.TimeoutExpired(proc.args, timeout_s)
+    return proc.wait()
+
+
+def _drop_page_cache(path: Path) -> None:
+    """Best-effort POSIX_FADV_DONTNEED so write-once logs don't evict hot repo pages."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        # A hint only: pages still dirty are left alone, and no write-back is forced
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@dataclass(frozen=True, slots=True)
 class CmdResult:
     cmd: str
     returncode: int
@@ -39,6 +119,46 @@ class CmdResult:
     stderr_bytes: int
 
 
+def _log_paths(stdout_path: Path | None, stderr_path: Path | None) -> tuple[Path, Path]:
+    """Fill in temp log files for whichever of stdout/stderr the caller omitted."""
+    if stdout_path is None:
+        tf_out = tempfile.NamedTemporaryFile(delete=False, prefix="dbg_stdout_")
+        stdout_path = Path(tf_out.name)
+        tf_out.close()
+    if stderr_path is None:
+        tf_err = tempfile.NamedTemporaryFile(delete=False, prefix="dbg_stderr_")
+        stderr_path = Path(tf_err.name)
+        tf_err.close()
+    return stdout_path, stderr_path
+
+
+def _cmd_result(
+    cmd: str | list[str],
+    rc: int,
+    stdout_path: Path,
+    stderr_path: Path,
+    elapsed_s: float,
+    drop_cache: bool,
+) -> CmdResult:
+    # Get byte counts
+    out_b = stdout_path.stat().st_size if stdout_path.exists() else 0
+    err_b = stderr_path.stat().st_size if stderr_path.exists() else 0
+
+    if drop_cache:
+        _drop_page_cache(stdout_path)
+        _drop_page_cache(stderr_path)
+
+    return CmdResult(
+        cmd=str(cmd),  # simplified for logs
+        returncode=rc,
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
+        elapsed_s=elapsed_s,
+        stdout_bytes=out_b,
+        stderr_bytes=err_b,
+    )
+
+
 def run_cmd(
     cmd: str | list[str],
     cwd: Path,
@@ -46,6 +166,7 @@ def run_cmd(
     stderr_path: Path | None = None,
     env: dict[str, str] | None = None,
     timeout_s: int | None = None,
+    drop_cache: bool = False,
 ) -> CmdResult:
     """Run a shell command and store stdout/stderr to files.
 
@@ -54,43 +175,40 @@ def run_cmd(
     - Always writes stdout/stderr files (creates temp if not provided).
     - Never raises for non-zero exit; caller inspects return code.
     - Records duration and output size.
+    - env=None (or {}) inherits the parent environment without copying it;
+      a non-empty env is overlaid on os.environ for this call only.
     """
-    import time
-    import tempfile
-    
     # Handle optional paths by creating temp files if needed
-    if stdout_path is None:
-        tf_out = tempfile.NamedTemporaryFile(delete=False, prefix="dbg_stdout_")
-        stdout_path = Path(tf_out.name)
-        tf_out.close()
-    if stderr_path is None:
-        tf_err = tempfile.NamedTemporaryFile(delete=False, prefix="dbg_stderr_")
-        stderr_path = Path(tf_err.name)
-        tf_err.close()
-    
-    stdout_path.parent.mkdir(parents=True, exist_ok=True)
-    stderr_path.parent.mkdir(parents=True, exist_ok=True)
+    stdout_path, stderr_path = _log_paths(stdout_path, stderr_path)
 
     # Determine shell mode: string -> True, list -> False
     use_shell = isinstance(cmd, str)
 
     start_t = time.time()
     with (
-        stdout_path.open("w", encoding="utf-8") as out_f,
-        stderr_path.open("w", encoding="utf-8") as err_f,
+        _open_log(stdout_path) as out_f,
+        _open_log(stderr_path) as err_f,
     ):
+        popen_kw = dict(
+            cwd=str(cwd),
+            shell=use_shell,
+            env=(os.environ | env) if env else None,
+            stdout=out_f,
+            stderr=err_f,
+            text=True,
+        )
         try:
-            p = subprocess.run(
-                cmd,
-                cwd=str(cwd),
-                shell=use_shell,
-                env=(os.environ | env) if env else None,
-                stdout=out_f,
-                stderr=err_f,
-                timeout=timeout_s,
-                text=True,
-            )
-            rc = p.returncode
+            if timeout_s is None:
+                rc = subprocess.run(cmd, **popen_kw).returncode
+            else:
+                with subprocess.Popen(cmd, **popen_kw) as proc:
+                    try:
+                        rc = _wait_timeout(proc, timeout_s)
+                    except BaseException:
+                        # Never let Popen.__exit__ wait on a child past its deadline
+                        proc.kill()
+                        proc.wait()
+                        raise
         except subprocess.TimeoutExpired:
             rc = 124  # Standard timeout exit code
             # We must output something to stderr?
@@ -99,21 +217,144 @@ def run_cmd(
             rc = 1
             err_f.write(f"\nException: {e}\n")
 
-    end_t = time.time()
-    
-    # Get byte counts
-    out_b = stdout_path.stat().st_size if stdout_path.exists() else 0
-    err_b = stderr_path.stat().st_size if stderr_path.exists() else 0
+    return _cmd_result(cmd, rc, stdout_path, stderr_path, time.time() - start_t, drop_cache)
 
-    return CmdResult(
-        cmd=str(cmd),  # simplified for logs
-        returncode=rc,
-        stdout_path=stdout_path,
-        stderr_path=stderr_path,
-        elapsed_s=end_t - start_t,
-        stdout_bytes=out_b,
-        stderr_bytes=err_b,
-    )
+
+async def run_cmd_async(
+    cmd: str | list[str],
+    cwd: Path,
+    stdout_path: Path | None = None,
+    stderr_path: Path | None = None,
+    env: dict[str, str] | None = None,
+    timeout_s: float | None = None,
+    drop_cache: bool = False,
+) -> CmdResult:
+    """Async run_cmd: the event loop keeps running while the process does.
+
+    CONTRACT:
+    - Same arguments, shell rule, log files, exit codes (124 timeout, 1 spawn
+      failure) and CmdResult as run_cmd; never raises for non-zero exit.
+    - Several calls can be awaited together (asyncio.gather) so their
+      fork/exec and wait overlap instead of running back to back.
+    - On timeout the process is killed and reaped before returning.
+    """
+    stdout_path, stderr_path = _log_paths(stdout_path, stderr_path)
+    proc_env = (os.environ | env) if env else None
+
+    start_t = time.time()
+    with (
+        _open_log(stdout_path) as out_f,
+        _open_log(stderr_path) as err_f,
+    ):
+        try:
+            if isinstance(cmd, str):
+                proc = await asyncio.create_subprocess_shell(
+                    cmd, cwd=str(cwd), env=proc_env, stdout=out_f, stderr=err_f
+                )
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=str(cwd), env=proc_env, stdout=out_f, stderr=err_f
+                )
+        except Exception as e:
+            rc = 1
+            err_f.write(f"\nException: {e}\n")
+        else:
+            try:
+                rc = await asyncio.wait_for(proc.wait(), timeout=timeout_s)
+            except TimeoutError:
+                proc.kill()
+                await proc.wait()
+                rc = 124  # Standard timeout exit code
+                err_f.write("\nTimeout expired.\n")
+
+    return _cmd_result(cmd, rc, stdout_path, stderr_path, time.time() - start_t, drop_cache)
+
+
+def run_cmd_capture(
+    cmd: str | list[str],
+    cwd: Path,
+    timeout_s: int | None = None,
+) -> tuple[int, str, str]:
+    """Run a short probe command and return (returncode, stdout, stderr).
+
+    CONTRACT:
+    - For small, quick outputs (git ref listings, status probes); nothing is
+      written to disk. Use run_cmd for long-running commands whose logs matter.
+    - Same shell rule as run_cmd: str -> shell=True, list[str] -> shell=False.
+    - Never raises: timeout -> rc 124, spawn failure -> rc 1 (message in stderr).
+    """
+    try:
+        p = subprocess.run(
+            cmd,
+            cwd=str(cwd),
+            shell=isinstance(cmd, str),
+            capture_output=True,
+            text=True,
+            timeout=timeout_s,
+        )
+    except subprocess.TimeoutExpired:
+        return 124, "", "Timeout expired.\n"
+    except Exception as e:
+        return 1, "", f"Exception: {e}\n"
+    return p.returncode, p.stdout, p.stderr
+
+
+def iter_cmd_lines(
+    argv: list[str],
+    cwd: Path,
+    stderr_path: Path | None = None,
+    timeout_s: int | None = None,
+) -> Iterator[str]:
+    """Run argv (shell=False) and yield stdout lines without a trailing newline.
+
+    CONTRACT:
+    - stdout is consumed from a pipe; nothing is buffered to disk.
+    - Closing the generator early (e.g. `break` in the caller) terminates the
+      process, so producers like `rg` stop as soon as enough output was read.
+    - The process is killed once timeout_s elapses; iteration then ends.
+    - Never raises for non-zero exit; a missing executable yields nothing.
+    """
+    err_f = None
+    if stderr_path is not None:
+        err_f = _open_log(stderr_path)
+    try:
+        try:
+            proc = subprocess.Popen(
+                argv,
+                cwd=str(cwd),
+                stdout=subprocess.PIPE,
+                stderr=err_f if err_f is not None else subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except OSError as e:
+            if err_f is not None:
+                err_f.write(f"\nException: {e}\n")
+            return
+        timer = threading.Timer(timeout_s, proc.kill) if timeout_s else None
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+        try:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                yield line.rstrip("\r\n")
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if proc.poll() is None:
+                proc.terminate()
+            proc.stdout.close()
+            proc.wait()
+    finally:
+        if err_f is not None:
+            err_f.close()
+
+
+def docker_image_ref() -> str:
+    """Image for `docker run`: $ANVIL_IMAGE_REF (e.g. a pinned `anvil@sha256:...`) or anvil:latest."""
+    return os.environ.get("ANVIL_IMAGE_REF") or "anvil:latest"
 
 
 def run_cmd_docker(
@@ -123,27 +364,38 @@ def run_cmd_docker(
     stderr_path: Path | None = None,
     env: dict[str, str] | None = None,
     timeout_s: int | None = None,
-    image: str = "anvil:latest",
+    image: str | None = None,
+    drop_cache: bool = False,
+    container_id: str | None = None,
 ) -> CmdResult:
     """Run a command inside a Docker container with repository mounted.
     
     CONTRACT:
     - Wraps command in `docker run` with volume mounts
     - Mounts cwd to /repo in container
+    - `image` defaults to docker_image_ref(), so CI can pin a digest ref and
+      skip tag resolution without touching callers
+    - With container_id, runs via `docker exec` in that already-running
+      container instead (no per-call container start); the caller must have
+      started it with cwd mounted at /repo. `image` is ignored then.
     - Ensures artifacts directory (.dbg) is accessible from host
     - Uses safe list-based execution (shell=False) for Docker launch
     - User command is passed to /bin/sh -c inside container (still potentially unsafe inside container, but avoids host injection)
     """
-    # Use resolve() to handle symlinks correctly for Docker mounts
-    abs_cwd = cwd.resolve()
-
-    # Construct docker run command as a list (safe)
-    docker_cmd = [
-        "docker", "run",
-        "--rm",  # Clean up container after execution
-        "-v", f"{abs_cwd}:/repo",  # Mount repo
-        "-w", "/repo",  # Set working directory
-    ]
+    if container_id is not None:
+        # Reuse a long-lived container: exec is far cheaper than a fresh run
+        docker_cmd = ["docker", "exec", "-w", "/repo"]
+    else:
+        # Use resolve() to handle symlinks correctly for Docker mounts
+        abs_cwd = cwd.resolve()
+
+        # Construct docker run command as a list (safe)
+        docker_cmd = [
+            "docker", "run",
+            "--rm",  # Clean up container after execution
+            "-v", f"{abs_cwd}:/repo",  # Mount repo
+            "-w", "/repo",  # Set working directory
+        ]
     
     # Add environment variables if needed
     if env:
@@ -155,7 +407,7 @@ def run_cmd_docker(
     # Inside the container, we run /bin/sh -c cmd. 
     # 'cmd' is a string (the user command).
     docker_cmd.extend([
-        image,
+        container_id if container_id is not None else (image or docker_image_ref()),
         "/bin/sh", "-c", cmd
     ])
     
@@ -167,6 +419,7 @@ def run_cmd_docker(
         stderr_path=stderr_path,
         env=None,  # Already passed to docker
         timeout_s=timeout_s,
+        drop_cache=drop_cache,
     )
 
 
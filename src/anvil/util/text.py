@@ -6,14 +6,36 @@ CONTRACT
 - Inputs: Path
 - Outputs:
   - File content as string
+  - map_file: read-only mmap of the file's bytes (no Python-side copy)
 - Invariants:
   - Reads as utf-8
+  - read_text_file is for small files; large scans should use map_file
 - Failure:
   - Raises FileNotFoundError/IOError
 """
 
+import mmap
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 
 def read_text_file(path: Path) -> str:
     return path.read_text(encoding="utf-8")
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """Yield a read-only mmap of `path` (b"" for empty files, which can't be mapped).
+
+    Supports slicing, `re` searches with bytes patterns and `.find`; decode
+    slices on demand instead of reading the whole file into a str.
+    """
+    with path.open("rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            yield b""
+            return
+        with mm:
+            yield mm
@@ -14,6 +14,9 @@ CONTRACT
   - Logs warnings on git errors
 """
 
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -21,7 +24,28 @@ from loguru import logger
 
 from .artifacts.store import ArtifactStore
 from .config import TrackConfig
-from .util.shell import run_cmd
+from .util.shell import run_cmd, run_cmd_capture
+
+_DAY_S = 86400
+
+_CONTRACT_TMPL = """\
+# CONTRACT — Worktree {name}
+
+## Purpose
+- role: {role}
+- provider: {provider}
+- model: {model}
+
+## Required artifacts (written to run artifacts, not necessarily committed)
+- tracks/{name}/iter_XX/ITERATION.json
+- tracks/{name}/iter_XX/ITERATION.txt
+
+## Disqualification
+- Missing required artifacts
+- Not running check gates
+- Editing outside this worktree
+- Claiming verification without logs
+"""
 
 
 @dataclass
@@ -71,13 +95,13 @@ class WorktreeManager:
                 continue
             
             # Check 3: git status works (validates git health)
-            status_check = run_cmd(
-                f"git -C \"{wt_path}\" status",
+            status_rc, _, _ = run_cmd_capture(
+                ["git", "-C", str(wt_path), "status"],
                 cwd=self.repo,
                 timeout_s=10,
             )
-            if status_check.returncode != 0:
-                failed[track] = f"git status failed in worktree (rc={status_check.returncode})"
+            if status_rc != 0:
+                failed[track] = f"git status failed in worktree (rc={status_rc})"
                 continue
             
             # All checks passed
@@ -92,6 +116,11 @@ class WorktreeManager:
         - Worktrees live under <repo>/.dbg/worktrees/<run_id>/<track>
         - Each worktree is on a branch dbg/<run_id>/<track>
         - If worktrees already exist, this is a no-op.
+        - Missing worktrees are registered serially, then checked out
+          concurrently (up to 8 at a time).
+        - A worktree whose checkout fails is removed again (directory and
+          branch), so a later call retries it instead of treating an empty
+          checkout as done.
         """
         if not self._is_git_repo():
             logger.warning("Repo is not a git repo; skipping worktree creation.")
@@ -100,35 +129,90 @@ class WorktreeManager:
         root = self._worktrees_root()
         root.mkdir(parents=True, exist_ok=True)
 
-        for t in tracks:
-            wt_dir = root / t
+        pending = [t for t in tracks if not (root / t).exists()]
+        if not pending:
+            return
+
+        # One ref listing up front instead of a `git branch --list` per track.
+        existing = self._existing_branches()
+        for t in list(pending):
             branch = f"dbg/{self.store.run_dir.name}/{t}"
-            if wt_dir.exists():
-                continue
-            
-            # Use 'git branch --list' to check for conflicts (safer than relying on error)
-            # Otherwise 'git worktree add' might fail with "already exists" but having checking is better.
-            branch_check = run_cmd(
-                f"git branch --list {branch}", 
-                cwd=self.repo,
-                timeout_s=5
-            )
-            stdout_content = branch_check.stdout_path.read_text(encoding="utf-8").strip() if branch_check.stdout_path and branch_check.stdout_path.exists() else ""
-            if stdout_content:
+            if branch in existing:
                 logger.warning(f"Branch {branch} already exists! Skipping worktree creation to avoid conflict.")
-                continue
-
-            # Create worktree on a new branch from current HEAD.
-            cmd = f'git worktree add -b "{branch}" "{wt_dir}"'
-            res = run_cmd(
-                cmd=cmd,
-                cwd=self.repo,
-                stdout_path=self.store.path("logs", f"worktree_{t}.stdout.log"),
-                stderr_path=self.store.path("logs", f"worktree_{t}.stderr.log"),
-                timeout_s=60,
-            )
-            if res.returncode != 0:
-                logger.warning(f"Failed to create worktree {t} (rc={res.returncode}); see logs.")
+                pending.remove(t)
+
+        # Registration (`worktree add --no-checkout`) stays serial: concurrent
+        # adds race on each other's half-written .git/worktrees/<name> files.
+        # The checkout itself (index + files, the slow part) is per-worktree
+        # state, so it runs in parallel.
+        registered = [t for t in pending if self._register_one(root, t)]
+        if len(registered) <= 1:
+            checked_out = [self._checkout_one(root, t) for t in registered]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(registered), 8)) as pool:
+                checked_out = list(pool.map(lambda t: self._checkout_one(root, t), registered))
+        # Rollback is serial for the same reason registration is.
+        for t, ok in zip(registered, checked_out, strict=True):
+            if not ok:
+                self._discard_one(root, t)
+
+    def _existing_branches(self) -> set[str]:
+        """Short names of this run's dbg/<run_id>/* branches (one git call)."""
+        rc, out, _ = run_cmd_capture(
+            [
+                "git",
+                "for-each-ref",
+                "--format=%(refname:short)",
+                f"refs/heads/dbg/{self.store.run_dir.name}/",
+            ],
+            cwd=self.repo,
+            timeout_s=5,
+        )
+        if rc != 0:
+            return set()
+        return {line.strip() for line in out.splitlines() if line.strip()}
+
+    def _register_one(self, root: Path, t: str) -> bool:
+        wt_dir = root / t
+        branch = f"dbg/{self.store.run_dir.name}/{t}"
+
+        # Create worktree on a new branch from current HEAD (files checked out later).
+        res = run_cmd(
+            cmd=["git", "worktree", "add", "--no-checkout", "-b", branch, str(wt_dir)],
+            cwd=self.repo,
+            stdout_path=self.store.path("logs", f"worktree_{t}.stdout.log"),
+            stderr_path=self.store.path("logs", f"worktree_{t}.stderr.log"),
+            timeout_s=60,
+        )
+        if res.returncode != 0:
+            logger.warning(f"Failed to create worktree {t} (rc={res.returncode}); see logs.")
+            return False
+        return True
+
+    def _checkout_one(self, root: Path, t: str) -> bool:
+        res = run_cmd(
+            cmd=["git", "reset", "--hard", "-q"],
+            cwd=root / t,
+            stdout_path=self.store.path("logs", f"worktree_{t}_checkout.stdout.log"),
+            stderr_path=self.store.path("logs", f"worktree_{t}_checkout.stderr.log"),
+            timeout_s=60,
+        )
+        if res.returncode != 0:
+            logger.warning(f"Failed to check out worktree {t} (rc={res.returncode}); see logs.")
+            return False
+        return True
+
+    def _discard_one(self, root: Path, t: str) -> None:
+        """Unregister a half-created worktree and drop its branch."""
+        wt_dir = root / t
+        rc, _, _ = run_cmd_capture(
+            ["git", "worktree", "remove", "--force", str(wt_dir)], cwd=self.repo, timeout_s=30
+        )
+        if rc != 0:
+            shutil.rmtree(wt_dir, ignore_errors=True)
+            run_cmd_capture(["git", "worktree", "prune"], cwd=self.repo, timeout_s=10)
+        branch = f"dbg/{self.store.run_dir.name}/{t}"
+        run_cmd_capture(["git", "branch", "-D", branch], cwd=self.repo, timeout_s=10)
 
     def write_worktree_contracts(self, tracks: list[TrackConfig]) -> None:
         root = self._worktrees_root()
@@ -136,26 +220,10 @@ class WorktreeManager:
             wt_dir = root / t.name
             if not wt_dir.exists():
                 continue
-            contract = [
-                f"# CONTRACT — Worktree {t.name}",
-                "",
-                "## Purpose",
-                f"- role: {t.role}",
-                f"- provider: {t.provider}",
-                f"- model: {t.model or 'null'}",
-                "",
-                "## Required artifacts (written to run artifacts, not necessarily committed)",
-                f"- tracks/{t.name}/iter_XX/ITERATION.json",
-                f"- tracks/{t.name}/iter_XX/ITERATION.txt",
-                "",
-                "## Disqualification",
-                "- Missing required artifacts",
-                "- Not running check gates",
-                "- Editing outside this worktree",
-                "- Claiming verification without logs",
-                "",
-            ]
-            (wt_dir / "CONTRACT.md").write_text("\n".join(contract), encoding="utf-8")
+            contract = _CONTRACT_TMPL.format(
+                name=t.name, role=t.role, provider=t.provider, model=t.model or "null"
+            )
+            (wt_dir / "CONTRACT.md").write_text(contract, encoding="utf-8")
 
     def _all_worktrees_root(self) -> Path:
         return self.repo / ".dbg" / "worktrees"
@@ -187,10 +255,8 @@ class WorktreeManager:
             
             if not status_file.exists():
                 # If we can't confirm run status in default location, check directory age
-                from datetime import datetime, timedelta
-                mtime = datetime.fromtimestamp(run_dir.stat().st_mtime)
                 # Mark stale only if > 7 days old
-                if mtime < datetime.now() - timedelta(days=7):
+                if run_dir.stat().st_mtime < time.time() - 7 * _DAY_S:
                     stale.append((run_dir, run_id))
             else:
                  # Check status content? Or just assume recent runs are valid?
@@ -205,8 +271,6 @@ class WorktreeManager:
         Returns:
             Count of removed worktrees (tracks)
         """
-        from datetime import datetime, timedelta
-        import shutil
         
         if not self._is_git_repo():
             return 0
@@ -216,15 +280,14 @@ class WorktreeManager:
             return 0
             
         removed_count = 0
-        threshold = datetime.now() - timedelta(days=older_than_days)
+        threshold = time.time() - older_than_days * _DAY_S
         
         for run_dir in root.iterdir():
             if not run_dir.is_dir():
                 continue
                 
             # Check modification time
-            mtime = datetime.fromtimestamp(run_dir.stat().st_mtime)
-            if mtime < threshold:
+            if run_dir.stat().st_mtime < threshold:
                 # Expired run directory
                 run_id = run_dir.name
                 
@@ -248,10 +311,10 @@ class WorktreeManager:
                     
                     # 1. Remove worktree
                     if wt_dir.exists():
-                        run_cmd(f'git worktree remove --force "{wt_dir}"', cwd=self.repo, timeout_s=30)
+                        run_cmd(["git", "worktree", "remove", "--force", str(wt_dir)], cwd=self.repo, timeout_s=30)
                     
                     # 2. Delete branch
-                    run_cmd(f'git branch -D "{branch}"', cwd=self.repo, timeout_s=10)
+                    run_cmd(["git", "branch", "-D", branch], cwd=self.repo, timeout_s=10)
                     
                     removed_count += 1
                 
@@ -274,10 +337,9 @@ class WorktreeManager:
             return
 
         # 1. Get canonical list of worktrees to avoid removing non-worktree dirs
-        res = run_cmd("git worktree list --porcelain", cwd=self.repo, timeout_s=5)
+        rc, content, _ = run_cmd_capture(["git", "worktree", "list", "--porcelain"], cwd=self.repo, timeout_s=5)
         known_worktrees = set()
-        if res.returncode == 0 and res.stdout_path and res.stdout_path.exists():
-            content = res.stdout_path.read_text()
+        if rc == 0:
             for line in content.splitlines():
                 if line.startswith("worktree "):
                     known_worktrees.add(Path(line[9:].strip()).resolve())
@@ -291,13 +353,11 @@ class WorktreeManager:
             # Remove worktree
             # Case A: Git knows about it
             if wt_dir in known_worktrees:
-                cmd = f'git worktree remove --force "{wt_dir}"'
-                res = run_cmd(cmd, cwd=self.repo, timeout_s=30)
+                res = run_cmd(["git", "worktree", "remove", "--force", str(wt_dir)], cwd=self.repo, timeout_s=30)
                 if res.returncode != 0:
                     logger.warning(f"Failed to remove worktree {t}")
             # Case B: Directory exists but git doesn't know (orphaned folder)
             elif wt_dir.exists():
-                import shutil
                 try:
                     shutil.rmtree(wt_dir)
                     logger.info(f"Removed orphaned worktree directory: {wt_dir}")
@@ -305,15 +365,14 @@ class WorktreeManager:
                     logger.warning(f"Failed to remove orphaned directory {wt_dir}: {e}")
             
             # Prune git worktree metadata (if any remains)
-            run_cmd("git worktree prune", cwd=self.repo, timeout_s=10)
+            run_cmd(["git", "worktree", "prune"], cwd=self.repo, timeout_s=10)
 
             # Archive or delete branch
             if archive:
                 self._archive_branch(branch, t)
             else:
                 # Delete branch
-                cmd = f'git branch -D "{branch}"'
-                run_cmd(cmd, cwd=self.repo, timeout_s=10)
+                run_cmd(["git", "branch", "-D", branch], cwd=self.repo, timeout_s=10)
         
         # Try to remove the worktrees root if empty
         if root.exists():
@@ -324,22 +383,18 @@ class WorktreeManager:
 
     def _archive_branch(self, branch: str, track: str) -> None:
         """Rename a branch to archive/anvil-{run_id}-{track}-{timestamp}."""
-        from datetime import datetime
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
         archive_name = f"archive/anvil-{self.store.run_dir.name}-{track}-{timestamp}"
         
         # Check if branch exists
-        check = run_cmd(f'git branch --list "{branch}"', cwd=self.repo, timeout_s=5)
-        if check.stdout_path and check.stdout_path.exists():
-            output = check.stdout_path.read_text().strip()
-            if not output:
-                logger.debug(f"Branch {branch} doesn't exist, nothing to archive")
-                return
+        _, output, _ = run_cmd_capture(["git", "branch", "--list", branch], cwd=self.repo, timeout_s=5)
+        if not output.strip():
+            logger.debug(f"Branch {branch} doesn't exist, nothing to archive")
+            return
         
         # Rename branch
-        cmd = f'git branch -m "{branch}" "{archive_name}"'
-        res = run_cmd(cmd, cwd=self.repo, timeout_s=10)
+        res = run_cmd(["git", "branch", "-m", branch, archive_name], cwd=self.repo, timeout_s=10)
         if res.returncode == 0:
             logger.info(f"Archived branch {branch} -> {archive_name}")
         else:
@@ -347,11 +402,8 @@ class WorktreeManager:
 
     def list_archived_branches(self) -> list[str]:
         """List all archived debug branches."""
-        res = run_cmd("git branch --list 'archive/anvil-*'", cwd=self.repo, timeout_s=5)
-        if res.stdout_path and res.stdout_path.exists():
-            output = res.stdout_path.read_text()
-            return [b.strip().lstrip("* ") for b in output.splitlines() if b.strip()]
-        return []
+        _, output, _ = run_cmd_capture(["git", "branch", "--list", "archive/anvil-*"], cwd=self.repo, timeout_s=5)
+        return [b.strip().lstrip("* ") for b in output.splitlines() if b.strip()]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, patch
+
+import pytest
+
+try:  # optional: faster loop for the async orchestrator tests
+    import uvloop
+except ImportError:  # pragma: no cover - depends on environment
+    uvloop = None
+
+if uvloop is not None:
+
+    # Not every pytest-asyncio release in the dev range defines this hookspec
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """pytest-asyncio hook: run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def anvil_container(tmp_path_factory):
+    """One detached anvil image container for the session: (repo, container_id).
+
+    Tests route run_cmd_docker through `docker exec` into it instead of paying
+    a `docker run --rm` per call. Skips when docker or the image is missing.
+    """
+    import shutil
+    import subprocess
+
+    from anvil.util.shell import docker_image_ref
+
+    if shutil.which("docker") is None:
+        pytest.skip("docker not installed")
+    repo = tmp_path_factory.mktemp("docker_repo")
+    image = docker_image_ref()
+    started = subprocess.run(
+        ["docker", "run", "-d", "--rm", "-v", f"{repo.resolve()}:/repo", "-w", "/repo",
+         image, "sleep", "infinity"],
+        capture_output=True, text=True,
+    )
+    if started.returncode != 0:
+        pytest.skip(f"cannot start {image}: {started.stderr.strip()}")
+    container_id = started.stdout.strip()
+    yield repo, container_id
+    subprocess.run(["docker", "kill", container_id], capture_output=True)
+
+
+# Collaborators of run_debug_session / run_harden_session that tests may stub
+ORCHESTRATOR_TARGETS = frozenset({
+    "Apply", "ArtifactStore", "Blackboard", "ContextBuilder", "EventLog", "Judge",
+    "ReproAssess", "ReproPlan", "ScoreComputer", "TrackIterate", "Verify",
+    "WorktreeManager", "_provider_for_track", "load_tracks_file",
+})
+
+
+async def _noop_run(*args, **kwargs):
+    return None
+
+
+@pytest.fixture
+def orchestrator_mocks():
+    """Patch `anvil.orchestrator` collaborators by name with pre-configured MagicMocks.
+
+    Usage: `m = orchestrator_mocks("WorktreeManager", "TrackIterate", ...)`; each
+    mock is reachable as `m.<name>` and is specced on the real object, so a
+    misspelt method raises AttributeError instead of passing silently.
+    Defaults make every gate pass (checks return 0, worktrees validate,
+    TrackIterate.run is a no-op coroutine function); tests only override what
+    they assert on. Replace `run` with a plain `async def` rather than an
+    AsyncMock unless call introspection is needed.
+    """
+    from anvil.worktrees import WorktreeValidation
+
+    stack = ExitStack()
+
+    def _patch(*names: str) -> SimpleNamespace:
+        unknown = set(names) - ORCHESTRATOR_TARGETS
+        assert not unknown, f"not an orchestrator collaborator: {sorted(unknown)}"
+        # One patch.multiple for the whole set instead of a _patch per name;
+        # spec=True limits each mock (and its instances) to the real attributes
+        mocks = SimpleNamespace(**stack.enter_context(
+            patch.multiple("anvil.orchestrator", spec=True, **dict.fromkeys(names, DEFAULT))
+        ))
+
+        if "WorktreeManager" in names:
+            wt = mocks.WorktreeManager.return_value
+            wt._is_git_repo.return_value = True
+            wt.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=[], failed={})
+        if "TrackIterate" in names:
+            ti = mocks.TrackIterate.return_value
+            ti.run = _noop_run
+            ti.check.return_value = 0
+        for gate in ("ContextBuilder", "ReproPlan"):
+            if gate in names:
+                getattr(mocks, gate).return_value.check.return_value = 0
+        return mocks
+
+    with stack:
+        yield _patch
+
+
+def _seed_track(root, name, confidence=None, patch=False, verify=None):
+    """Write a track's iter_01 artifacts under `root/tracks/<name>` (one mkdir)."""
+    d = root / "tracks" / name / "iter_01"
+    d.mkdir(parents=True, exist_ok=True)
+    if confidence is not None:
+        (d / "ITERATION.json").write_bytes(f'{{"confidence": {confidence}}}'.encode())
+    if patch:
+        (d / "PATCH.diff").write_bytes(b"patch")
+    if verify is not None:
+        (d / "VERIFY.md").write_bytes(verify.encode())
+    return d
+
+
+@pytest.fixture
+def seed_track():
+    """Judge fixture builder: `seed_track(root, name, confidence, patch=True, verify="...")`."""
+    return _seed_track
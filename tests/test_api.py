@@ -60,3 +60,13 @@ class TestPublicAPI(unittest.TestCase):
             self.assertIn("run_dir", result)
             self.assertIn("findings", result)
             self.assertIn("patches", result)
+
+    def test_light_submodule_import_skips_orchestrator(self):
+        """Top-level re-exports are lazy: anvil.util.shell alone stays light."""
+        import subprocess
+        import sys
+
+        probe = "import sys, anvil.util.shell; print('anvil.orchestrator' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+        self.assertIs(anvil.RunConfig, __import__("anvil.config").config.RunConfig)
@@ -27,9 +27,11 @@ def test_apply_fails_on_bad_patch(tmp_path):
     # Mock run_cmd to simulate git apply --check failure
     with patch("anvil.steps.apply.run_cmd") as mock_run:
         # First call = git apply --check (fails)
+        check_err = tmp_path / "check.stderr.log"
+        check_err.write_text("error: patch does not apply\n")
         mock_check_result = MagicMock()
         mock_check_result.returncode = 1
-        mock_check_result.stderr = "error: patch does not apply"
+        mock_check_result.stderr_path = check_err
         mock_run.return_value = mock_check_result
         
         step = Apply()
@@ -39,6 +41,7 @@ def test_apply_fails_on_bad_patch(tmp_path):
         assert result != 0, "Should return non-zero on bad patch"
         apply_md = (tmp_path / "run" / "APPLY.md").read_text()
         assert "Check Failed" in apply_md, "APPLY.md should say check failed"
+        assert "error: patch does not apply" in apply_md
 
 
 def test_apply_succeeds_on_good_patch(tmp_path):
@@ -67,3 +70,77 @@ def test_apply_succeeds_on_good_patch(tmp_path):
         assert result == 0, "Should return 0 on good patch"
         apply_md = (tmp_path / "run" / "APPLY.md").read_text()
         assert "Exit: 0" in apply_md
+
+
+def _three_way_repo(tmp_path):
+    """Repo at line b -> b2, plus patches made against the original base.
+
+    clean.diff edits line d (merges cleanly); conflict.diff edits line b.
+    """
+    import subprocess
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    f = repo / "f"
+    f.write_text("a\nb\nc\nd\ne\nf\ng\n")
+    subprocess.run(["git", "add", "f"], cwd=repo, check=True)
+    subprocess.run([*git, "commit", "-qm", "base"], cwd=repo, check=True)
+    for name, old, new in (("clean.diff", "d", "D"), ("conflict.diff", "b", "B")):
+        f.write_text(f.read_text().replace(f"\n{old}\n", f"\n{new}\n"))
+        diff = subprocess.run(["git", "diff"], cwd=repo, capture_output=True, text=True, check=True)
+        (tmp_path / name).write_text(diff.stdout)
+        subprocess.run(["git", "checkout", "-q", "f"], cwd=repo, check=True)
+    # Drift the context: a plain apply of either patch now fails
+    f.write_text("a\nb2\nc\nd\ne\nf\ng\n")
+    subprocess.run([*git, "commit", "-qam", "drift"], cwd=repo, check=True)
+    return repo
+
+
+def _git_status(repo):
+    import subprocess
+
+    return subprocess.run(
+        ["git", "status", "--porcelain"], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_apply_falls_back_to_clean_three_way(tmp_path):
+    """A drifted patch that merges cleanly is applied with --3way."""
+    repo = _three_way_repo(tmp_path)
+    store = ArtifactStore(tmp_path / "run")
+
+    assert Apply().run(store, repo, tmp_path / "clean.diff") == 0
+
+    assert (repo / "f").read_text() == "a\nb2\nc\nD\ne\nf\ng\n"
+    assert "--3way" in (tmp_path / "run" / "APPLY.md").read_text()
+
+
+def test_apply_never_applies_conflicting_three_way(tmp_path):
+    """`git apply --check --3way` passes on conflicts; the repo must stay untouched."""
+    repo = _three_way_repo(tmp_path)
+    store = ArtifactStore(tmp_path / "run")
+
+    assert Apply().run(store, repo, tmp_path / "conflict.diff") != 0
+
+    assert (repo / "f").read_text() == "a\nb2\nc\nd\ne\nf\ng\n"
+    assert _git_status(repo) == ""  # no conflict markers, no unmerged entries
+    assert "Check Failed" in (tmp_path / "run" / "APPLY.md").read_text()
+    assert not list((tmp_path / "run" / "logs").glob("apply_3way.index*"))
+
+
+def test_apply_check_failure_reports_stderr_log(tmp_path):
+    """Real run_cmd results carry stderr in a log file, not an attribute."""
+    import subprocess
+
+    store = ArtifactStore(tmp_path / "run")
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    bad = tmp_path / "bad.diff"
+    bad.write_text("not a patch\n")
+
+    assert Apply().run(store, repo, bad) != 0
+    md = (tmp_path / "run" / "APPLY.md").read_text()
+    assert "Check Failed" in md
@@ -1,114 +1,121 @@
-
 import asyncio
-import time
+from functools import cache
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, AsyncMock, patch
 from anvil.orchestrator import run_debug_session
-from anvil.config import RunConfig, TrackConfig
+from anvil.config import RunConfig, TrackBudget, TrackConfig, TracksFileConfig
+
+
+@cache
+def _parallel_tracks() -> TracksFileConfig:
+    # Two 1-iteration tracks to keep the test fast; frozen, so safe to share
+    budget = TrackBudget(max_iters=1)
+    return TracksFileConfig(tracks=[
+        TrackConfig(name="track_1", role="dev", provider="manual", directions_profile="fake", budgets=budget),
+        TrackConfig(name="track_2", role="dev", provider="manual", directions_profile="fake", budgets=budget),
+    ])
+
 
 @pytest.mark.timeout(5)
-def test_parallel_tracks_execution(tmp_path):
-    """Verify that multiple tracks run concurrently (total time < sum of parts)."""
-    asyncio.run(_async_run_parallel(tmp_path))
-
-async def _async_run_parallel(tmp_path):
-    # Mock TrackIterate using a context code pattern that delays
-    async def mock_run_side_effect(*args, **kwargs):
-        await asyncio.sleep(1.0) # sleep 1s
+@pytest.mark.asyncio
+async def test_parallel_tracks_execution(tmp_path, orchestrator_mocks):
+    """Verify that multiple tracks are in flight at once and run-level verify waits for them."""
+    await _async_run_parallel(tmp_path, orchestrator_mocks)
+
+async def _async_run_parallel(tmp_path, orchestrator_mocks):
+    # Structural concurrency probe (no wall-clock): each track waits until both
+    # are inside run(); run sequentially, the first would time out alone.
+    active = 0
+    peak = 0
+    calls = []  # kwargs of each run(); cheaper than AsyncMock call recording
+    both_in = asyncio.Event()
+
+    async def mock_run(*args, **kwargs):
+        nonlocal active, peak
+        calls.append(kwargs)
+        active += 1
+        peak = max(peak, active)
+        if active == 2:
+            both_in.set()
+        try:
+            await asyncio.wait_for(both_in.wait(), timeout=2)
+        finally:
+            active -= 1
         return None
 
-    # We need to patch TrackIterate.run specifically
-    # And also mock the other dependencies of run_debug_session
+    # Patch TrackIterate plus the other dependencies of run_debug_session
+    # (worktrees, verify, repro, context, judge, tracks file, event log)
+    m = orchestrator_mocks(
+        "TrackIterate", "WorktreeManager", "Verify", "ReproPlan", "ReproAssess",
+        "ContextBuilder", "Judge", "load_tracks_file", "EventLog",
+    )
+    m.TrackIterate.return_value.run = mock_run
+    verify = m.Verify.return_value
+
+    # Run-level verify must not overlap the tracks (their worktrees sit inside
+    # repo_path): record (tracks started, tracks still active) when it runs.
+    verify_seen = []
+    verify.run.side_effect = lambda *a, **k: verify_seen.append((len(calls), active))
+
+    # Configure WorktreeManager mocks
+    from anvil.worktrees import WorktreeValidation
+    m.WorktreeManager.return_value.validate_worktrees_ready.return_value = WorktreeValidation(
+        ok_tracks=["track_1", "track_2"], failed={}
+    )
+
+    # Mock ReproAssess to return a valid result
+    from anvil.steps.repro_assess import ReproMode, ReproAssessment
+    m.ReproAssess.return_value.run.return_value = ReproAssessment(
+        mode=ReproMode.AUTO, strategy="test", commands=["pytest"], confidence=0.8, details=""
+    )
+
+    m.load_tracks_file.return_value = _parallel_tracks()
+
+    # Ensure tracks file exists so _load_tracks calls our mock
+    dummy_yaml = tmp_path / "dummy.yaml"
+    dummy_yaml.touch()
+
+    # Ensure CONTEXT.md exists so orchestrator doesn't crash reading it
+    run_dir = tmp_path / "test_concurrency"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "CONTEXT.md").write_text("mock context")
+
+    # Configure RunConfig (tracks_file is required to trigger loading)
+    cfg = RunConfig(
+        run_id="test_concurrency",
+        repo_path="/tmp/fake",
+        artifacts_root=tmp_path,
+        tracks_file=dummy_yaml, 
+        issue_text="fake",
+        mode="debug"
+    )
     
-    with patch("anvil.orchestrator.TrackIterate") as MockStep:
-        instance = MockStep.return_value
-        instance.run = AsyncMock(side_effect=mock_run_side_effect)
-        instance.check.return_value = 0  # Ensure check passes
+    result = await run_debug_session(cfg)
+    
+    # Debug: Print events if count is 0
+    if not calls:
+        print("Events captured:")
+        for call in m.EventLog.return_value.emit.call_args_list:
+            print(call)
+
+    # Assertions
+    # 1. Did we run both?
+    assert len(calls) == 2
+    verify.run.assert_called_once()
+    
+    # 2. Was it parallel? Both tracks were inside run() at once; verify ran after both
+    assert peak == 2, f"max concurrent tracks was {peak}, expected 2"
+    assert verify_seen == [(2, 0)]
+
+    # 3. Verify worktree isolation: ensure run called with correct repo path
+    for kwargs in calls:
+        track_name = kwargs["track"]
+        repo_arg = kwargs["repo"]
         
-        # Also patch: create_worktrees, write_worktree_contracts, verify_baseline, ReproPlan, ContextBuilder, and load_tracks_file
-        with patch("anvil.orchestrator.WorktreeManager") as MockWT, \
-             patch("anvil.orchestrator.Verify") as MockVerify, \
-             patch("anvil.orchestrator.ReproPlan") as MockReproPlan, \
-             patch("anvil.orchestrator.ReproAssess") as MockReproAssess, \
-             patch("anvil.orchestrator.ContextBuilder") as MockCTX, \
-             patch("anvil.orchestrator.Judge") as MockJudge, \
-             patch("anvil.orchestrator.load_tracks_file") as MockLoadTracks, \
-             patch("anvil.orchestrator.EventLog") as MockEventLog:
-             
-            # Configure mocks to pass checks
-            MockCTX.return_value.check.return_value = 0
-            MockReproPlan.return_value.check.return_value = 0
-            
-            # Configure WorktreeManager mocks
-            from anvil.worktrees import WorktreeValidation
-            MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(
-                ok_tracks=["track_1", "track_2"], failed={}
-            )
-            MockWT.return_value._is_git_repo.return_value = True
-
-            # Mock ReproAssess to return a valid result
-            from anvil.steps.repro_assess import ReproMode, ReproAssessment
-            MockReproAssess.return_value.run.return_value = ReproAssessment(
-                mode=ReproMode.AUTO, strategy="test", commands=["pytest"], confidence=0.8, details=""
-            )
-            
-            # Setup mocked tracks with 1 iteration to keep test fast
-            from anvil.config import TracksFileConfig, TrackBudget
-            budget = TrackBudget(max_iters=1)
-            mock_tracks = [
-                TrackConfig(name="track_1", role="dev", provider="manual", directions_profile="fake", budgets=budget),
-                TrackConfig(name="track_2", role="dev", provider="manual", directions_profile="fake", budgets=budget)
-            ]
-            MockLoadTracks.return_value = TracksFileConfig(tracks=mock_tracks)
-
-            # Ensure tracks file exists so _load_tracks calls our mock
-            dummy_yaml = tmp_path / "dummy.yaml"
-            dummy_yaml.touch()
-
-            # Ensure CONTEXT.md exists so orchestrator doesn't crash reading it
-            run_dir = tmp_path / "test_concurrency"
-            run_dir.mkdir(parents=True, exist_ok=True)
-            (run_dir / "CONTEXT.md").write_text("mock context")
-
-            # Configure RunConfig (tracks_file is required to trigger loading)
-            cfg = RunConfig(
-                run_id="test_concurrency",
-                repo_path="/tmp/fake",
-                artifacts_root=tmp_path,
-                tracks_file=dummy_yaml, 
-                issue_text="fake",
-                mode="debug"
-            )
-            
-            start = time.time()
-            result = await run_debug_session(cfg)
-            duration = time.time() - start
-            
-            # Debug: Print events if count is 0
-            if instance.run.call_count == 0:
-                print("Events captured:")
-                for call in MockEventLog.return_value.emit.call_args_list:
-                    print(call)
-
-            # Assertions
-            # 1. Did we run both?
-            assert instance.run.call_count == 2
-            
-            # 2. Was it parallel? (1s sleep * 2 tracks = 2s sequential. Parallel should be ~1s)
-            print(f"Duration: {duration:.2f}s")
-            assert duration < 1.9, f"Execution took {duration:.2f}s, expected < 1.9s for 2 parallel 1s tasks"
-
-            # 3. Verify worktree isolation: ensure run called with correct repo path
-            for call in instance.run.call_args_list:
-                _, kwargs = call
-                track_name = kwargs["track"]
-                repo_arg = kwargs["repo"]
-                
-                # Verify usage of get_worktree_path result
-                expected_path = MockWT.return_value.get_worktree_path(track_name)
-                # Note: since get_worktree_path returns a fresh MagicMock if not configured to return same,
-                # validation is tricky unless we assume standard MagicMock behavior (returns same mock for same args if side_effect is None).
-                # But MagicMock behavior varies. Safer to configure get_worktree_path side_effect to return predictable Paths
-                # However, for now, let's just assert repo_arg IS expected_path (object identity or equality if mock)
-                assert repo_arg == expected_path, f"Track {track_name} used wrong repo path"
+        # Verify usage of get_worktree_path result
+        expected_path = m.WorktreeManager.return_value.get_worktree_path(track_name)
+        # Note: since get_worktree_path returns a fresh MagicMock if not configured to return same,
+        # validation is tricky unless we assume standard MagicMock behavior (returns same mock for same args if side_effect is None).
+        # But MagicMock behavior varies. Safer to configure get_worktree_path side_effect to return predictable Paths
+        # However, for now, let's just assert repo_arg IS expected_path (object identity or equality if mock)
+        assert repo_arg == expected_path, f"Track {track_name} used wrong repo path"
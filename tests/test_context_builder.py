@@ -0,0 +1,154 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+from anvil.artifacts.store import ArtifactStore
+from anvil.steps.context_builder import ContextBuilder
+
+
+def _fake_rg(bin_dir: Path, lines: list[str]) -> None:
+    """Install an `rg` stand-in that prints the given lines and records argv."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    script = bin_dir / "rg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "from pathlib import Path\n"
+        "Path(sys.argv[0]).with_name('argv.json').write_text(json.dumps(sys.argv[1:]))\n"
+        f"for line in {lines!r}:\n"
+        "    print(line, flush=True)\n"
+    )
+    script.chmod(0o755)
+
+
+def test_context_builder_collects_rg_files(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def login(): pass\n")
+    (repo / "b.py").write_text("login = 1\n")
+    (repo / "blob.bin").write_bytes(b"login\0\0")
+    (repo / "c.py").write_text("login()\n")
+
+    bin_dir = tmp_path / "bin"
+    events = []
+    for path in ["./a.py", "./blob.bin", "./a.py", "./b.py", "./c.py"]:
+        events += [
+            json.dumps({"type": "begin", "data": {"path": {"text": path}}}, separators=(",", ":")),
+            json.dumps({"type": "match", "data": {"path": {"text": path}, "lines": {"text": "login"}}}),
+            json.dumps({"type": "end", "data": {"path": {"text": path}}}),
+        ]
+    _fake_rg(bin_dir, events)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+
+    store = ArtifactStore(tmp_path / "run")
+    ContextBuilder().run(store, repo, "Login fails", use_treesitter=False, max_files=2)
+
+    files = [f["path"] for f in store.read_json("FILES.json")["files"]]
+    assert files == ["./a.py", "./b.py"]
+    assert "`./a.py`" in (tmp_path / "run" / "CONTEXT.md").read_text()
+
+    argv = json.loads((bin_dir / "argv.json").read_text())
+    assert "--json" in argv
+    assert argv[argv.index("-f") + 1].endswith("rg_patterns.txt")
+    assert "-F" in argv
+    patterns = (tmp_path / "run" / "logs" / "rg_patterns.txt").read_text().split()
+    assert patterns == ["fails", "login"]
+
+
+def test_rg_pattern_file_found_when_repo_is_not_cwd(tmp_path, monkeypatch):
+    # Relative run dir (the CLI default), repo elsewhere: rg runs with cwd=repo
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("login()\n")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "rg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "patterns = open(sys.argv[sys.argv.index('-f') + 1]).read().split()\n"
+        "if 'login' in patterns:\n"
+        "    event = {'type': 'begin', 'data': {'path': {'text': './a.py'}}}\n"
+        "    print(json.dumps(event, separators=(',', ':')))\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.chdir(tmp_path)
+
+    store = ArtifactStore(Path(".dbg") / "runs" / "r1")
+    ContextBuilder().run(store, repo, "login fails", use_treesitter=False, max_files=5)
+
+    assert [f["path"] for f in store.read_json("FILES.json")["files"]] == ["./a.py"]
+
+
+def test_rg_stream_closed_when_max_files_reached(tmp_path, monkeypatch):
+    from anvil.steps import context_builder as cb
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("login()\n")
+    streams = []  # holds a reference, so GC cannot be what closes the stream
+
+    def fake_lines(argv, **kwargs):
+        def gen():
+            while True:
+                yield '{"type":"begin","data":{"path":{"text":"./a.py"}}}'
+
+        streams.append(gen())
+        return streams[-1]
+
+    monkeypatch.setattr(cb, "which", lambda name: "rg")
+    monkeypatch.setattr(cb, "iter_cmd_lines", fake_lines)
+
+    ContextBuilder().run(ArtifactStore(tmp_path / "run"), repo, "login", False, max_files=1)
+
+    assert streams[0].gi_frame is None  # closed as soon as selection stopped
+
+
+def test_rg_json_paths_only_reads_begin_events():
+    from anvil.steps.context_builder import _rg_json_paths
+
+    lines = [
+        '{"type":"begin","data":{"path":{"text":"C:\\\\src\\\\a.py"}}}',
+        '{"type":"match","data":{"path":{"text":"ignored.py"}}}',
+        '{"type":"begin","data":{"path":{"bytes":"//4="}}}',
+        '{"type":"begin","data":',
+        '{"type":"summary","data":{}}',
+    ]
+    assert list(_rg_json_paths(lines)) == ["C:\\src\\a.py"]
+
+
+def test_context_builder_scans_tracked_files_without_rg(tmp_path, monkeypatch):
+    import subprocess
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("readme\n")
+    (repo / "auth.py").write_text("def login(): pass\n")
+    (repo / "other.py").write_text("x = 1\n")
+    (repo / "untracked.py").write_text("login\n")
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    subprocess.run(["git", "add", "README.md", "auth.py", "other.py"], cwd=repo, check=True)
+
+    monkeypatch.setattr("anvil.steps.context_builder.which", lambda cmd: None)
+    store = ArtifactStore(tmp_path / "run")
+    ContextBuilder().run(store, repo, "login fails", use_treesitter=False, max_files=5)
+    assert store.read_json("FILES.json")["files"] == [{"path": "auth.py", "rationale": "keyword hit"}]
+
+    # Nothing matches -> the old common-files fallback still applies
+    ContextBuilder().run(store, repo, "zzz", use_treesitter=False, max_files=5)
+    assert store.read_json("FILES.json")["files"] == [{"path": "README.md", "rationale": "fallback"}]
+
+
+def test_keywords_dedupe_before_truncation(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    _fake_rg(bin_dir, [])
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+
+    store = ArtifactStore(tmp_path / "run")
+    issue = "Error error ERROR " * 10 + "login timeout"
+    ContextBuilder().run(store, tmp_path, issue, use_treesitter=False, max_files=1)
+
+    patterns = (tmp_path / "run" / "logs" / "rg_patterns.txt").read_text().split()
+    assert patterns == ["error", "login", "timeout"]
@@ -0,0 +1,48 @@
+import json
+
+from anvil.util.events import EventLog
+
+
+def test_emit_unbuffered_writes_immediately(tmp_path):
+    log = EventLog(tmp_path / "events.jsonl")
+    log.emit(stage="setup", action="run")
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert json.loads(lines[0])["stage"] == "setup"
+
+
+def test_emit_buffered_waits_for_flush(tmp_path):
+    path = tmp_path / "logs" / "events.jsonl"
+    log = EventLog(path, run_id="r1", buffered=True)
+    log.emit(stage="setup", action="a")
+    log.emit_batch([{"stage": "iterate", "action": "b"}, {"stage": "judge", "action": "c"}])
+    assert not path.exists()
+
+    log.flush()
+    events = [json.loads(ln) for ln in path.read_text().splitlines()]
+    assert [e["action"] for e in events] == ["a", "b", "c"]
+    assert all(e["run_id"] == "r1" and "ts_ms" in e for e in events)
+
+
+def test_context_manager_flushes(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventLog(path, buffered=True) as log:
+        log.emit(stage="crash", action="exception")
+    assert path.exists()
+
+
+def test_buffered_flushes_on_size_and_age(tmp_path, monkeypatch):
+    path = tmp_path / "events.jsonl"
+    log = EventLog(path, buffered=True, flush_bytes=200, flush_every_s=60)
+    log.emit(stage="iterate", action="small")
+    assert not path.exists()
+    log.emit(stage="iterate", action="big", payload="x" * 300)
+    assert len(path.read_text().splitlines()) == 2
+
+    clock = [1000.0]
+    monkeypatch.setattr("anvil.util.events.time.monotonic", lambda: clock[0])
+    log = EventLog(tmp_path / "aged.jsonl", buffered=True, flush_every_s=1.0)
+    log.emit(stage="iterate", action="first")
+    assert not (tmp_path / "aged.jsonl").exists()
+    clock[0] += 1.5
+    log.emit(stage="iterate", action="second")
+    assert len((tmp_path / "aged.jsonl").read_text().splitlines()) == 2
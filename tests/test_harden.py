@@ -1,28 +1,29 @@
 """Tests for harden mode functionality."""
-import asyncio
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock, AsyncMock
 
 from anvil.config import RunConfig, TrackConfig, TrackBudget
 from anvil.orchestrator import run_harden_session
 from anvil.artifacts.store import ArtifactStore
 
 
-@pytest.fixture
-def tmp_repo(tmp_path):
-    """Create a minimal git repo for testing."""
-    import subprocess
-    repo = tmp_path / "repo"
-    repo.mkdir()
+@pytest.fixture(scope="module")
+def tmp_repo(tmp_path_factory):
+    """Create a minimal repo dir once per module (tests only read it).
+
+    No `git init`: WorktreeManager is patched in every session test, so nothing
+    touches the repo's git state.
+    """
+    repo = tmp_path_factory.mktemp("repo")
     (repo / "main.py").write_text('def hello():\n    return "world"\n')
-    subprocess.run(["git", "init"], cwd=repo, capture_output=True, check=True)
-    subprocess.run(["git", "add", "."], cwd=repo, capture_output=True, check=True)
-    subprocess.run(["git", "commit", "-m", "init"], cwd=repo, capture_output=True, check=True)
     return repo
 
 
-def test_harden_session_writes_run_meta(tmp_repo, tmp_path):
+_HARDEN_PATCHES = ("WorktreeManager", "TrackIterate", "Verify")
+
+
+@pytest.mark.asyncio
+async def test_harden_session_writes_run_meta(tmp_repo, tmp_path, orchestrator_mocks):
     """Harden session should write RUN.json with mode=harden."""
     artifacts_dir = tmp_path / "artifacts"
     
@@ -35,24 +36,8 @@ def test_harden_session_writes_run_meta(tmp_repo, tmp_path):
         mode="harden",
     )
     
-    with patch("anvil.orchestrator.WorktreeManager") as MockWT, \
-         patch("anvil.orchestrator.TrackIterate") as MockTI, \
-         patch("anvil.orchestrator.Verify") as MockVerify:
-        
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.write_worktree_contracts = MagicMock()
-        from anvil.worktrees import WorktreeValidation
-        MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=[], failed={})
-        MockWT.return_value._is_git_repo.return_value = True
-        
-        mock_iter = MockTI.return_value
-        mock_iter.run = AsyncMock()
-        mock_iter.check = MagicMock(return_value=0)
-        
-        MockVerify.return_value.run = MagicMock()
-        
-        result = asyncio.run(run_harden_session(cfg))
+    orchestrator_mocks(*_HARDEN_PATCHES)
+    result = await run_harden_session(cfg)
     
     assert result.status in ("DONE", "FAIL")
     
@@ -66,7 +51,8 @@ def test_harden_session_writes_run_meta(tmp_repo, tmp_path):
     assert data["run_id"] == "test-harden-001"
 
 
-def test_harden_session_creates_harden_md(tmp_repo, tmp_path):
+@pytest.mark.asyncio
+async def test_harden_session_creates_harden_md(tmp_repo, tmp_path, orchestrator_mocks):
     """Harden session should create HARDEN.md report."""
     artifacts_dir = tmp_path / "artifacts"
     
@@ -79,24 +65,8 @@ def test_harden_session_creates_harden_md(tmp_repo, tmp_path):
         mode="harden",
     )
     
-    with patch("anvil.orchestrator.WorktreeManager") as MockWT, \
-         patch("anvil.orchestrator.TrackIterate") as MockTI, \
-         patch("anvil.orchestrator.Verify") as MockVerify:
-        
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.write_worktree_contracts = MagicMock()
-        from anvil.worktrees import WorktreeValidation
-        MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=[], failed={})
-        MockWT.return_value._is_git_repo.return_value = True
-        
-        mock_iter = MockTI.return_value
-        mock_iter.run = AsyncMock()
-        mock_iter.check = MagicMock(return_value=0)
-        
-        MockVerify.return_value.run = MagicMock()
-        
-        result = asyncio.run(run_harden_session(cfg))
+    orchestrator_mocks(*_HARDEN_PATCHES)
+    result = await run_harden_session(cfg)
     
     # Check HARDEN.md was written
     harden_md = result.run_dir / "HARDEN.md"
@@ -107,7 +77,8 @@ def test_harden_session_creates_harden_md(tmp_repo, tmp_path):
     assert "Findings by Track" in content
 
 
-def test_harden_session_runs_baseline_verify(tmp_repo, tmp_path):
+@pytest.mark.asyncio
+async def test_harden_session_runs_baseline_verify(tmp_repo, tmp_path, orchestrator_mocks):
     """Harden session should run baseline verification."""
     artifacts_dir = tmp_path / "artifacts"
     
@@ -120,28 +91,11 @@ def test_harden_session_runs_baseline_verify(tmp_repo, tmp_path):
         mode="harden",
     )
     
-    with patch("anvil.orchestrator.WorktreeManager") as MockWT, \
-         patch("anvil.orchestrator.TrackIterate") as MockTI, \
-         patch("anvil.orchestrator.Verify") as MockVerify:
-        
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.create_worktrees = MagicMock()
-        MockWT.return_value.write_worktree_contracts = MagicMock()
-        from anvil.worktrees import WorktreeValidation
-        MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=[], failed={})
-        MockWT.return_value._is_git_repo.return_value = True
-        
-        mock_iter = MockTI.return_value
-        mock_iter.run = AsyncMock()
-        mock_iter.check = MagicMock(return_value=0)
-        
-        mock_verify = MockVerify.return_value
-        mock_verify.run = MagicMock()
-        
-        asyncio.run(run_harden_session(cfg))
-        
-        # Verify was called (baseline verification)
-        mock_verify.run.assert_called()
+    m = orchestrator_mocks(*_HARDEN_PATCHES)
+    await run_harden_session(cfg)
+    
+    # Verify was called (baseline verification)
+    m.Verify.return_value.run.assert_called()
 
 
 def test_harden_public_api_exists():
@@ -164,4 +118,3 @@ def test_harden_api_signature():
     assert "focus" in params
     assert "run_id" in params
     assert "tracks_file" in params
-
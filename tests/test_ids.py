@@ -47,3 +47,28 @@ def test_validate_track_name_invalid():
     # Empty
     with pytest.raises(ValueError):
         validate_track_name("")
+
+def test_validators_reject_trailing_newline():
+    with pytest.raises(ValueError):
+        validate_run_id("abc\n")
+    with pytest.raises(ValueError):
+        validate_track_name("track\n")
+
+
+def test_validator_regexes_are_module_level():
+    import anvil.util.ids as ids
+
+    run_re, track_re = ids._RUN_ID_RE, ids._TRACK_NAME_RE
+    validate_run_id("abc")
+    validate_track_name("a")
+    assert ids._RUN_ID_RE is run_re and ids._TRACK_NAME_RE is track_re
+
+
+def test_validate_track_name_bulk_is_cheap():
+    # Pins per-call cost: a compile-per-call regression would blow well past this
+    import time
+
+    names = [f"n{i}" for i in range(10_000)]
+    start = time.perf_counter()
+    assert [validate_track_name(n) for n in names] == names
+    assert time.perf_counter() - start < 0.5
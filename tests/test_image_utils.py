@@ -0,0 +1,96 @@
+import math
+import random
+
+from PIL import Image
+from typer.testing import CliRunner
+
+from anvil.util.image_utils import app
+
+runner = CliRunner()
+
+
+def _reference_keep(r, g, b, thresh, bg=(255, 0, 255)):
+    """Original per-pixel rule: keep unless close to bg with a low green ratio."""
+    dist = math.sqrt((r - bg[0]) ** 2 + (g - bg[1]) ** 2 + (b - bg[2]) ** 2)
+    if dist > thresh:
+        return True
+    if r + b > 100 and g / (r + b) > 0.35:
+        return True
+    return False
+
+
+def _sample_image(path, size=(24, 16), seed=7):
+    rnd = random.Random(seed)
+    img = Image.new("RGBA", size)
+    px = []
+    for i in range(size[0] * size[1]):
+        if i % 3 == 0:  # plenty of near-magenta pixels, incl. borderline ratios
+            px.append((rnd.randint(150, 255), rnd.randint(0, 120), rnd.randint(150, 255), 255))
+        else:
+            px.append((rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(0, 255), 255))
+    img.putdata(px)
+    img.save(path)
+    return px
+
+
+def test_remove_magenta_matches_reference_rule(tmp_path):
+    src, out = tmp_path / "in.png", tmp_path / "out.png"
+    px = _sample_image(src)
+
+    res = runner.invoke(
+        app,
+        [
+            "remove-magenta", "--in", str(src), "--out", str(out),
+            "--threshold", "120", "--choke-px", "0",
+        ],
+    )
+    assert res.exit_code == 0, res.output
+
+    alpha = list(Image.open(out).getchannel("A").getdata())
+    expected = [255 if _reference_keep(r, g, b, 120) else 0 for r, g, b, _ in px]
+    assert alpha == expected
+    assert 0 < alpha.count(0) < len(alpha)
+
+
+def test_remove_magenta_choke_matches_l_mask_erosion(tmp_path):
+    from PIL import ImageFilter
+
+    src, out = tmp_path / "in.png", tmp_path / "out.png"
+    px = _sample_image(src, size=(40, 30), seed=3)
+
+    res = runner.invoke(app, ["remove-magenta", "--in", str(src), "--out", str(out), "--threshold", "150", "--choke-px", "1"])
+    assert res.exit_code == 0, res.output
+
+    ref = Image.new("L", (40, 30))
+    ref.putdata([255 if _reference_keep(r, g, b, 150) else 0 for r, g, b, _ in px])
+    assert Image.open(out).getchannel("A").tobytes() == ref.filter(ImageFilter.MinFilter(3)).tobytes()
+
+
+def test_analyze_reports_spill_and_integrity(tmp_path):
+    orig_p, cut_p = tmp_path / "orig.png", tmp_path / "cut.png"
+    orig = Image.new("RGBA", (10, 10), (10, 200, 30, 255))
+    cut = orig.copy()
+    cut.putpixel((0, 0), (255, 0, 250, 255))  # magenta spill, opaque
+    cut.putpixel((1, 0), (13, 204, 30, 255))  # opaque, distance 5 from original
+    cut.putpixel((2, 0), (255, 0, 255, 0))    # transparent magenta: not spill
+    orig.save(orig_p)
+    cut.save(cut_p)
+
+    res = runner.invoke(app, ["analyze", "--original", str(orig_p), "--cutout", str(cut_p)])
+    assert res.exit_code == 1  # 1% spill > 0.1% tolerance
+    assert "Spill (alpha>=16, magenta-dist<50): 1 (1.0000%)" in res.output
+    d0 = math.sqrt(245 ** 2 + 200 ** 2 + 220 ** 2)
+    assert f"mean_diff={(d0 + 5) / 99:.4f}, max_diff={d0:.4f}" in res.output
+
+
+def test_resize_fits_bounds_with_each_filter(tmp_path):
+    src = tmp_path / "big.png"
+    Image.new("RGB", (1200, 600), (10, 20, 30)).save(src)
+    for filt in ("lanczos", "bicubic", "box"):
+        out = tmp_path / f"{filt}.png"
+        res = runner.invoke(app, ["resize", "--in", str(src), "--out", str(out), "--max-width", "100", "--max-height", "100", "--resample", filt])
+        assert res.exit_code == 0, res.output
+        assert Image.open(out).size == (100, 50)
+
+    res = runner.invoke(app, ["resize", "--in", str(src), "--out", str(tmp_path / "x.png"), "--resample", "nearest-ish"])
+    assert res.exit_code == 1
@@ -5,19 +5,15 @@ from anvil.artifacts.store import ArtifactStore
 from anvil.steps.judge import Judge
 from anvil.config import TrackConfig
 
-def test_judge_role_aware_scoring(tmp_path):
+def test_judge_role_aware_scoring(tmp_path, seed_track):
     """Judge should penalize fixer tracks heavily for missing patches, but breakers less so."""
     store = ArtifactStore(tmp_path)
     
     # Track Fixer: No patch
-    t_f = tmp_path / "tracks" / "fixer_track"
-    (t_f / "iter_01").mkdir(parents=True)
-    # No patch
+    seed_track(tmp_path, "fixer_track")
     
     # Track Breaker: No patch
-    t_b = tmp_path / "tracks" / "breaker_track"
-    (t_b / "iter_01").mkdir(parents=True)
-    # No patch
+    seed_track(tmp_path, "breaker_track")
     
     judge = Judge()
     
@@ -4,22 +4,15 @@ from pathlib import Path
 from anvil.artifacts.store import ArtifactStore
 from anvil.steps.judge import Judge
 
-def test_judge_prefers_verified(tmp_path):
+def test_judge_prefers_verified(tmp_path, seed_track):
     """Judge should prefer a track with PASS verification over one without."""
     store = ArtifactStore(tmp_path)
     
     # Track A: High confidence, Patch, No Verify (20 points patch)
-    t_a = tmp_path / "tracks" / "track_a"
-    (t_a / "iter_01").mkdir(parents=True)
-    (t_a / "iter_01" / "ITERATION.json").write_text('{"confidence": 0.9}')
-    (t_a / "iter_01" / "PATCH.diff").write_text("patch")
+    seed_track(tmp_path, "track_a", 0.9, patch=True)
     
     # Track B: Lower confidence, Patch, Verify PASS (+20 patch + 10 exists + 40 pass)
-    t_b = tmp_path / "tracks" / "track_b"
-    (t_b / "iter_01").mkdir(parents=True)
-    (t_b / "iter_01" / "ITERATION.json").write_text('{"confidence": 0.5}')
-    (t_b / "iter_01" / "PATCH.diff").write_text("patch")
-    (t_b / "iter_01" / "VERIFY.md").write_text("Integration tests: PASS")
+    seed_track(tmp_path, "track_b", 0.5, patch=True, verify="Integration tests: PASS")
     
     judge = Judge()
     judge.run(store, candidate_tracks=["track_a", "track_b"], disqualified=[])
@@ -34,22 +27,15 @@ def test_judge_prefers_verified(tmp_path):
     assert winner == "track_b"
     assert scores["track_b"] > scores["track_a"]
 
-def test_judge_penalizes_failed_verification(tmp_path):
+def test_judge_penalizes_failed_verification(tmp_path, seed_track):
     """Judge should penalize a track with FAIL verification."""
     store = ArtifactStore(tmp_path)
     
     # Track A: Patch only
-    t_a = tmp_path / "tracks" / "track_a"
-    (t_a / "iter_01").mkdir(parents=True)
-    (t_a / "iter_01" / "ITERATION.json").write_text('{"confidence": 0.5}')
-    (t_a / "iter_01" / "PATCH.diff").write_text("patch")
+    seed_track(tmp_path, "track_a", 0.5, patch=True)
     
     # Track B: Patch + Verify FAIL
-    t_b = tmp_path / "tracks" / "track_b"
-    (t_b / "iter_01").mkdir(parents=True)
-    (t_b / "iter_01" / "ITERATION.json").write_text('{"confidence": 0.5}')
-    (t_b / "iter_01" / "PATCH.diff").write_text("patch")
-    (t_b / "iter_01" / "VERIFY.md").write_text("Integration tests: FAIL")
+    seed_track(tmp_path, "track_b", 0.5, patch=True, verify="Integration tests: FAIL")
     
     judge = Judge()
     judge.run(store, candidate_tracks=["track_a", "track_b"], disqualified=[])
@@ -61,3 +47,20 @@ def test_judge_penalizes_failed_verification(tmp_path):
     # A ~= 70
     # B ~= 70 + 10 - 40 = 40
     assert winner == "track_a"
+
+
+def test_judge_uses_latest_iteration_confidence(tmp_path):
+    """The single-walk index must keep glob's sorted order (latest iter last)."""
+    store = ArtifactStore(tmp_path)
+    t = tmp_path / "tracks" / "track_a"
+    for i, conf in [(2, 0.8), (1, 0.1), (10, 0.4)]:
+        (t / f"iter_{i:02d}").mkdir(parents=True)
+        (t / f"iter_{i:02d}" / "ITERATION.json").write_text(f'{{"confidence": {conf}}}')
+    (t / "iter_01" / "PATCH.diff").write_text("patch")
+    (t / "notes").mkdir()
+
+    Judge().run(store, candidate_tracks=["track_a", "missing"], disqualified=[])
+
+    scores = store.read_json("SCORECARD.json")["scores"]
+    assert scores["track_a"] == pytest.approx(0.4 * 50 + 20)
+    assert scores["missing"] == -50.0
@@ -1,191 +1,174 @@
-
 import asyncio
-import unittest
-from pathlib import Path
-from unittest.mock import MagicMock, patch, AsyncMock
+import os
 import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
 
 from anvil.orchestrator import run_debug_session, RunConfig
 from anvil.artifacts.store import ArtifactStore
-from anvil.providers.base import Provider, ProviderResult
+from anvil.worktrees import WorktreeValidation
 
 
+# ITERATION.json as TrackIterate would write it; only track/iteration/signal vary
+_ITER_TEMPLATE = (
+    '{"schema_version":1,"track":"%s","iteration":%d,"status_signal":"%s",'
+    '"hypothesis":"test","confidence":0.5,"experiments":[],"proposed_changes":{},"risks":[]}'
+)
 
-import tempfile
 
-class TestLoopLogic(unittest.TestCase):
-    def setUp(self):
-        self.tmp_dir_obj = tempfile.TemporaryDirectory()
-        self.tmp_dir = Path(self.tmp_dir_obj.name)
-        self.repo = self.tmp_dir / "repo"
-        self.repo.mkdir()
-    
-    def tearDown(self):
-        self.tmp_dir_obj.cleanup()
-        
-    def test_loop_runs_max_iters(self):
-        # Setup tracks file
-        tracks_file = self.tmp_dir / "tracks.yaml"
-        tracks_file.write_text("""
-tracks:
-  - name: loop_test
-    role: debugger
-    provider: manual
-    budgets:
-      max_iters: 2
-""")
-        
-        args = RunConfig(
-            repo_path=self.repo,
-            run_id="test_run",
-            issue_text="fix",
-            artifacts_root=self.tmp_dir / ".dbg",
-            tracks_file=tracks_file,
-            mode="debug",
-        )
-        
-        # We need to inject MockLoopProvider.
-        # orchestrator._provider_for_track calls generic loader.
-        # We can patch it.
-        
-        with (
-            patch("anvil.orchestrator.ContextBuilder") as MockCB,
-            patch("anvil.orchestrator.ReproPlan") as MockRP,
-            patch("anvil.orchestrator.WorktreeManager") as MockWT,
-            patch("anvil.orchestrator._provider_for_track") as MockProviderLoader,
-            # We assume TrackIterate works, but we can verify it creates files. 
-            # Actually better to let TrackIterate run to assert side effects on fs?
-            # But TrackIterate needs real redactor etc.
-            # Let's mock TrackIterate.run to just create the ITERATION.json file so the loop logic (check signal) finds it!
-            patch("anvil.orchestrator.TrackIterate") as MockTI_Cls, 
-        ):
-            # Create dummy artifacts
-            run_dir = self.tmp_dir / ".dbg" / args.run_id
-            run_dir.mkdir(parents=True, exist_ok=True)
-            (run_dir / "CONTEXT.md").write_text("Dummy Context")
-            (run_dir / "REPRO.md").write_text("Dummy Repro")
-
-            # Configure mocks
-            MockCB.return_value.check.return_value = 0
-            MockRP.return_value.check.return_value = 0
-            
-            mock_ti = MockTI_Cls.return_value 
-            # We need .check() to return 0
-            mock_ti.check.return_value = 0
-            
-            # Configure MockWT validation
-            from anvil.worktrees import WorktreeValidation
-            MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=["loop_test"], failed={})
-            
-            # We need .run() to write a fake ITERATION.json so the loop logic can read "status_signal"
-            # The loop logic looks at: store.path("tracks", t.name, f"iter_{iteration:02d}", "ITERATION.json")
-            async def side_effect_run(*args, **kwargs):
-                it = kwargs["iteration"]
-                store = kwargs["store"]
-                track = kwargs["track"]
-                # Write file
-                p = store.path("tracks", track, f"iter_{it:02d}", "ITERATION.json")
-                p.parent.mkdir(parents=True, exist_ok=True)
-                full_json = {
-                    "schema_version": 1,
-                    "track": track,
-                    "iteration": it,
-                    "status_signal": "CONTINUE",
-                    "hypothesis": "test",
-                    "confidence": 0.5,
-                    "experiments": [],
-                    "proposed_changes": {},
-                    "risks": []
-                }
-                import json
-                p.write_text(json.dumps(full_json))
-                
-            mock_ti.run.side_effect = side_effect_run
-            
-            # Execute
-            result = asyncio.run(run_debug_session(args))
-            
-            # Check for crash
-            crash = (self.tmp_dir / ".dbg" / args.run_id / "CRASH.txt")
-            if crash.exists():
-                print(f"CRASH LOG:\n{crash.read_text()}")
-            
-            status_f = (self.tmp_dir / ".dbg" / args.run_id / "RUN_STATUS.json")
-            if status_f.exists():
-                print(f"RUN_STATUS:\n{status_f.read_text()}")
-
-            # Verify MockTI.run called twice
-            self.assertEqual(mock_ti.run.call_count, 2)
-            
-            # Verify args
-            calls = mock_ti.run.call_args_list
-            self.assertEqual(calls[0].kwargs["iteration"], 1)
-            self.assertEqual(calls[1].kwargs["iteration"], 2)
-
-    def test_loop_stops_on_done(self):
-        # Setup tracks file with max_iters 5
-        tracks_file = self.tmp_dir / "tracks_done.yaml"
-        tracks_file.write_text("""
+_TRACKS_YAML = """
 tracks:
-  - name: done_test
+  - name: {name}
     role: debugger
     provider: manual
     budgets:
-      max_iters: 5
-""")
-        args = RunConfig(
-            repo_path=self.repo,
-            run_id="test_run_done",
-            issue_text="fix",
-            artifacts_root=self.tmp_dir / ".dbg",
-            tracks_file=tracks_file,
-            mode="debug",
+      max_iters: {max_iters}
+"""
+
+
+@pytest.fixture(scope="session")
+def tracks_file_max2(tmp_path_factory):
+    p = tmp_path_factory.mktemp("cfg") / "tracks.yaml"
+    p.write_text(_TRACKS_YAML.format(name="loop_test", max_iters=2))
+    return p
+
+
+@pytest.fixture(scope="session")
+def tracks_file_done(tmp_path_factory):
+    p = tmp_path_factory.mktemp("cfg") / "tracks_done.yaml"
+    p.write_text(_TRACKS_YAML.format(name="done_test", max_iters=5))
+    return p
+
+
+@pytest.fixture(scope="module")
+def base_tmp(tmp_path_factory):
+    """One base dir (repo + artifacts root) shared by the module; run ids keep tests apart.
+
+    The many small run trees go to tmpfs when the host has one. Only this
+    module's dir moves there: TMPDIR (and so child processes) is untouched.
+    """
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        base = Path(tempfile.mkdtemp(prefix="anvil-loop-", dir="/dev/shm"))
+    else:
+        base = tmp_path_factory.mktemp("anvil", numbered=False)
+    (base / "repo").mkdir()
+    yield base
+    if base.parent == Path("/dev/shm"):
+        shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def _run_skeleton(tmp_path_factory):
+    """CONTEXT/REPRO stubs the orchestrator reads, written once and copied per run."""
+    skel = tmp_path_factory.mktemp("skel")
+    (skel / "CONTEXT.md").write_text("Dummy Context")
+    (skel / "REPRO.md").write_text("Dummy Repro")
+    return skel
+
+
+async def _instant_sleep(delay, result=None):
+    return result
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """Iteration order is what these tests check; any backoff sleep is dead time."""
+    monkeypatch.setattr(asyncio, "sleep", _instant_sleep)
+
+
+def _make_run_dir(base: Path, run_id: str, skeleton: Path) -> Path:
+    """Create `.dbg/<run_id>/` as a fresh copy of the run skeleton."""
+    run_dir = base / ".dbg" / run_id
+    if run_dir.exists():
+        shutil.rmtree(run_dir)
+    shutil.copytree(skeleton, run_dir)
+    return run_dir
+
+
+def _run_diagnostics(run_dir: Path) -> str:
+    """CRASH.txt / RUN_STATUS.json contents for an assertion message (built only on failure)."""
+    parts = []
+    for name in ("CRASH.txt", "RUN_STATUS.json"):
+        f = run_dir / name
+        if f.exists():
+            parts.append(f"{name}:\n{f.read_text()}")
+    return "\n".join(parts)
+
+
+def _write_iteration(store: ArtifactStore, track: str, iteration: int, signal: str) -> None:
+    """Write the ITERATION.json the loop reads its status_signal from."""
+    p = store.path("tracks", track, f"iter_{iteration:02d}", "ITERATION.json")
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes((_ITER_TEMPLATE % (track, iteration, signal)).encode())
+
+
+# TrackIterate.run is replaced per test to write the ITERATION.json the loop
+# reads its status_signal from; provider loading is stubbed out entirely.
+_LOOP_PATCHES = ("ContextBuilder", "ReproPlan", "WorktreeManager", "_provider_for_track", "TrackIterate")
+
+
+@pytest.mark.asyncio
+async def test_loop_runs_max_iters(base_tmp, _run_skeleton, tracks_file_max2, orchestrator_mocks):
+    args = RunConfig(
+        repo_path=base_tmp / "repo",
+        run_id="test_run",
+        issue_text="fix",
+        artifacts_root=base_tmp / ".dbg",
+        tracks_file=tracks_file_max2,
+        mode="debug",
+    )
+    run_dir = _make_run_dir(base_tmp, args.run_id, _run_skeleton)
+
+    m = orchestrator_mocks(*_LOOP_PATCHES)
+    m.WorktreeManager.return_value.validate_worktrees_ready.return_value = WorktreeValidation(
+        ok_tracks=["loop_test"], failed={}
+    )
+    # AsyncMock awaits to the sync side_effect's result; call_args_list is kept
+    mock_ti = m.TrackIterate.return_value
+    mock_ti.run = AsyncMock(
+        side_effect=lambda *, store, track, iteration, **kw: _write_iteration(store, track, iteration, "CONTINUE")
+    )
+
+    await run_debug_session(args)
+
+    # Verify MockTI.run called twice (crash/status logs only shown on failure)
+    assert mock_ti.run.call_count == 2, _run_diagnostics(run_dir)
+
+    # Verify args
+    calls = mock_ti.run.call_args_list
+    assert calls[0].kwargs["iteration"] == 1
+    assert calls[1].kwargs["iteration"] == 2
+
+
+@pytest.mark.asyncio
+async def test_loop_stops_on_done(base_tmp, _run_skeleton, tracks_file_done, orchestrator_mocks):
+    # Tracks file allows max_iters 5
+    args = RunConfig(
+        repo_path=base_tmp / "repo",
+        run_id="test_run_done",
+        issue_text="fix",
+        artifacts_root=base_tmp / ".dbg",
+        tracks_file=tracks_file_done,
+        mode="debug",
+    )
+    _make_run_dir(base_tmp, args.run_id, _run_skeleton)
+
+    m = orchestrator_mocks(*_LOOP_PATCHES)
+    m.WorktreeManager.return_value.validate_worktrees_ready.return_value = WorktreeValidation(
+        ok_tracks=["done_test"], failed={}
+    )
+    # Iter 1: CONTINUE, Iter 2: DONE
+    mock_ti = m.TrackIterate.return_value
+    mock_ti.run = AsyncMock(
+        side_effect=lambda *, store, track, iteration, **kw: _write_iteration(
+            store, track, iteration, "CONTINUE" if iteration < 2 else "DONE"
         )
+    )
+
+    await run_debug_session(args)
 
-        with (
-            patch("anvil.orchestrator.ContextBuilder") as MockCB,
-            patch("anvil.orchestrator.ReproPlan") as MockRP,
-            patch("anvil.orchestrator._provider_for_track") as MockLoader,
-            patch("anvil.orchestrator.WorktreeManager") as MockWT,
-            patch("anvil.orchestrator.TrackIterate") as MockTI_Cls, 
-        ):
-            # Create dummy artifacts
-            run_dir = self.tmp_dir / ".dbg" / args.run_id
-            run_dir.mkdir(parents=True, exist_ok=True)
-            (run_dir / "CONTEXT.md").write_text("Dummy Context")
-            (run_dir / "REPRO.md").write_text("Dummy Repro")
-
-            MockCB.return_value.check.return_value = 0
-            MockRP.return_value.check.return_value = 0
-            mock_ti = MockTI_Cls.return_value 
-            mock_ti.check.return_value = 0
-            
-            # Configure MockWT validation
-            from anvil.worktrees import WorktreeValidation
-            MockWT.return_value.validate_worktrees_ready.return_value = WorktreeValidation(ok_tracks=["done_test"], failed={})
-            
-            async def side_effect_run(iteration, store, track, **kwargs):
-                p = store.path("tracks", track, f"iter_{iteration:02d}", "ITERATION.json")
-                p.parent.mkdir(parents=True, exist_ok=True)
-                # Iter 1: CONTINUE, Iter 2: DONE
-                signal = "CONTINUE" if iteration < 2 else "DONE"
-                full_json = {
-                    "schema_version": 1,
-                    "track": track,
-                    "iteration": iteration,
-                    "status_signal": signal,
-                    "hypothesis": "test",
-                    "confidence": 0.5,
-                    "experiments": [],
-                    "proposed_changes": {},
-                    "risks": []
-                }
-                import json
-                p.write_text(json.dumps(full_json))
-
-            mock_ti.run.side_effect = side_effect_run
-
-            asyncio.run(run_debug_session(args))
-            
-            # Verify called 2 times (stop after 2), even though max_iters=5
-            self.assertEqual(mock_ti.run.call_count, 2)
+    # Verify called 2 times (stop after 2), even though max_iters=5
+    assert mock_ti.run.call_count == 2
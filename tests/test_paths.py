@@ -9,6 +9,10 @@ def test_safe_filename():
     assert safe_filename("../../etc/passwd") == "etc_passwd"
     assert safe_filename("") == "item"  # Default
     assert safe_filename("", default="default") == "default"
+    # Clean fast path and regex path agree on edge cases
+    assert safe_filename("._a__b-.") == "a__b"
+    assert safe_filename("café au lait") == "caf_au_lait"
+    assert safe_filename("...") == "item"
 
 def test_ensure_dir(tmp_path):
     d = tmp_path / "subdir" / "nested"
@@ -18,19 +22,10 @@ def test_ensure_dir(tmp_path):
     assert d.is_dir()
 
 def test_copy_template(tmp_path, monkeypatch):
-    # Mock importlib.resources to avoid needing real template files
-    import importlib.resources
-    from contextlib import contextmanager
-    
-    # Mock context manager for open_text
-    @contextmanager
-    def mock_open_text(pkg, name, encoding="utf-8"):
-        class MockFile:
-            def read(self):
-                return f"Template content for {name}"
-        yield MockFile()
+    # Stub the resource loader to avoid needing real template files
+    from anvil.util import paths
 
-    monkeypatch.setattr(importlib.resources, "open_text", mock_open_text)
+    monkeypatch.setattr(paths, "_load_template", lambda name: f"Template content for {name}")
 
     dest = tmp_path / "template.txt"
     
@@ -46,3 +41,35 @@ def test_copy_template(tmp_path, monkeypatch):
     # Force overwrite
     copy_template("some_template", dest, overwrite=True)
     assert dest.read_text(encoding="utf-8") == "Template content for some_template"
+
+
+def test_copy_template_reads_bundled_resource_once(tmp_path):
+    import importlib.resources
+
+    from anvil import templates
+    from anvil.util.paths import _load_template
+
+    _load_template.cache_clear()
+    expected = importlib.resources.files(templates).joinpath("issue.md").read_text(encoding="utf-8")
+    for i in range(3):
+        copy_template("issue.md", tmp_path / f"issue_{i}.md")
+        assert (tmp_path / f"issue_{i}.md").read_text(encoding="utf-8") == expected
+    assert _load_template.cache_info().misses == 1
+
+    with pytest.raises(FileNotFoundError):
+        copy_template("no_such_template.md", tmp_path / "missing.md")
+
+
+def test_atomic_write_bytes(tmp_path):
+    from anvil.util.paths import atomic_write_bytes
+
+    dest = tmp_path / "ITERATION.json"
+    dest.write_text("old")
+    atomic_write_bytes(dest, b"new")
+    assert dest.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["ITERATION.json"]
+
+    with pytest.raises(TypeError):
+        atomic_write_bytes(dest, "not bytes")  # type: ignore[arg-type]
+    assert dest.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["ITERATION.json"]
@@ -0,0 +1,14 @@
+import pytest
+
+from anvil.prompts.load import load_profile
+
+
+def test_load_profile_reads_bundled_profile_once():
+    load_profile.cache_clear()
+    text = load_profile("strict_minimal_patch")
+    assert text.strip()
+    assert load_profile("strict_minimal_patch") is text
+    assert load_profile.cache_info().misses == 1
+
+    with pytest.raises(FileNotFoundError):
+        load_profile("no_such_profile")
@@ -21,6 +21,15 @@ def test_extract_between():
     # It should extract "second".
     assert extract_between(text2, "START", "END") == "second"
 
+    # Unterminated earlier start: still the last one (a lazy START(.*?)END regex would span both)
+    assert extract_between("START a START b END", "START", "END") == "b"
+    # An end marker only before the last start does not count
+    assert extract_between("START a END START b", "START", "END") == ""
+
+    # Large LLM-sized output stays a pair of C-level scans
+    big = "x" * 1_000_000 + "START payload END" + "y" * 1_000_000
+    assert extract_between(big, "START", "END") == "payload"
+
 def test_normalize_iteration_json():
     # Minimal input
     raw = {}
@@ -33,6 +42,8 @@ def test_normalize_iteration_json():
     normalized_bad = json.loads(normalize_iteration_json(bad_json))
     assert normalized_bad["thought"] == "Failed to parse JSON"
     assert normalized_bad["confidence"] == 0.0
+    # Fallback is serialized once, not per failure
+    assert normalize_iteration_json("not json at all [") is normalize_iteration_json(bad_json)
 
 def test_build_prompt():
     prompt = build_prompt(
@@ -47,3 +58,81 @@ def test_build_prompt():
     assert "DIRECTIONS:\nDo X" in prompt
     assert "CTX" in prompt
     assert "BEGIN_ITERATION_JSON" in prompt
+
+def test_normalize_iteration_dict_merges_defaults():
+    from anvil.providers.common import normalize_iteration_dict
+
+    it = normalize_iteration_dict('{"confidence": 0.9, "hypothesis": "h"}')
+    assert it["confidence"] == 0.9
+    assert it["hypothesis"] == "h"
+    assert it["status_signal"] == "NEEDS_MORE_WORK"
+    assert it["schema_version"] == 1
+
+    # Fresh dict each call: mutating one result must not leak into the next.
+    it["track"] = "A"
+    assert "track" not in normalize_iteration_dict("{}")
+
+def test_marker_cli_provider_parses_fake_cli(tmp_path, monkeypatch):
+    import asyncio
+    import os
+
+    from anvil.providers.gemini_cli import GeminiCliProvider
+    from anvil.util.shell import which_cached
+
+    fake = tmp_path / "fake-gemini"
+    fake.write_text(
+        "#!/bin/sh\n"
+        "echo BEGIN_ITERATION_JSON\n"
+        "echo '{\"hypothesis\": \"h\", \"status_signal\": \"DONE\"}'\n"
+        "echo END_ITERATION_JSON\n"
+        "echo BEGIN_PATCH_DIFF\n"
+        "echo '--- a/x'\n"
+        "echo END_PATCH_DIFF\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    which_cached.cache_clear()
+
+    provider = GeminiCliProvider(gemini_cmd="fake-gemini", model="m")
+    try:
+        res = asyncio.run(
+            provider.run_iteration(
+                repo=tmp_path, track="A", iteration=2, role="fixer",
+                directions="", context="", blackboard="",
+            )
+        )
+    finally:
+        which_cached.cache_clear()
+
+    assert res.iteration_json["track"] == "A"
+    assert res.iteration_json["iteration"] == 2
+    assert res.iteration_json["proposed_changes"]["has_patch"] is True
+    assert res.patch_diff == "--- a/x\n"
+    assert res.meta == {"provider": "gemini", "model": "m"}
+
+
+def test_marker_cli_provider_requires_command_and_argv():
+    from dataclasses import dataclass
+
+    from anvil.providers.marker_cli import MarkerCliProvider
+
+    @dataclass
+    class Incomplete(MarkerCliProvider):
+        timeout_s: int = 1
+
+        def command(self) -> str:
+            return "x"
+
+    with pytest.raises(TypeError, match="build_argv"):
+        Incomplete()
+
+
+def test_json_fast_path_matches_stdlib():
+    from anvil.util.json_utils import dumps_indented, dumps_indented_bytes, loads
+
+    data = {"a": [1, 2.5, None], "b": {"c": "ü"}, "d": True}
+    assert dumps_indented(data) == json.dumps(data, indent=2, ensure_ascii=False)
+    assert loads(dumps_indented(data)) == data
+    assert dumps_indented_bytes(data) == (dumps_indented(data) + "\n").encode("utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        loads("{not json")
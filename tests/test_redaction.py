@@ -0,0 +1,35 @@
+import re
+
+from anvil.util.redaction import Redactor
+
+
+def test_redactor_combined_pattern():
+    r = Redactor()
+    text = "a ghp_" + "A" * 24 + " b sk-" + "z" * 30 + " c github_pat_" + "x_" * 12
+    assert r.redact(text) == "a [REDACTED] b [REDACTED] c [REDACTED]"
+    assert r.redact("nothing here") == "nothing here"
+
+
+def test_redactor_mixed_flags_falls_back():
+    r = Redactor(patterns=[re.compile(r"secret", re.IGNORECASE), re.compile(r"tok_[0-9]+")])
+    assert r._combined is None
+    assert r.redact("SECRET tok_123 Tok_1") == "[REDACTED] [REDACTED] Tok_1"
+
+
+def test_redactor_inline_global_flags_fall_back():
+    # "(?i)" must lead the expression, so wrapping it in (?:...) cannot compile
+    r = Redactor(patterns=[re.compile(r"(?i)secret")])
+    assert r.redact("a SECRET b") == "a [REDACTED] b"
+
+
+def test_redactor_backreferences_fall_back():
+    # Joined, (b)\1 would become (b)\2 and stop matching "bb"
+    r = Redactor(patterns=[re.compile(r"(a)\1"), re.compile(r"(b)\1")])
+    assert r.redact("aa bb") == "[REDACTED] [REDACTED]"
+
+
+def test_redact_lines_streams(tmp_path):
+    log = tmp_path / "big.log"
+    log.write_text("ok\nkey=sk-" + "a" * 24 + "\nend\n", encoding="utf-8")
+    with log.open(encoding="utf-8") as f:
+        assert list(Redactor().redact_lines(f)) == ["ok\n", "key=[REDACTED]\n", "end\n"]
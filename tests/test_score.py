@@ -0,0 +1,36 @@
+from anvil.artifacts.store import ArtifactStore
+from anvil.score.compute import ScoreComputer
+
+
+def test_score_computer_single_walk(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.ensure()
+    (tmp_path / "tracks" / "a" / "iter_01").mkdir(parents=True)
+    (tmp_path / "tracks" / "a" / "iter_01" / "ITERATION.json").write_text("{}")
+    (tmp_path / "tracks" / "a" / "iter_02").mkdir()
+    (tmp_path / "tracks" / "a" / "iter_02" / "PATCH.diff").write_text("patch")
+    (tmp_path / "tracks" / "b" / "iter_01").mkdir(parents=True)
+    (tmp_path / "VERIFY.md").write_text("## Result\n\nPASS\n")
+
+    ScoreComputer().write(store, ["a", "b", "missing"])
+
+    scores = store.read_json("SCORES.json")["scores"]
+    assert scores == {"a": 55.0, "b": 40.0, "missing": 40.0}
+
+
+def test_score_computer_keeps_track_order(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.ensure()
+    tracks = [f"t{i}" for i in range(12)]
+    for t in tracks[::2]:
+        (tmp_path / "tracks" / t / "iter_01").mkdir(parents=True)
+        (tmp_path / "tracks" / t / "iter_01" / "PATCH.diff").write_text("patch")
+
+    ScoreComputer().write(store, tracks)
+
+    scores = store.read_json("SCORES.json")["scores"]
+    assert list(scores) == tracks
+    assert [scores[t] for t in tracks] == [10.0, 0.0] * 6
+
+    ScoreComputer().write(store, [])
+    assert store.read_json("SCORES.json")["scores"] == {}
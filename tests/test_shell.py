@@ -2,7 +2,15 @@ import pytest
 import sys
 import os
 from pathlib import Path
-from anvil.util.shell import run_cmd, CmdResult
+from anvil.util.shell import run_cmd, run_cmd_capture, CmdResult
+from anvil.util.text import map_file
+
+
+def _log_contains(path: Path, needle: bytes) -> bool:
+    # Search the mapped bytes (no decode); note `needle in mmap` is not a substring test
+    with map_file(path) as mm:
+        return mm.find(needle) != -1
+
 
 def test_run_cmd_success(tmp_path):
     stdout = tmp_path / "out.log"
@@ -15,6 +23,11 @@ def test_run_cmd_success(tmp_path):
     assert "hello" in stdout.read_text()
     assert res.stdout_bytes > 0
     assert res.elapsed_s >= 0
+    # Slotted and frozen: no per-instance __dict__, still pattern-matchable
+    assert not hasattr(res, "__dict__")
+    match res:
+        case CmdResult(cmd=c, returncode=0):
+            assert c == cmd
 
 def test_run_cmd_failure(tmp_path):
     stdout = tmp_path / "out.log"
@@ -31,14 +44,59 @@ def test_run_cmd_timeout(tmp_path):
     stdout = tmp_path / "out.log"
     stderr = tmp_path / "err.log"
     
-    # Sleep 2s, timeout 0.5s
+    # Sleep 2s, timeout 50ms; run_cmd SIGKILLs the child as soon as it expires
     cmd = "sleep 2" if sys.platform != "win32" else "timeout 2"
     
     # run_cmd catches TimeoutExpired and returns rc=124
-    res = run_cmd(cmd, tmp_path, stdout, stderr, timeout_s=0.5)
+    res = run_cmd(cmd, tmp_path, stdout, stderr, timeout_s=0.05)
     
     assert res.returncode == 124
-    assert "Timeout expired" in stderr.read_text()
+    assert _log_contains(stderr, b"Timeout expired")
+
+
+def _syscall_pidfd_open():
+    """os.pidfd_open via the raw syscall, for Python builds compiled without it."""
+    import ctypes
+    import platform
+
+    nr = {"x86_64": 434, "aarch64": 434}.get(platform.machine())
+    if sys.platform != "linux" or nr is None:
+        return None
+    libc = ctypes.CDLL(None, use_errno=True)
+
+    def pidfd_open(pid, flags=0):
+        fd = libc.syscall(nr, pid, flags)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return fd
+
+    return pidfd_open
+
+
+def test_run_cmd_timeout_with_high_fds(tmp_path, monkeypatch):
+    # Push the pidfd past FD_SETSIZE (1024): the wait must still time out cleanly
+    if not hasattr(os, "pidfd_open"):
+        shim = _syscall_pidfd_open()
+        if shim is None:
+            pytest.skip("no pidfd_open on this platform")
+        monkeypatch.setattr(os, "pidfd_open", shim, raising=False)
+    fds = [os.open(os.devnull, os.O_RDONLY) for _ in range(1100)]
+    try:
+        res = run_cmd("sleep 3", tmp_path, tmp_path / "out.log", tmp_path / "err.log", timeout_s=0.05)
+    finally:
+        for fd in fds:
+            os.close(fd)
+    assert res.returncode == 124
+    assert res.elapsed_s < 2
+    assert _log_contains(tmp_path / "err.log", b"Timeout expired")
+
+
+def test_run_cmd_timeout_not_reached(tmp_path):
+    # With a deadline the child is awaited via pidfd; a fast exit returns its own rc
+    res = run_cmd("exit 3", tmp_path, tmp_path / "out.log", tmp_path / "err.log", timeout_s=5)
+    assert res.returncode == 3
+    assert res.elapsed_s < 5
 
 def test_run_cmd_capture(tmp_path):
     stdout = tmp_path / "out.log"
@@ -52,3 +110,103 @@ def test_run_cmd_capture(tmp_path):
     content = stderr.read_text().strip()
     assert "error message" in content
     assert res.stderr_bytes > 0
+
+def test_which_cached_memoizes(monkeypatch):
+    from anvil.util import shell
+
+    calls = []
+
+    def fake_which(cmd):
+        calls.append(cmd)
+        return f"/usr/bin/{cmd}"
+
+    shell.which_cached.cache_clear()
+    monkeypatch.setattr(shell, "which", fake_which)
+    try:
+        assert shell.which_cached("copilot") == "/usr/bin/copilot"
+        assert shell.which_cached("copilot") == "/usr/bin/copilot"
+        assert calls == ["copilot"]
+    finally:
+        shell.which_cached.cache_clear()
+
+
+def test_iter_cmd_lines_streams_and_stops_early(tmp_path):
+    from anvil.util.shell import iter_cmd_lines
+
+    # Producer would run for ~10s; closing the generator must terminate it
+    argv = [sys.executable, "-c", "import sys,time\nfor i in range(100):\n print(i, flush=True); time.sleep(0.1)"]
+    import time
+    start = time.monotonic()
+    got = []
+    for line in iter_cmd_lines(argv, cwd=tmp_path, timeout_s=30):
+        got.append(line)
+        if len(got) == 3:
+            break
+    assert got == ["0", "1", "2"]
+    assert time.monotonic() - start < 5
+
+    assert list(iter_cmd_lines(["definitely-not-a-real-binary"], cwd=tmp_path)) == []
+
+
+def test_run_cmd_drop_cache_keeps_logs(tmp_path):
+    stdout = tmp_path / "out.log"
+    res = run_cmd("echo cached", tmp_path, stdout, tmp_path / "err.log", drop_cache=True)
+    assert res.returncode == 0
+    assert stdout.read_text().strip() == "cached"
+
+
+def test_run_cmd_env_overlays_parent(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANVIL_PARENT_VAR", "parent")
+    stdout = tmp_path / "out.log"
+    res = run_cmd("echo $ANVIL_PARENT_VAR $ANVIL_EXTRA_VAR", tmp_path, stdout, tmp_path / "err.log",
+                  env={"ANVIL_EXTRA_VAR": "extra"})
+    assert res.returncode == 0
+    assert stdout.read_text().strip() == "parent extra"
+
+
+def test_run_cmd_capture_returns_output_in_memory(tmp_path):
+    assert run_cmd_capture("echo hi; echo oops >&2; exit 3", tmp_path) == (3, "hi\n", "oops\n")
+    rc, out, err = run_cmd_capture(["definitely-not-a-real-binary"], tmp_path)
+    assert rc == 1 and out == "" and "Exception" in err
+
+
+def test_run_cmd_creates_missing_log_dirs(tmp_path):
+    stdout = tmp_path / "a" / "b" / "out.log"
+    stderr = tmp_path / "c" / "err.log"
+    res = run_cmd("echo made", tmp_path, stdout, stderr)
+    assert res.returncode == 0
+    assert stdout.read_text().strip() == "made"
+    assert stderr.exists()
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_overlaps_processes(tmp_path):
+    import asyncio
+    from anvil.util.shell import run_cmd_async
+
+    # Each command waits for the other's marker: only concurrent runs finish
+    def handshake(mine, theirs):
+        return f"touch {mine}; i=0; while [ ! -f {theirs} ] && [ $i -lt 200 ]; do sleep 0.01; i=$((i+1)); done; test -f {theirs}"
+
+    a, b = await asyncio.gather(
+        run_cmd_async(handshake("a", "b"), tmp_path, tmp_path / "a.out", tmp_path / "a.err", timeout_s=5),
+        run_cmd_async(handshake("b", "a"), tmp_path, tmp_path / "b.out", tmp_path / "b.err", timeout_s=5),
+    )
+    assert (a.returncode, b.returncode) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_async_matches_run_cmd_contract(tmp_path):
+    from anvil.util.shell import run_cmd_async
+
+    res = await run_cmd_async(["echo", "hi"], tmp_path, tmp_path / "out.log", tmp_path / "err.log")
+    assert res.returncode == 0 and res.stdout_bytes == 3
+    assert (tmp_path / "out.log").read_text() == "hi\n"
+
+    res = await run_cmd_async("sleep 2", tmp_path, tmp_path / "t.out", tmp_path / "t.err", timeout_s=0.05)
+    assert res.returncode == 124
+    assert _log_contains(tmp_path / "t.err", b"Timeout expired")
+
+    res = await run_cmd_async(["definitely-not-a-real-binary"], tmp_path, tmp_path / "x.out", tmp_path / "x.err")
+    assert res.returncode == 1
+    assert _log_contains(tmp_path / "x.err", b"Exception")
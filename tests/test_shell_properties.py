@@ -1,8 +1,16 @@
 import subprocess
 from pathlib import Path
+
+import pytest
 from unittest.mock import MagicMock, patch
 
-from anvil.util.shell import run_cmd, run_cmd_docker, CmdResult
+from anvil.util.shell import run_cmd, run_cmd_docker, docker_image_ref, CmdResult
+
+# Frozen + slotted, so one shared instance can back every mocked run_cmd
+_EMPTY = CmdResult(
+    cmd="", returncode=0, stdout_path=Path(""), stderr_path=Path(""),
+    elapsed_s=0.0, stdout_bytes=0, stderr_bytes=0,
+)
 
 def test_run_cmd_list_mode(tmp_path):
     """Test that run_cmd with a list arg uses shell=False."""
@@ -18,18 +26,16 @@ def test_run_cmd_list_mode(tmp_path):
         assert kwargs["shell"] is False
         assert kwargs["cwd"] == str(tmp_path)
 
-def test_run_cmd_docker_construction(tmp_path):
-    """Test that run_cmd_docker constructs correct docker args."""
+@pytest.mark.parametrize("container_id", [None, "abc123"], ids=["run", "exec"])
+def test_run_cmd_docker_construction(tmp_path, container_id):
+    """Test that run_cmd_docker constructs correct docker args (fresh run or exec)."""
     with patch("anvil.util.shell.run_cmd") as mock_run_cmd:
-        mock_run_cmd.return_value = CmdResult(
-            cmd="", returncode=0, stdout_path=Path(""), stderr_path=Path(""),
-            elapsed_s=0, stdout_bytes=0, stderr_bytes=0
-        )
+        mock_run_cmd.return_value = _EMPTY
         
         user_cmd = "echo 'hello world'"
         cwd = tmp_path.resolve()
         
-        run_cmd_docker(user_cmd, cwd, env={"TEST_VAR": "val"})
+        run_cmd_docker(user_cmd, cwd, env={"TEST_VAR": "val"}, container_id=container_id)
         
         # Check what was passed to run_cmd
         args, kwargs = mock_run_cmd.call_args
@@ -37,26 +43,58 @@ def test_run_cmd_docker_construction(tmp_path):
         
         # It should be a list
         assert isinstance(passed_cmd, list)
-        
-        # Structure should be:
-        # docker run --rm -v resolved_cwd:/repo -w /repo -e TEST_VAR=val anvil:latest /bin/sh -c cmd
+        # Index and membership lookups are built once (every flag appears once)
+        idx = {v: i for i, v in enumerate(passed_cmd)}
+        items = set(passed_cmd)
         assert passed_cmd[0] == "docker"
-        assert passed_cmd[1] == "run"
-        assert "--rm" in passed_cmd
-        
-        # Check volume mount
-        expected_mount = f"{cwd}:/repo"
-        assert "-v" in passed_cmd
-        mount_idx = passed_cmd.index("-v") + 1
-        assert passed_cmd[mount_idx] == expected_mount
+        assert passed_cmd[idx["-w"] + 1] == "/repo"
+
+        if container_id is None:
+            # docker run --rm -v resolved_cwd:/repo -w /repo -e TEST_VAR=val <image> /bin/sh -c cmd
+            assert passed_cmd[1] == "run"
+            assert "--rm" in items
+            
+            # Check volume mount
+            expected_mount = f"{cwd}:/repo"
+            assert "-v" in items
+            mount_idx = idx["-v"] + 1
+            assert passed_cmd[mount_idx] == expected_mount
+            assert passed_cmd[idx["/bin/sh"] - 1] == docker_image_ref()
+        else:
+            # docker exec -w /repo -e TEST_VAR=val <container> /bin/sh -c cmd (no mount, no image)
+            assert passed_cmd[1] == "exec"
+            assert "--rm" not in items and "-v" not in items
+            assert docker_image_ref() not in items
+            assert passed_cmd[idx["/bin/sh"] - 1] == container_id
         
         # Check env
-        assert "-e" in passed_cmd
-        env_idx = passed_cmd.index("-e") + 1
+        assert "-e" in items
+        env_idx = idx["-e"] + 1
         assert passed_cmd[env_idx] == "TEST_VAR=val"
         
-        # Check image and command
-        assert "anvil:latest" in passed_cmd
-        assert "/bin/sh" in passed_cmd
-        assert "-c" in passed_cmd
+        # Check command
+        assert "/bin/sh" in items
+        assert "-c" in items
         assert passed_cmd[-1] == user_cmd
+
+
+@pytest.mark.parametrize(
+    "env_ref, expected",
+    [(None, "anvil:latest"), ("anvil@sha256:" + "0" * 64, "anvil@sha256:" + "0" * 64)],
+    ids=["default", "pinned"],
+)
+def test_docker_image_ref(monkeypatch, env_ref, expected):
+    if env_ref is None:
+        monkeypatch.delenv("ANVIL_IMAGE_REF", raising=False)
+    else:
+        monkeypatch.setenv("ANVIL_IMAGE_REF", env_ref)
+    assert docker_image_ref() == expected
+
+
+def test_run_cmd_docker_exec_in_session_container(anvil_container, tmp_path):
+    """One long-lived container serves repeated calls (skipped without docker/image)."""
+    repo, container_id = anvil_container
+    for i in range(2):
+        res = run_cmd_docker("pwd", repo, tmp_path / f"{i}.out", tmp_path / f"{i}.err", container_id=container_id)
+        assert res.returncode == 0
+        assert (tmp_path / f"{i}.out").read_text().strip() == "/repo"
@@ -2,8 +2,21 @@ import pytest
 from pathlib import Path
 from anvil.artifacts.store import ArtifactStore
 
-def test_store_path_ok(tmp_path):
-    store = ArtifactStore(tmp_path / "runs")
+# Inputs that must never resolve outside run_dir
+_TRAVERSAL_CASES = (
+    ("..", "secret.txt"),  # simple traversal
+    ("subdir", "../../secret.txt"),  # nested traversal
+    ("/etc/passwd",),  # absolute part replaces the root
+    ("..", "runs_evil", "x"),  # sibling sharing the name prefix
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "runs")
+
+
+def test_store_path_ok(tmp_path, store):
     # Setup a run dir
     # ArtifactStore usually needs run_id or assumes current run?
     # Let's check ArtifactStore contract. 
@@ -16,25 +29,55 @@ def test_store_path_ok(tmp_path):
     p = store.path("subdir", "file.txt")
     assert p == tmp_path / "runs" / "subdir" / "file.txt"
 
-def test_store_path_traversal(tmp_path):
-    store = ArtifactStore(tmp_path / "runs")
-    
-    # Simple traversal
-    with pytest.raises(ValueError, match="Refusing to access path"):
-        store.path("..", "secret.txt")
-        
-    # Nested traversal
+@pytest.mark.parametrize("parts", _TRAVERSAL_CASES, ids=lambda parts: "/".join(parts))
+def test_store_path_traversal(store, parts):
     with pytest.raises(ValueError, match="Refusing to access path"):
-        store.path("subdir", "../../secret.txt")
+        store.path(*parts)
+
 
-def test_store_ensure(tmp_path):
-    store = ArtifactStore(tmp_path / "runs")
+def test_store_path_inner_dotdot(tmp_path, store):
+    # `..` that stays inside is fine; the run dir itself too (no stat needed)
+    assert store.path("a", "..", "b.txt") == tmp_path / "runs" / "a" / ".." / "b.txt"
+    assert store.path() == tmp_path / "runs"
+
+def test_store_ensure(tmp_path, store):
     assert not (tmp_path / "runs").exists()
     store.ensure()
     assert (tmp_path / "runs").exists()
 
-def test_store_write_json(tmp_path):
-    store = ArtifactStore(tmp_path / "runs")
+def test_store_write_json(tmp_path, store):
     store.ensure()
     store.write_json("foo.json", {"a": 1})
     assert (tmp_path / "runs" / "foo.json").read_text().strip() == '{\n  "a": 1\n}'.strip()
+
+def test_store_read_cached_invalidates_on_rewrite(store):
+    store.ensure()
+    store.write_text("BLACKBOARD.md", "one")
+    assert store.read_cached("BLACKBOARD.md") == "one"
+    assert store.read_cached("BLACKBOARD.md") == "one"
+    store.write_text("BLACKBOARD.md", "two!")
+    assert store.read_cached("BLACKBOARD.md") == "two!"
+
+def test_store_write_batched(tmp_path, store):
+    store.write_batched([
+        ("a/NOTE.md", "hi"),
+        ("a/raw.bin", b"\x00\x01"),
+        ("a/DATA.json", {"k": 1}),
+    ])
+    assert (tmp_path / "runs/a/NOTE.md").read_text() == "hi"
+    assert (tmp_path / "runs/a/raw.bin").read_bytes() == b"\x00\x01"
+    assert store.read_json("a/DATA.json") == {"k": 1}
+
+    # An unsafe path aborts the batch before anything is written
+    with pytest.raises(ValueError):
+        store.write_batched([("ok.txt", "x"), ("../escape.txt", "y")])
+    assert not (tmp_path / "runs/ok.txt").exists()
+
+def test_store_write_status_matches_model_dump(tmp_path):
+    import json
+    from anvil.artifacts.schemas import RunStatus
+
+    store = ArtifactStore(tmp_path)
+    status = RunStatus(run_id="r1", mode="debug", status="DONE", message="ünïcode", disqualified_tracks=["a"])
+    p = store.write_status(status)
+    assert p.read_text(encoding="utf-8") == json.dumps(status.model_dump(), indent=2, ensure_ascii=False) + "\n"
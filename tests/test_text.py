@@ -0,0 +1,21 @@
+import re
+
+from anvil.util.text import map_file, read_text_file
+
+
+def test_map_file_supports_regex_and_slicing(tmp_path):
+    p = tmp_path / "log.txt"
+    p.write_text("alpha\nneedle here\nomega\n", encoding="utf-8")
+    with map_file(p) as data:
+        m = re.search(rb"needle \w+", data)
+        assert m and m.group(0) == b"needle here"
+        assert data[:5] == b"alpha"
+    assert read_text_file(p).startswith("alpha")
+
+
+def test_map_file_empty(tmp_path):
+    p = tmp_path / "empty.txt"
+    p.write_bytes(b"")
+    with map_file(p) as data:
+        assert data == b""
+        assert re.search(rb"x", data) is None
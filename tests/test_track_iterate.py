@@ -0,0 +1,25 @@
+import pytest
+
+from anvil.artifacts.store import ArtifactStore
+from anvil.steps.track_iterate import TrackIterate
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        ('{"track": "a", "iteration": 1, "status_signal": "DONE", "hypothesis": "h"}', 0),
+        ('{"track": "a", "iteration": 1, "status_signal": "MAYBE", "hypothesis": "h"}', 2),
+        ('{"track": "a", "iteration": 1,', 2),
+    ],
+)
+def test_check_validates_iteration_json(tmp_path, body, expected):
+    store = ArtifactStore(tmp_path)
+    iter_dir = tmp_path / "tracks" / "a" / "iter_01"
+    iter_dir.mkdir(parents=True)
+    (iter_dir / "ITERATION.json").write_text(body)
+
+    assert TrackIterate().check(store, tmp_path, track="a", iteration=1) == expected
+    check = store.read_json("tracks/a/iter_01/CHECK_iterate.json")
+    assert check["ok"] is (expected == 0)
+    if expected:
+        assert check["details"].startswith("Invalid ITERATION.json schema")
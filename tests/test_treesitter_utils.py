@@ -0,0 +1,111 @@
+import json
+import os
+from types import SimpleNamespace
+
+from anvil import treesitter_utils as tsu
+
+
+def test_outline_symbols_cached_by_mtime_and_size(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_list_symbols(path):
+        calls.append(path)
+        return [SimpleNamespace(kind="function", name=f"f{len(calls)}", start_line=1, end_line=2)]
+
+    monkeypatch.setattr(tsu, "_try_import_treesitter_tools", lambda: fake_list_symbols)
+    monkeypatch.setattr(tsu, "_OUTLINE_CACHE", {})
+
+    src = tmp_path / "mod.py"
+    src.write_text("def f(): pass\n")
+
+    first = tsu.outline_symbols(src)
+    assert tsu.outline_symbols(src) == first
+    assert len(calls) == 1
+
+    src.write_text("def f(): return 1\n")
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert tsu.outline_symbols(src)[0]["name"] == "f2"
+    assert len(calls) == 2
+
+    # Round-trip through the on-disk cache
+    cache_file = tmp_path / "cache" / "outline.json"
+    tsu.save_outline_cache(cache_file)
+    monkeypatch.setattr(tsu, "_OUTLINE_CACHE", {})
+    tsu.load_outline_cache(cache_file)
+    assert tsu.outline_symbols(src)[0]["name"] == "f2"
+    assert len(calls) == 2
+
+
+def test_outline_cache_bounded_pruned_and_copied(tmp_path, monkeypatch):
+    def fake(path):
+        return [SimpleNamespace(kind="function", name="f", start_line=1, end_line=2)]
+
+    monkeypatch.setattr(tsu, "_try_import_treesitter_tools", lambda: fake)
+    monkeypatch.setattr(tsu, "_OUTLINE_CACHE", {})
+    monkeypatch.setattr(tsu, "_OUTLINE_CACHE_MAX", 2)
+
+    a, b, c = (tmp_path / f"{n}.py" for n in "abc")
+    for p in (a, b, c):
+        p.write_text("def f(): pass\n")
+
+    # Callers get copies: mutating a result never reaches the cache
+    tsu.outline_symbols(a)[0]["name"] = "mutated"
+    assert tsu.outline_symbols(a)[0]["name"] == "f"
+
+    tsu.outline_symbols(b)
+    tsu.outline_symbols(a)  # refresh a, so b is least recently used
+    tsu.outline_symbols(c)
+    assert list(tsu._OUTLINE_CACHE) == [str(a.resolve()), str(c.resolve())]
+
+    c.unlink()
+    cache_file = tmp_path / "outline.json"
+    tsu.save_outline_cache(cache_file)
+    assert list(tsu._OUTLINE_CACHE) == [str(a.resolve())]
+    assert list(json.loads(cache_file.read_text())) == [str(a.resolve())]
+
+
+def test_outline_symbols_without_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(tsu, "_try_import_treesitter_tools", lambda: None)
+    monkeypatch.setattr(tsu, "_try_import_tree_sitter_languages", lambda: None)
+    monkeypatch.setattr(tsu, "_OUTLINE_CACHE", {})
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\n")
+    assert tsu.outline_symbols(src) == []
+    assert tsu._OUTLINE_CACHE == {}
+
+
+def test_parser_created_once_per_language(monkeypatch):
+    made = []
+
+    def fake_get_parser(lang):
+        made.append(lang)
+        return object()
+
+    monkeypatch.setattr(tsu, "_PARSER_CACHE", {})
+    p1 = tsu._parser_for("python", fake_get_parser)
+    p2 = tsu._parser_for("python", fake_get_parser)
+    tsu._parser_for("tsx", fake_get_parser)
+    assert p1 is p2
+    assert made == ["python", "tsx"]
+
+
+def test_symbols_from_query_handles_both_capture_shapes():
+    class Node:
+        def __init__(self, start, end, text=""):
+            self.start_point, self.end_point = (start, 0), (end, 0)
+            self.text = text
+
+    class FakeQuery:
+        def matches(self, root):
+            return [
+                (0, {"function": Node(0, 2), "name": Node(0, 0, "f")}),
+                # py-tree-sitter >= 0.23 shape: lists per capture
+                (1, {"class": [Node(4, 9)], "name": [Node(4, 4, "C")]}),
+            ]
+
+    syms = tsu._symbols_from_query(FakeQuery(), None, lambda n: n.text)
+    assert [(s.kind, s.name, s.start_line, s.end_line) for s in syms] == [
+        ("function", "f", 1, 3),
+        ("class", "C", 5, 10),
+    ]
@@ -1,47 +1,52 @@
-import asyncio
-import unittest
-import tempfile
+import os
+import pytest
 from pathlib import Path
-from anvil.orchestrator import run_debug_session, RunConfig
+from anvil.util.text import map_file
+
+
+def _assert_artifacts(dir_path: Path, *expected: str) -> None:
+    # One directory listing serves every name checked in this call
+    with os.scandir(dir_path) as it:
+        names = {e.name for e in it}
+    missing = sorted(set(expected) - names)
+    assert not missing, f"{missing} missing in {sorted(names)}"
 
-class TestValidationFailures(unittest.TestCase):
-    def setUp(self):
-        self.tmp_dir_obj = tempfile.TemporaryDirectory()
-        self.tmp_dir = Path(self.tmp_dir_obj.name)
-        # Do NOT init git repo - this triggers the failure
-    
-    def tearDown(self):
-        self.tmp_dir_obj.cleanup()
 
-    def test_fails_on_non_git_repo(self):
-        """Ensure session fails hard if target is not a git repo."""
-        args = RunConfig(
-            repo_path=self.tmp_dir, # Non-git dir
-            run_id="fail_test",
-            issue_text="fix",
-            artifacts_root=self.tmp_dir / ".dbg",
-            tracks_file=None,
-            mode="debug",
-        )
-        
-        # Run without mocking WorktreeManager checks (so they fail)
-        # But we need to mock internal components that might crash before validation?
-        # No, validation happens early.
-        # But we need to verify dependent components don't crash.
-        # TrackIterate, etc, shouldn't be called if validation fails.
-        
-        # We assume run_debug_session handles the exception/return.
-        result = asyncio.run(run_debug_session(args))
-        
-        self.assertEqual(result.status, "FAIL")
-        
-        # Check for diagnostics in log or error file
-        # We can't easily check loguru output here without a sink, but we can check if CRASH.txt exists?
-        # Actually validation failure writes WORKTREE_VALIDATION_ERROR.txt locally? 
-        # No, it logs an error and returns FAIL. 
-        # But `run_debug_session` writes `WORKTREE_VALIDATION_ERROR.txt` if validation fails (I implemented this).
-        
-        error_file = self.tmp_dir / ".dbg" / "fail_test" / "WORKTREE_VALIDATION_ERROR.txt"
-        self.assertTrue(error_file.exists(), "WORKTREE_VALIDATION_ERROR.txt should be created")
-        content = error_file.read_text()
-        self.assertIn("Root cause: Repo is not a git repository", content)
+@pytest.mark.asyncio
+async def test_fails_on_non_git_repo(tmp_path):
+    """Ensure session fails hard if target is not a git repo."""
+    # Imported here so collecting this module stays cheap
+    from anvil.orchestrator import run_debug_session, RunConfig
+
+    # Do NOT init git repo - this triggers the failure
+    args = RunConfig(
+        repo_path=tmp_path, # Non-git dir
+        run_id="fail_test",
+        issue_text="fix",
+        artifacts_root=tmp_path / ".dbg",
+        tracks_file=None,
+        mode="debug",
+    )
+    
+    # Run without mocking WorktreeManager checks (so they fail)
+    # But we need to mock internal components that might crash before validation?
+    # No, validation happens early.
+    # But we need to verify dependent components don't crash.
+    # TrackIterate, etc, shouldn't be called if validation fails.
+    
+    # We assume run_debug_session handles the exception/return.
+    result = await run_debug_session(args)
+    
+    assert result.status == "FAIL"
+    
+    # Check for diagnostics in log or error file
+    # We can't easily check loguru output here without a sink, but we can check if CRASH.txt exists?
+    # Actually validation failure writes WORKTREE_VALIDATION_ERROR.txt locally? 
+    # No, it logs an error and returns FAIL. 
+    # But `run_debug_session` writes `WORKTREE_VALIDATION_ERROR.txt` if validation fails (I implemented this).
+    
+    run_dir = tmp_path / ".dbg" / "fail_test"
+    _assert_artifacts(run_dir, "WORKTREE_VALIDATION_ERROR.txt", "RUN_STATUS.json")
+    error_file = run_dir / "WORKTREE_VALIDATION_ERROR.txt"
+    with map_file(error_file) as mm:
+        assert mm.find(b"Root cause: Repo is not a git repository") != -1
@@ -0,0 +1,90 @@
+import json
+import sys
+
+from anvil.artifacts.store import ArtifactStore
+from anvil.steps.verify import Verify
+
+
+def _write_contract(repo, commands):
+    import yaml
+
+    (repo / ".dbg").mkdir(parents=True, exist_ok=True)
+    (repo / ".dbg" / "verify_contract.yaml").write_text(
+        yaml.safe_dump({"schema_version": 1, "commands": commands})
+    )
+
+
+def test_verify_runs_commands_concurrently_in_contract_order(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    # Structural overlap probe (no wall-clock): each command announces itself,
+    # then waits for the other's marker; run back to back, "a" would never see
+    # "b" and exit 1 at its deadline.
+    probe = tmp_path / "rendezvous.py"
+    probe.write_text(
+        "import pathlib, sys, time\n"
+        "me, other = map(pathlib.Path, sys.argv[1:3])\n"
+        "me.touch()\n"
+        "deadline = time.monotonic() + 10\n"
+        "while not other.exists() and time.monotonic() < deadline:\n"
+        "    time.sleep(0.01)\n"
+        "sys.exit(0 if other.exists() else 1)\n"
+    )
+    rendezvous = f'"{sys.executable}" "{probe}"'
+    mark = tmp_path / "marks"
+    mark.mkdir()
+    _write_contract(repo, [
+        {"name": "a", "cmd": f"{rendezvous} {mark / 'a'} {mark / 'b'}", "required": True},
+        {"name": "b", "cmd": f"{rendezvous} {mark / 'b'} {mark / 'a'}", "required": True},
+        {"name": "skip", "cmd": ""},
+        {"name": "c", "cmd": "exit 3", "required": True},
+        {"name": "last", "cmd": "exit 0", "serial": True},
+    ])
+    store = ArtifactStore(tmp_path / "run")
+
+    Verify().run(store, repo)
+
+    data = json.loads((tmp_path / "run" / "logs" / "verify.commands.json").read_text())
+    assert [r["name"] for r in data["ran"]] == ["a", "b", "c", "last"]
+    assert data["failures"] == ["c"]  # a and b each saw the other running
+    assert "FAIL (required failures: c)" in (tmp_path / "run" / "VERIFY.md").read_text()
+
+
+def test_verify_duplicate_names_get_separate_logs(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_contract(repo, [
+        {"name": "tests", "cmd": "echo first"},
+        {"name": "tests", "cmd": "echo second"},
+    ])
+    Verify().run(ArtifactStore(tmp_path / "run"), repo)
+
+    logs = tmp_path / "run" / "logs"
+    assert (logs / "verify.0.tests.stdout.log").read_text() == "first\n"
+    assert (logs / "verify.1.tests.stdout.log").read_text() == "second\n"
+
+
+def test_load_contract_is_memoized_until_file_changes(tmp_path, monkeypatch):
+    import os
+    import yaml
+    from anvil.steps import verify as verify_mod
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    assert Verify()._load_contract(repo)["commands"] == []
+
+    _write_contract(repo, [{"name": "a", "cmd": "true"}])
+    parses = []
+    real_load = yaml.load
+    monkeypatch.setattr(verify_mod.yaml, "load", lambda *a, **k: parses.append(1) or real_load(*a, **k))
+
+    first = Verify()._load_contract(repo)
+    assert Verify()._load_contract(repo) is first
+    assert len(parses) == 1
+
+    _write_contract(repo, [{"name": "b", "cmd": "true"}])
+    p = repo / ".dbg" / "verify_contract.yaml"
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert Verify()._load_contract(repo)["commands"][0]["name"] == "b"
+    assert len(parses) == 2
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import time
+from pathlib import Path
+
+from anvil.artifacts.store import ArtifactStore
+from anvil.worktrees import WorktreeManager
+
+
+def _git_repo(path):
+    path.mkdir()
+    env_args = ["-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    (path / "README.md").write_text("hi\n")
+    subprocess.run(["git", "add", "README.md"], cwd=path, check=True)
+    subprocess.run(["git", *env_args, "commit", "-qm", "init"], cwd=path, check=True)
+    return path
+
+
+def _branches(repo):
+    out = subprocess.run(
+        ["git", "branch", "--format=%(refname:short)"], cwd=repo, capture_output=True, text=True
+    )
+    return set(out.stdout.split())
+
+
+def test_create_worktrees_creates_every_track(tmp_path):
+    repo = _git_repo(tmp_path / "repo")
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+    tracks = ["a", "b", "c", "d", "e", "f"]
+
+    wm.create_worktrees(tracks)
+
+    result = wm.validate_worktrees_ready(tracks)
+    assert sorted(result.ok_tracks) == tracks
+    assert result.failed == {}
+    assert {f"dbg/run1/{t}" for t in tracks} <= _branches(repo)
+    for t in tracks:
+        assert (wm.get_worktree_path(t) / "README.md").read_text() == "hi\n"
+
+    wm.create_worktrees(tracks)  # second call is a no-op
+    assert sorted(wm.validate_worktrees_ready(tracks).ok_tracks) == tracks
+
+
+def test_create_worktrees_skips_existing_branch(tmp_path):
+    repo = _git_repo(tmp_path / "repo")
+    subprocess.run(["git", "branch", "dbg/run1/a"], cwd=repo, check=True)
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+
+    wm.create_worktrees(["a", "b"])
+
+    assert not wm.get_worktree_path("a").exists()
+    assert wm.get_worktree_path("b").exists()
+
+
+def test_failed_checkout_is_rolled_back(tmp_path, monkeypatch):
+    import anvil.worktrees as worktrees
+
+    repo = _git_repo(tmp_path / "repo")
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+    real_run_cmd = worktrees.run_cmd
+
+    def failing_reset(cmd, cwd, *args, **kwargs):
+        if cmd[:2] == ["git", "reset"] and Path(cwd).name == "b":
+            return real_run_cmd(["false"], cwd, *args, **kwargs)
+        return real_run_cmd(cmd, cwd, *args, **kwargs)
+
+    monkeypatch.setattr(worktrees, "run_cmd", failing_reset)
+    wm.create_worktrees(["a", "b"])
+
+    assert (wm.get_worktree_path("a") / "README.md").exists()
+    assert not wm.get_worktree_path("b").exists()
+    assert "dbg/run1/b" not in _branches(repo)
+    assert "b" in wm.validate_worktrees_ready(["a", "b"]).failed
+
+    # The next call retries the track instead of trusting an empty checkout
+    monkeypatch.setattr(worktrees, "run_cmd", real_run_cmd)
+    wm.create_worktrees(["a", "b"])
+    assert (wm.get_worktree_path("b") / "README.md").read_text() == "hi\n"
+
+
+def test_cleanup_archives_branches(tmp_path):
+    repo = _git_repo(tmp_path / "repo")
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+    wm.create_worktrees(["a", "b"])
+
+    wm.cleanup(["a", "b"], archive=True)
+
+    assert not wm.get_worktree_path("a").exists()
+    assert not any(b.startswith("dbg/run1/") for b in _branches(repo))
+    assert len(wm.list_archived_branches()) == 2
+
+
+def test_find_stale_worktrees_uses_mtime(tmp_path):
+    repo = _git_repo(tmp_path / "repo")
+    root = repo / ".dbg" / "worktrees"
+    old, fresh = root / "old_run", root / "fresh_run"
+    old.mkdir(parents=True)
+    fresh.mkdir()
+    ten_days_ago = time.time() - 10 * 86400
+    os.utime(old, (ten_days_ago, ten_days_ago))
+
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+    assert wm.find_stale_worktrees() == [(old, "old_run")]
+
+
+def test_write_worktree_contracts(tmp_path):
+    from anvil.config import TrackConfig
+
+    repo = _git_repo(tmp_path / "repo")
+    wm = WorktreeManager(repo, ArtifactStore(tmp_path / "runs" / "run1"))
+    wm.get_worktree_path("a").mkdir(parents=True)
+
+    wm.write_worktree_contracts([
+        TrackConfig(name="a", role="fixer", provider="manual"),
+        TrackConfig(name="gone", role="x", provider="y"),
+    ])
+
+    expected = "\n".join([
+        "# CONTRACT — Worktree a",
+        "",
+        "## Purpose",
+        "- role: fixer",
+        "- provider: manual",
+        "- model: null",
+        "",
+        "## Required artifacts (written to run artifacts, not necessarily committed)",
+        "- tracks/a/iter_XX/ITERATION.json",
+        "- tracks/a/iter_XX/ITERATION.txt",
+        "",
+        "## Disqualification",
+        "- Missing required artifacts",
+        "- Not running check gates",
+        "- Editing outside this worktree",
+        "- Claiming verification without logs",
+        "",
+    ])
+    assert (wm.get_worktree_path("a") / "CONTRACT.md").read_text(encoding="utf-8") == expected
+    assert not wm.get_worktree_path("gone").exists()